@@ -0,0 +1 @@
+"""Headless performance benchmarks for both games (run with `python -m bench`)."""
@@ -0,0 +1,297 @@
+"""
+Headless benchmark runner for both games.
+
+Runs each game on SDL's dummy video driver with scripted input, timing the simulation update and the
+draw separately, and sweeps entity counts (invader grid, bullets in flight, simultaneous demons, live
+hitboxes, particles). Results are compared against a stored JSON baseline and regressions are flagged.
+Before timing anything, `BatchedInvaders` is checked against seeded `invaders.Game` runs fed the same actions.
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import numpy as np  # noqa: E402
+import pygame  # noqa: E402
+
+from common.games import load_module  # noqa: E402
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baselines.json"
+
+# (step, maintain, draw): step and draw are timed; maintain keeps entity counts steady between them.
+Harness = Tuple[Callable[[int], None], Callable[[], None], Callable[[], None]]
+
+
+@dataclass
+class Case:
+    name: str
+    setup: Callable[[], Harness]
+
+
+def invaders_case(rows: int = 5, cols: int = 10, bullets: int = 0, legacy_render: bool = False) -> Harness:
+    invaders = load_module("invaders")
+    render = load_module("invaders", "render")
+    screen = pygame.display.set_mode((invaders.WIDTH, invaders.HEIGHT))
+    font = pygame.font.Font(None, 24)
+    renderer = (render.LegacyRenderer if legacy_render else render.SpriteRenderer)(screen, font)
+    game = invaders.Game(seed=1, rows=rows, cols=cols)
+    initial = game.snapshot()
+    rng = random.Random(1)
+    sweep = [invaders.ACTION_LEFT | invaders.ACTION_FIRE] * 40 + [invaders.ACTION_RIGHT | invaders.ACTION_FIRE] * 40
+
+    def step(tick: int) -> None:
+        game.step(sweep[tick % len(sweep)])
+
+    def maintain() -> None:
+        # Formations too big for the playfield end on their first frame; restart them from the top.
+        if game.game_over:
+            game.restore(initial)
+        while game.bullets.count < bullets:
+            from_player = rng.random() < 0.5
+            speed = -invaders.BULLET_SPEED if from_player else invaders.BULLET_SPEED - 2
+            game.bullets.spawn(rng.randrange(invaders.WIDTH), rng.randrange(invaders.HEIGHT), speed, from_player)
+
+    return step, maintain, lambda: renderer.draw(game)
+
+
+def brawler_case(demons: int = 3, hitboxes: int = 0) -> Harness:
+    brawler = load_module("brawler")
+    screen = pygame.display.set_mode((brawler.WIDTH, brawler.HEIGHT))
+    stage = load_module("brawler", "stage")
+    renderer = stage.StageRenderer(screen)
+    session = brawler.GameSession(seed=1)
+    session.target = sys.maxsize
+    rng = random.Random(1)
+    script = {0: brawler.INPUT_LIGHT, 12: brawler.INPUT_HEAVY, 30: brawler.INPUT_JUMP | brawler.INPUT_LIGHT}
+
+    def step(tick: int) -> None:
+        phase = tick % 60
+        move = brawler.INPUT_RIGHT if (tick // 120) % 2 == 0 else brawler.INPUT_LEFT
+        session.step(move | script.get(phase, 0))
+
+    def maintain() -> None:
+        session.player.health = 120
+        session.game_over = False
+        while len(session.demons) < demons:
+            session.demons.append(brawler.Demon(rng.randrange(brawler.WIDTH - 68), brawler.GROUND_Y - 100, rng))
+        for demon in session.demons:
+            demon.health = 70
+        while len(session.hitboxes) < hitboxes:
+            owner = session.player if rng.random() < 0.5 else rng.choice(session.demons)
+            rect = pygame.Rect(rng.randrange(brawler.WIDTH - 80), brawler.GROUND_Y - 90, 70, 44)
+            session.add_hitbox(brawler.Hitbox(rect, 0, rng.uniform(0.2, 0.6), owner))
+
+    return step, maintain, lambda: renderer.draw(session)
+
+
+def horde_case(demons: int) -> Harness:
+    brawler = load_module("brawler")
+    screen = pygame.display.set_mode((brawler.WIDTH, brawler.HEIGHT))
+    stage = load_module("brawler", "stage")
+    horde = load_module("horde")
+    renderer = stage.StageRenderer(screen)
+    session = horde.HordeSession(seed=1, target=sys.maxsize, max_simultaneous=demons)
+    session.spawn_batch = demons
+
+    def step(tick: int) -> None:
+        move = brawler.INPUT_RIGHT if (tick // 120) % 2 == 0 else brawler.INPUT_LEFT
+        session.step(move | (brawler.INPUT_LIGHT if tick % 20 == 0 else 0))
+
+    def maintain() -> None:
+        session.player.health = 120
+        session.game_over = False
+        health = session.horde.view("health")
+        health[:] = 70
+        session.spawn_timer = 0.0 if len(session.horde) < demons else 1.0
+
+    return step, maintain, lambda: renderer.draw(session)
+
+
+def particles_case(particles: int) -> Harness:
+    brawler = load_module("brawler")
+    screen = pygame.display.set_mode((brawler.WIDTH, brawler.HEIGHT))
+    stage = load_module("brawler", "stage")
+    renderer = stage.StageRenderer(screen)
+    session = brawler.GameSession(seed=1)
+    system = renderer.particles
+    rng = random.Random(1)
+
+    def step(tick: int) -> None:
+        system.update(1 / 60)
+
+    def maintain() -> None:
+        session.player.health = 120
+        while len(system) < particles:
+            x, y = rng.uniform(100, brawler.WIDTH - 100), rng.uniform(100, brawler.GROUND_Y)
+            system.burst(x, y, min(500, particles - len(system)), (255, 200, 120), life=(0.5, 1.5))
+
+    return step, maintain, lambda: renderer.draw(session)
+
+
+def build_cases() -> List[Case]:
+    cases = [
+        Case(f"invaders/grid={rows}x{cols}", lambda r=rows, c=cols: invaders_case(rows=r, cols=c))
+        for rows, cols in ((5, 10), (10, 13), (20, 26), (32, 32))
+    ]
+    cases += [Case(f"invaders/bullets={n}", lambda n=n: invaders_case(bullets=n)) for n in (0, 100, 1000, 5000)]
+    cases.append(Case("invaders/legacy_render", lambda: invaders_case(legacy_render=True)))
+    cases += [Case(f"brawler/demons={n}", lambda n=n: brawler_case(demons=n)) for n in (3, 30, 300)]
+    cases += [Case(f"brawler/hitboxes={n}", lambda n=n: brawler_case(hitboxes=n)) for n in (0, 50, 500)]
+    cases += [Case(f"horde/demons={n}", lambda n=n: horde_case(n)) for n in (100, 1000, 2000)]
+    cases += [Case(f"particles/count={n}", lambda n=n: particles_case(n)) for n in (1000, 10000, 50000)]
+    return cases
+
+
+def invaders_parity(games: int = 16, frames: int = 900, seed: int = 1) -> List[str]:
+    """Step `BatchedInvaders` and one `Game` per batch index with the same actions; list any mismatches.
+
+    The two use different RNGs, so enemy fire is switched off in both for the run; everything else
+    (movement, shooting, the swarm march, hits, scores and game end) must agree frame by frame.
+    """
+    invaders = load_module("invaders")
+    vector = load_module("invaders", "vector")
+
+    fire_rate = invaders.ENEMY_FIRE_RATE
+    invaders.ENEMY_FIRE_RATE = vector.ENEMY_FIRE_RATE = 0.0
+    try:
+        batch = vector.BatchedInvaders(games, seed=seed, auto_reset=False)
+        singles = [invaders.Game(seed=seed + i) for i in range(games)]
+        rng = np.random.default_rng(seed)
+        mismatches: List[str] = []
+        for frame in range(1, frames + 1):
+            actions = rng.integers(0, 8, games)
+            batch.step(actions)
+            origin_x, origin_y = batch.enemy_origin()
+            for i, game in enumerate(singles):
+                game.step(int(actions[i]))
+                alive = np.array([e.alive for e in game.swarm.enemies]).reshape(game.rows, game.cols)
+                checks = (
+                    ("player_x", game.player.rect.x, int(batch.player_x[i])),
+                    ("swarm", (game.swarm.origin_x, game.swarm.origin_y), (int(origin_x[i]), int(origin_y[i]))),
+                    ("score", game.score, int(batch.score[i])),
+                    ("game_over", game.game_over, bool(batch.done[i])),
+                )
+                for what, expected, got in checks:
+                    if expected != got:
+                        mismatches.append(f"game {i} frame {frame} {what}: Game {expected} != batched {got}")
+                if not np.array_equal(alive, batch.alive[i]):
+                    mismatches.append(f"game {i} frame {frame} alive mask differs")
+            if mismatches:
+                break
+        return mismatches
+    finally:
+        invaders.ENEMY_FIRE_RATE = vector.ENEMY_FIRE_RATE = fire_rate
+
+
+def _percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+def measure(case: Case, frames: int, warmup: int) -> Dict[str, float]:
+    step, maintain, draw = case.setup()
+    update_us: List[float] = []
+    draw_us: List[float] = []
+    clock = time.perf_counter_ns
+    for tick in range(warmup + frames):
+        maintain()
+        t0 = clock()
+        step(tick)
+        t1 = clock()
+        maintain()
+        t2 = clock()
+        draw()
+        t3 = clock()
+        pygame.event.pump()
+        if tick >= warmup:
+            update_us.append((t1 - t0) / 1000)
+            draw_us.append((t3 - t2) / 1000)
+    return {
+        "update_us": statistics.median(update_us),
+        "update_p95_us": _percentile(update_us, 0.95),
+        "draw_us": statistics.median(draw_us),
+        "draw_p95_us": _percentile(draw_us, 0.95),
+    }
+
+
+def compare(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    tolerance: float,
+    min_delta_us: float,
+) -> List[str]:
+    """Median update/draw times that grew past the tolerance (and by more than min_delta_us)."""
+    regressions = []
+    for name, metrics in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        for key in ("update_us", "draw_us"):
+            old, new = base.get(key), metrics[key]
+            if old and new > old * (1 + tolerance) and new - old > min_delta_us:
+                regressions.append(f"{name} {key}: {old:.1f} -> {new:.1f} us (+{(new / old - 1) * 100:.0f}%)")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Headless update/draw benchmarks for both games.")
+    parser.add_argument("--only", help="run cases whose name contains this text")
+    parser.add_argument("--frames", type=int, default=300, help="measured frames per case")
+    parser.add_argument("--warmup", type=int, default=30, help="unmeasured frames before timing")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="write these results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown before flagging (0.25 = 25%%)")
+    parser.add_argument("--min-delta-us", type=float, default=5.0, help="ignore slowdowns smaller than this")
+    parser.add_argument("--output", type=Path, help="also write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    mismatches = invaders_parity()
+    for line in mismatches[:10]:
+        print(f"PARITY {line}")
+    if mismatches:
+        return 1
+    print("BatchedInvaders matches invaders.Game")
+
+    pygame.display.init()
+    pygame.font.init()
+    results: Dict[str, Dict[str, float]] = {}
+    print(f"{'case':32} {'update p50/p95 us':>20} {'draw p50/p95 us':>20}")
+    for case in build_cases():
+        if args.only and args.only not in case.name:
+            continue
+        metrics = measure(case, args.frames, args.warmup)
+        results[case.name] = metrics
+        print(
+            f"{case.name:32} {metrics['update_us']:9.1f} /{metrics['update_p95_us']:9.1f}"
+            f" {metrics['draw_us']:9.1f} /{metrics['draw_p95_us']:9.1f}"
+        )
+    pygame.quit()
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+
+    if args.save_baseline:
+        baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+        baseline.update(results)
+        args.baseline.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+        print(f"baseline written to {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"no baseline at {args.baseline}; run with --save-baseline to create one")
+        return 0
+    regressions = compare(results, json.loads(args.baseline.read_text()), args.tolerance, args.min_delta_us)
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    if not regressions:
+        print(f"no regressions against {args.baseline}")
+    return 1 if regressions else 0
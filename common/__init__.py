@@ -0,0 +1 @@
+"""Helpers shared by the Space Invaders and Kpop Demon Hunters games."""
@@ -0,0 +1,108 @@
+"""
+Scripted autopilot policies for both games' headless simulations.
+A policy maps (simulation, rng) to the input bitmask for the next `step`; all randomness comes from
+the rng it is handed, so a seeded run stays reproducible.
+"""
+
+import random
+from typing import Callable, Dict
+
+from common.games import load_module
+
+invaders = load_module("invaders")
+brawler = load_module("brawler")
+horde = load_module("horde")
+
+Policy = Callable[[object, random.Random], int]
+
+DODGE_RANGE = 170
+ATTACK_RANGE = 110
+
+
+def invaders_tracker(game, rng: random.Random) -> int:
+    """Sidestep enemy shots falling onto the ship, otherwise line up under the nearest column and fire."""
+    player = game.player.rect
+    xs, ys, from_player = game.bullets.live()
+    threat = (
+        ~from_player
+        & (ys > invaders.PLAYER_Y - DODGE_RANGE)
+        & (xs + invaders.BULLET_W > player.left - 10)
+        & (xs < player.right + 10)
+    )
+    if threat.any():
+        shot_x = int(xs[threat][0])
+        cornered_left = player.left <= 20 + invaders.PLAYER_SPEED
+        cornered_right = player.right >= invaders.WIDTH - 20 - invaders.PLAYER_SPEED
+        if (shot_x > player.centerx and not cornered_left) or cornered_right:
+            return invaders.ACTION_LEFT
+        return invaders.ACTION_RIGHT
+
+    swarm = game.swarm
+    if not swarm.live_cols:
+        return 0
+    # Lead the target by how far the formation marches while a shot climbs to the column's front invader.
+    drift = swarm.direction * swarm.speed / invaders.BULLET_SPEED
+    targets = []
+    for col in swarm.live_cols:
+        flight = player.top - swarm.cell_y(swarm.col_bottom[col]) - invaders.ENEMY_H
+        targets.append(swarm.cell_x(col) + invaders.ENEMY_W // 2 + drift * flight)
+    target = min(targets, key=lambda x: abs(x - player.centerx))
+    action = invaders.ACTION_FIRE
+    if target < player.centerx - 4:
+        action |= invaders.ACTION_LEFT
+    elif target > player.centerx + 4:
+        action |= invaders.ACTION_RIGHT
+    return action
+
+
+def invaders_random(game, rng: random.Random) -> int:
+    return rng.randrange(8)
+
+
+def brawler_fighter(session, rng: random.Random) -> int:
+    """Walk up to the nearest demon, jump its swings and jab (heavy on healthy demons) when in reach."""
+    player = session.player
+    if not session.demons:
+        return 0
+    nearest = min(session.demons, key=lambda d: abs(d.rect.centerx - player.rect.centerx))
+    dx = nearest.rect.centerx - player.rect.centerx
+    toward = brawler.INPUT_RIGHT if dx > 0 else brawler.INPUT_LEFT
+    if abs(dx) > ATTACK_RANGE:
+        return toward
+
+    buttons = 0
+    if (dx > 0) != (player.direction > 0):
+        buttons |= toward
+    if nearest.attacking > 0 and player.on_ground:
+        buttons |= brawler.INPUT_JUMP
+    if player.attack_cooldown <= 0:
+        buttons |= brawler.INPUT_HEAVY if nearest.health > 16 else brawler.INPUT_LIGHT
+    return buttons
+
+
+def horde_fighter(session, rng: random.Random) -> int:
+    """Face the nearest demon of the horde and keep swinging, heavy whenever it is off cooldown."""
+    player = session.player
+    xs = session.horde.view("x")
+    if not len(xs):
+        return 0
+    offsets = xs + horde.DEMON_W // 2 - player.rect.centerx
+    dx = int(offsets[abs(offsets).argmin()])
+    toward = brawler.INPUT_RIGHT if dx > 0 else brawler.INPUT_LEFT
+    if abs(dx) > ATTACK_RANGE:
+        return toward
+    buttons = toward if (dx > 0) != (player.direction > 0) else 0
+    if player.attack_cooldown <= 0:
+        buttons |= brawler.INPUT_HEAVY
+    return buttons
+
+
+def brawler_random(session, rng: random.Random) -> int:
+    return rng.randrange(32)
+
+
+POLICIES: Dict[str, Dict[str, Policy]] = {
+    "invaders": {"tracker": invaders_tracker, "random": invaders_random},
+    "brawler": {"fighter": brawler_fighter, "random": brawler_random},
+    "horde": {"fighter": horde_fighter, "random": brawler_random},
+}
@@ -0,0 +1,36 @@
+"""
+Locate and import each game's headless simulation so tools can drive either game by name.
+Each simulation exposes step(buttons), snapshot(), restore(state) and a game_over flag.
+"""
+
+import importlib
+import sys
+from pathlib import Path
+from types import ModuleType
+from typing import Dict, Optional, Tuple
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# name -> (source directory, module, simulation class)
+GAMES: Dict[str, Tuple[Path, str, str]] = {
+    "invaders": (REPO_ROOT / "space_invaders", "invaders", "Game"),
+    "brawler": (REPO_ROOT / "kpop_demon_invaders" / "src", "brawler", "GameSession"),
+    "horde": (REPO_ROOT / "kpop_demon_invaders" / "src", "horde", "HordeSession"),
+}
+
+
+def load_module(game: str, module: Optional[str] = None) -> ModuleType:
+    """Import `module` (default: the simulation module) from a game's source directory."""
+    try:
+        directory, sim_module, _ = GAMES[game]
+    except KeyError:
+        raise ValueError(f"unknown game {game!r}; expected one of {sorted(GAMES)}") from None
+    if str(directory) not in sys.path:
+        sys.path.insert(0, str(directory))
+    return importlib.import_module(module or sim_module)
+
+
+def new_simulation(game: str, seed: Optional[int] = None):
+    _, _, class_name = GAMES[game]
+    return getattr(load_module(game), class_name)(seed)
@@ -0,0 +1,510 @@
+"""
+Headless multi-session game host: hundreds of simulations in one asyncio process, played over sockets.
+
+Each client connection owns one session. The client opens it with a game name and seed, then sends
+its buttons whenever they change. The host ticks every live session once per round at the games'
+tick rate and answers with a state delta: only the view fields that changed since the last update
+that client was sent.
+
+Rounds are fair: every session steps exactly once per round, the starting session rotates from
+round to round, and the scheduler yields to the event loop every `YIELD_EVERY` sessions so socket I/O
+is serviced mid-round. When a client reads slower than its updates arrive and its write buffer passes
+`high_water` bytes, updates are coalesced instead of queued: the next delta is taken against the last
+state actually sent, so nothing is lost. Per-session tick times, bytes sent, coalesced updates and
+write-buffer peaks are reported by a STATS request and by `--stats-every`.
+
+Messages are framed as u32 payload length + u8 type (little-endian):
+    client -> host   OPEN json {"game", "seed", "every"}, INPUT u8 buttons, RESET, STATS
+    host -> client   STATE u8 flags + json delta (zlib-compressed when flag 1 is set), STATS json, ERROR text
+
+The horde's demon columns change on almost every update, so while their length holds they are sent as
+"+name": the per-index differences from the values last sent, which compress far better than the values.
+
+    python -m common.host serve --listen 127.0.0.1:7500 --listen unix:/tmp/games.sock --stats-every 5
+    python -m common.host bots --connect unix:/tmp/games.sock --game horde --sessions 200 --seconds 30
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import struct
+import sys
+import time
+import zlib
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from common.games import GAMES, load_module, new_simulation
+from common.sweep import tick_rate
+
+MSG_OPEN = 1
+MSG_INPUT = 2
+MSG_RESET = 3
+MSG_STATS = 4
+MSG_STATE = 5
+MSG_ERROR = 6
+
+FLAG_ZLIB = 1
+COMPRESS_OVER = 512
+YIELD_EVERY = 32
+MAX_MESSAGE = 1 << 20
+# Bot leagues connect hundreds of clients at once; the default backlog of 100 refuses some of them.
+BACKLOG = 1024
+
+_FRAME = struct.Struct("<IB")
+
+
+class ProtocolError(ValueError):
+    pass
+
+
+def frame(kind: int, payload: bytes = b"") -> bytes:
+    return _FRAME.pack(len(payload), kind) + payload
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Tuple[int, bytes]:
+    length, kind = _FRAME.unpack(await reader.readexactly(_FRAME.size))
+    if length > MAX_MESSAGE:
+        raise ProtocolError(f"{length}-byte message is over the {MAX_MESSAGE}-byte limit")
+    return kind, await reader.readexactly(length)
+
+
+def encode_state(delta: dict) -> bytes:
+    blob = json.dumps(delta, separators=(",", ":")).encode()
+    if len(blob) > COMPRESS_OVER:
+        return bytes([FLAG_ZLIB]) + zlib.compress(blob, 1)
+    return bytes([0]) + blob
+
+
+def decode_state(payload: bytes) -> dict:
+    blob = zlib.decompress(payload[1:]) if payload[0] & FLAG_ZLIB else payload[1:]
+    return json.loads(blob)
+
+
+def apply_delta(state: dict, delta: dict) -> None:
+    """Merge a decoded STATE delta into `state`, adding "+name" differences to the list `name`."""
+    for key, value in delta.items():
+        if key.startswith("+"):
+            name = key[1:]
+            state[name] = [old + change for old, change in zip(state[name], value)]
+        else:
+            state[key] = value
+
+
+def parse_open(payload: bytes) -> Tuple[str, Optional[int], int]:
+    """The game, seed and update interval of an OPEN request."""
+    request = json.loads(payload)
+    if not isinstance(request, dict):
+        raise ProtocolError("OPEN expects a JSON object")
+    game = request.get("game")
+    if not isinstance(game, str) or game not in GAMES:
+        raise ProtocolError(f"unknown game {game!r}; expected one of {sorted(GAMES)}")
+    seed = request.get("seed")
+    if seed is not None and (not isinstance(seed, int) or isinstance(seed, bool)):
+        raise ProtocolError(f"seed must be an integer or null, not {seed!r}")
+    every = request.get("every", 1)
+    if not isinstance(every, int) or isinstance(every, bool) or every < 1:
+        raise ProtocolError(f"every must be a positive integer, not {every!r}")
+    return game, seed, every
+
+
+def invaders_view(game) -> dict:
+    xs, ys, from_player = game.bullets.live()
+    return {
+        "tick": game.frame,
+        "score": game.score,
+        "lives": game.player.lives,
+        "game_over": game.game_over,
+        "won": game.player_won,
+        "player_x": game.player.rect.x,
+        "swarm": [game.swarm.origin_x, game.swarm.origin_y],
+        "alive": "".join("1" if enemy.alive else "0" for enemy in game.swarm.enemies),
+        "bullets": [xs.tolist(), ys.tolist(), from_player.astype(int).tolist()],
+    }
+
+
+def _fighter_view(fighter) -> list:
+    return [fighter.rect.x, fighter.rect.y, fighter.health, fighter.direction, fighter.attacking > 0]
+
+
+def brawler_view(session) -> dict:
+    return {
+        "tick": session.tick,
+        "defeated": session.defeated,
+        "game_over": session.game_over,
+        "won": session.player_won,
+        "player": _fighter_view(session.player),
+        "demons": [[d.rect.x, d.rect.y, d.health, d.direction] for d in session.demons],
+        "hitboxes": [[*hb.rect, hb.owner is session.player] for hb in session.hitboxes],
+    }
+
+
+def horde_view(session) -> dict:
+    horde = session.horde
+    return {
+        "tick": session.tick,
+        "defeated": session.defeated,
+        "game_over": session.game_over,
+        "won": session.player_won,
+        "player": _fighter_view(session.player),
+        "demon_x": horde.view("x").astype(int).tolist(),
+        "demon_y": horde.view("y").astype(int).tolist(),
+        "demon_health": horde.view("health").tolist(),
+    }
+
+
+# game -> what a client is sent each update
+VIEWS: Dict[str, Callable[[object], dict]] = {"invaders": invaders_view, "brawler": brawler_view, "horde": horde_view}
+# game -> view lists sent as per-index differences while their length is unchanged
+DIFFED: Dict[str, Tuple[str, ...]] = {"horde": ("demon_x", "demon_y", "demon_health")}
+
+
+def press_bits(game: str) -> int:
+    """Buttons that act on the press (the brawler's jump and attacks): delivered to one tick, never repeated."""
+    if game == "invaders":
+        return 0
+    return sum(load_module(game, "brawler").BUFFERED_INPUTS)
+
+
+class HostedSession:
+    """One client's simulation, its input state, the last view it was sent and its metrics."""
+
+    def __init__(self, session_id: int, game: str, seed: Optional[int], every: int, writer: asyncio.StreamWriter) -> None:
+        self.id = session_id
+        self.game = game
+        self.seed = seed
+        self.every = every
+        self.writer = writer
+        self.sim = new_simulation(game, seed)
+        self.view = VIEWS[game]
+        self.diffed = DIFFED.get(game, ())
+        self.rate = tick_rate(game)
+        self.edges = press_bits(game)
+        self.held = 0
+        self.pressed = 0
+        self.credit = 0.0
+        self.sent_view: Dict[str, object] = {}
+        self.tick_ms: Deque[float] = deque(maxlen=600)
+        self.ticks = 0
+        self.inputs = 0
+        self.updates = 0
+        self.coalesced = 0
+        self.bytes_sent = 0
+        self.peak_buffer = 0
+
+    def set_buttons(self, buttons: int) -> None:
+        self.inputs += 1
+        self.pressed |= buttons & ~self.held & self.edges
+        self.held = buttons
+
+    def reset(self) -> None:
+        self.sim.reset()
+        self.held = self.pressed = 0
+
+    def tick(self, high_water: int) -> None:
+        start = time.perf_counter()
+        sim = self.sim
+        if not sim.game_over:
+            sim.step(self.held & ~self.edges | self.pressed)
+            self.pressed = 0
+            self.ticks += 1
+            if self.ticks % self.every == 0 or sim.game_over:
+                self._send_update(high_water)
+        self.tick_ms.append((time.perf_counter() - start) * 1000)
+
+    def _send_update(self, high_water: int) -> None:
+        buffered = self.writer.transport.get_write_buffer_size()
+        self.peak_buffer = max(self.peak_buffer, buffered)
+        if buffered > high_water and not self.sim.game_over:
+            self.coalesced += 1
+            return
+        view = self.view(self.sim)
+        sent = self.sent_view
+        delta = {}
+        for key, value in view.items():
+            old = sent.get(key)
+            if old == value:
+                continue
+            if key in self.diffed and old is not None and len(old) == len(value):
+                delta["+" + key] = [new - prev for new, prev in zip(value, old)]
+            else:
+                delta[key] = value
+        self.sent_view = view
+        message = frame(MSG_STATE, encode_state(delta))
+        self.writer.write(message)
+        self.updates += 1
+        self.bytes_sent += len(message)
+
+    def stats(self) -> dict:
+        ordered = sorted(self.tick_ms)
+        return {
+            "session": self.id,
+            "game": self.game,
+            "seed": self.seed,
+            "ticks": self.ticks,
+            "game_over": self.sim.game_over,
+            "inputs": self.inputs,
+            "updates": self.updates,
+            "coalesced": self.coalesced,
+            "bytes_sent": self.bytes_sent,
+            "write_buffer": self.writer.transport.get_write_buffer_size(),
+            "peak_write_buffer": self.peak_buffer,
+            "tick_p50_ms": ordered[len(ordered) // 2] if ordered else 0.0,
+            "tick_p99_ms": ordered[min(int(len(ordered) * 0.99), len(ordered) - 1)] if ordered else 0.0,
+        }
+
+
+class GameHost:
+    """Runs every connected client's session on one fair, fixed-rate tick scheduler."""
+
+    def __init__(self, rate: int = 60, high_water: int = 64 * 1024) -> None:
+        self.rate = rate
+        self.high_water = high_water
+        self.sessions: Dict[int, HostedSession] = {}
+        self.rounds = 0
+        self.overruns = 0
+        self.dropped_rounds = 0
+        self.round_ms: Deque[float] = deque(maxlen=600)
+        self._next_id = 0
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        session: Optional[HostedSession] = None
+        try:
+            while True:
+                kind, payload = await read_frame(reader)
+                if kind == MSG_OPEN:
+                    game, seed, every = parse_open(payload)
+                    if session:
+                        del self.sessions[session.id]
+                    self._next_id += 1
+                    session = HostedSession(self._next_id, game, seed, every, writer)
+                    self.sessions[session.id] = session
+                elif kind == MSG_STATS:
+                    writer.write(frame(MSG_STATS, json.dumps(self.stats()).encode()))
+                elif session is None:
+                    raise ProtocolError("OPEN a session first")
+                elif kind == MSG_INPUT:
+                    session.set_buttons(payload[0])
+                elif kind == MSG_RESET:
+                    session.reset()
+                else:
+                    raise ProtocolError(f"unknown message type {kind}")
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except (ValueError, IndexError, TypeError) as exc:
+            writer.write(frame(MSG_ERROR, str(exc).encode()))
+        finally:
+            if session:
+                self.sessions.pop(session.id, None)
+            writer.close()
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        dt = 1.0 / self.rate
+        next_round = loop.time()
+        while True:
+            start = time.perf_counter()
+            sessions = list(self.sessions.values())
+            if sessions:
+                # Rotate the order so no session is always stepped (and answered) last.
+                first = self.rounds % len(sessions)
+                sessions = sessions[first:] + sessions[:first]
+            for i, session in enumerate(sessions, 1):
+                session.credit += session.rate / self.rate
+                while session.credit >= 1.0:
+                    session.credit -= 1.0
+                    session.tick(self.high_water)
+                if i % YIELD_EVERY == 0:
+                    await asyncio.sleep(0)
+            self.rounds += 1
+            self.round_ms.append((time.perf_counter() - start) * 1000)
+
+            next_round += dt
+            delay = next_round - loop.time()
+            if delay < 0:
+                self.overruns += 1
+                if delay < -5 * dt:
+                    # Too far behind to catch up: drop the backlog rather than burst through it.
+                    self.dropped_rounds += int(-delay / dt)
+                    next_round = loop.time()
+            await asyncio.sleep(max(delay, 0.0))
+
+    def stats(self) -> dict:
+        ordered = sorted(self.round_ms)
+        return {
+            "sessions": len(self.sessions),
+            "rounds": self.rounds,
+            "overruns": self.overruns,
+            "dropped_rounds": self.dropped_rounds,
+            "round_p50_ms": ordered[len(ordered) // 2] if ordered else 0.0,
+            "round_p99_ms": ordered[min(int(len(ordered) * 0.99), len(ordered) - 1)] if ordered else 0.0,
+            "per_session": [session.stats() for session in self.sessions.values()],
+        }
+
+    def summary(self) -> str:
+        stats = self.stats()
+        per_session = stats["per_session"]
+        coalesced = sum(s["coalesced"] for s in per_session)
+        sent = sum(s["bytes_sent"] for s in per_session)
+        worst = max((s["tick_p99_ms"] for s in per_session), default=0.0)
+        return (
+            f"{stats['sessions']} sessions  round p50 {stats['round_p50_ms']:.2f} ms  p99 {stats['round_p99_ms']:.2f} ms"
+            f"  overruns {stats['overruns']}  worst session tick p99 {worst:.3f} ms"
+            f"  coalesced {coalesced}  sent {sent / 1e6:.1f} MB"
+        )
+
+
+async def open_connection(address: str) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    """Connect to "unix:/path" or "host:port"."""
+    if address.startswith("unix:"):
+        return await asyncio.open_unix_connection(address[len("unix:"):])
+    host, _, port = address.rpartition(":")
+    return await asyncio.open_connection(host or "127.0.0.1", int(port))
+
+
+async def start_server(host: GameHost, address: str) -> asyncio.AbstractServer:
+    if address.startswith("unix:"):
+        return await asyncio.start_unix_server(host.handle_client, address[len("unix:"):], backlog=BACKLOG)
+    name, _, port = address.rpartition(":")
+    return await asyncio.start_server(host.handle_client, name or "127.0.0.1", int(port), backlog=BACKLOG)
+
+
+class HostClient:
+    """One remote session: `open()`, then `send(buttons)` and `update()` for the merged state."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.reader = reader
+        self.writer = writer
+        self.state: Dict[str, object] = {}
+
+    @classmethod
+    async def connect(cls, address: str) -> "HostClient":
+        return cls(*await open_connection(address))
+
+    def open(self, game: str, seed: Optional[int] = None, every: int = 1) -> None:
+        self.state = {}
+        self.writer.write(frame(MSG_OPEN, json.dumps({"game": game, "seed": seed, "every": every}).encode()))
+
+    def send(self, buttons: int) -> None:
+        self.writer.write(frame(MSG_INPUT, bytes([buttons])))
+
+    def reset(self) -> None:
+        self.writer.write(frame(MSG_RESET))
+
+    async def update(self) -> dict:
+        """Wait for the next state update and return the full state with it applied."""
+        while True:
+            kind, payload = await read_frame(self.reader)
+            if kind == MSG_STATE:
+                apply_delta(self.state, decode_state(payload))
+                return self.state
+            if kind == MSG_ERROR:
+                raise ProtocolError(payload.decode())
+
+    async def stats(self) -> dict:
+        """Host-wide stats; state updates arriving meanwhile are applied to `state`."""
+        self.writer.write(frame(MSG_STATS))
+        while True:
+            kind, payload = await read_frame(self.reader)
+            if kind == MSG_STATS:
+                return json.loads(payload)
+            if kind == MSG_STATE:
+                apply_delta(self.state, decode_state(payload))
+            elif kind == MSG_ERROR:
+                raise ProtocolError(payload.decode())
+
+    async def close(self) -> None:
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+async def serve(addresses: List[str], rate: int, high_water: int, stats_every: float) -> None:
+    host = GameHost(rate, high_water)
+    servers = [await start_server(host, address) for address in addresses]
+    print(f"hosting on {', '.join(addresses)} at {rate} ticks/s")
+    tasks = [asyncio.create_task(host.run())]
+    if stats_every:
+
+        async def report() -> None:
+            while True:
+                await asyncio.sleep(stats_every)
+                print(host.summary(), flush=True)
+
+        tasks.append(asyncio.create_task(report()))
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        for server in servers:
+            server.close()
+
+
+async def run_bots(address: str, game: str, sessions: int, seconds: float, seed: int) -> None:
+    """Load test: `sessions` clients pressing random buttons; prints the host's stats at the end."""
+
+    async def bot(i: int) -> int:
+        client = await HostClient.connect(address)
+        client.open(game, seed + i)
+        rng = random.Random(seed + i)
+        updates = 0
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            try:
+                state = await asyncio.wait_for(client.update(), deadline - time.perf_counter())
+            except asyncio.TimeoutError:
+                break
+            updates += 1
+            if state.get("game_over"):
+                client.reset()
+            elif rng.random() < 0.2:
+                client.send(rng.randrange(32 if game != "invaders" else 8))
+        await client.close()
+        return updates
+
+    async def host_stats() -> dict:
+        # Sampled just before the bots disconnect, while their sessions are still on the host.
+        await asyncio.sleep(seconds * 0.9)
+        monitor = await HostClient.connect(address)
+        stats = await monitor.stats()
+        await monitor.close()
+        return stats
+
+    stats, *results = await asyncio.gather(host_stats(), *(bot(i) for i in range(sessions)))
+    print(f"{sessions} bots: {sum(results) / sessions / seconds:.1f} updates/s each (min {min(results) / seconds:.1f})")
+    per_session = stats["per_session"]
+    print(
+        f"host: {stats['sessions']} sessions  round p50 {stats['round_p50_ms']:.2f} ms  p99 {stats['round_p99_ms']:.2f} ms"
+        f"  overruns {stats['overruns']}  dropped rounds {stats['dropped_rounds']}"
+        f"  session tick p99 max {max((s['tick_p99_ms'] for s in per_session), default=0.0):.3f} ms"
+        f"  coalesced {sum(s['coalesced'] for s in per_session)}"
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Host many headless game sessions over Unix or TCP sockets.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    server = commands.add_parser("serve", help="run the host")
+    server.add_argument("--listen", action="append", default=[], help="host:port or unix:/path (repeatable; default 127.0.0.1:7500)")
+    server.add_argument("--rate", type=int, default=60, help="scheduler rounds per second")
+    server.add_argument("--high-water", type=int, default=64 * 1024, help="coalesce a client's updates past this many unsent bytes")
+    server.add_argument("--stats-every", type=float, default=0.0, help="print a metrics line every N seconds")
+    bots = commands.add_parser("bots", help="connect random-input clients to a running host")
+    bots.add_argument("--connect", default="127.0.0.1:7500")
+    bots.add_argument("--game", choices=sorted(GAMES), default="invaders")
+    bots.add_argument("--sessions", type=int, default=100)
+    bots.add_argument("--seconds", type=float, default=10.0)
+    bots.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == "serve":
+            asyncio.run(serve(args.listen or ["127.0.0.1:7500"], args.rate, args.high_water, args.stats_every))
+        else:
+            asyncio.run(run_bots(args.connect, args.game, args.sessions, args.seconds, args.seed))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+"""
+Timestamped keyboard input for fixed-tick game loops.
+
+`InputQueue.pump(events)` drains key events into a queue stamped with the time they were drained, and
+`next_tick()` turns the queue into one button bitmask per simulation tick: held keys are tracked from
+KEYDOWN/KEYUP pairs rather than polled, so a tap that starts and ends between two ticks still reaches
+one tick. Bits listed as `edges` (jump, attack) are reported only on the tick after they were pressed.
+
+Each press is followed to the tick that consumed it and to the next presented frame, filling the
+input-to-simulation and input-to-flip `LatencyHistogram`s. Latency is measured from when the event
+was drained, so time spent in the OS queue before the frame began is not included.
+
+`pump()` and `presented()` may run on a different thread from `next_tick()` (see `common.pipeline`).
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+import pygame
+
+
+class LatencyHistogram:
+    """Fixed-width millisecond buckets with an overflow bucket; percentiles are bucket upper edges."""
+
+    def __init__(self, bucket_ms: float = 1.0, buckets: int = 200) -> None:
+        self.bucket_ms = bucket_ms
+        self.counts = [0] * (buckets + 1)
+        self.total = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, seconds: float) -> None:
+        ms = seconds * 1000
+        self.counts[min(int(ms / self.bucket_ms), len(self.counts) - 1)] += 1
+        self.total += 1
+        self.sum_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def percentile(self, q: float) -> float:
+        if not self.total:
+            return 0.0
+        rank = q / 100 * self.total
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return min((i + 1) * self.bucket_ms, self.max_ms)
+        return self.max_ms
+
+    @property
+    def mean_ms(self) -> float:
+        return self.sum_ms / self.total if self.total else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "bucket_ms": self.bucket_ms,
+            "counts": self.counts,
+            "samples": self.total,
+            "mean_ms": self.mean_ms,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "max_ms": self.max_ms,
+        }
+
+    def render(self, width: int = 40) -> List[str]:
+        """Text bars for the occupied buckets."""
+        if not self.total:
+            return ["  (no samples)"]
+        peak = max(self.counts)
+        lines = []
+        for i in (i for i, count in enumerate(self.counts) if count):
+            label = f">={i * self.bucket_ms:g}" if i == len(self.counts) - 1 else f"{i * self.bucket_ms:g}-{(i + 1) * self.bucket_ms:g}"
+            lines.append(f"  {label:>9} ms {'#' * round(self.counts[i] / peak * width):<{width}} {self.counts[i]}")
+        return lines
+
+
+class InputQueue:
+    def __init__(self, keymap: Dict[int, int], edges: int = 0) -> None:
+        self.keymap = keymap
+        self.edges = edges
+        self.to_sim = LatencyHistogram()
+        self.to_flip = LatencyHistogram()
+        self._queue: Deque[Tuple[float, Optional[int], bool]] = deque()
+        self._down: Set[int] = set()
+        self._carry = 0
+        self._last_pressed = 0
+        # Drain times of presses already simulated but not yet on screen.
+        self._unpresented: List[float] = []
+        self._lock = threading.Lock()
+
+    @property
+    def held(self) -> int:
+        bits = 0
+        for key in self._down:
+            bits |= self.keymap[key]
+        return bits
+
+    def pump(self, events: Iterable[pygame.event.Event]) -> None:
+        """Queue this frame's key events; call once per frame with everything from `pygame.event.get()`."""
+        now = time.perf_counter()
+        for event in events:
+            if event.type in (pygame.KEYDOWN, pygame.KEYUP) and event.key in self.keymap:
+                self._queue.append((now, event.key, event.type == pygame.KEYDOWN))
+            elif event.type == pygame.WINDOWFOCUSLOST:
+                # Key-ups are not delivered to an unfocused window, so nothing can be trusted as held.
+                self._queue.append((now, None, False))
+
+    def next_tick(self, now: Optional[float] = None) -> int:
+        """Buttons for the next simulation tick: what is held, plus everything pressed since the last tick."""
+        now = time.perf_counter() if now is None else now
+        pressed = self._carry
+        self._carry = 0
+        queue = self._queue
+        with self._lock:
+            while queue and queue[0][0] <= now:
+                stamp, key, down = queue.popleft()
+                if key is None:
+                    self._down.clear()
+                elif down:
+                    if key not in self._down:
+                        self._down.add(key)
+                        pressed |= self.keymap[key]
+                        self.to_sim.add(now - stamp)
+                        self._unpresented.append(stamp)
+                else:
+                    self._down.discard(key)
+        self._last_pressed = pressed
+        return self.held & ~self.edges | pressed
+
+    def requeue(self) -> None:
+        """The last tick's buttons were not simulated (e.g. a stalled netplay tick); press them again next tick."""
+        self._carry |= self._last_pressed
+
+    def presented(self) -> None:
+        """Call after the frame is flipped; closes the input-to-flip samples for presses simulated so far."""
+        now = time.perf_counter()
+        with self._lock:
+            for stamp in self._unpresented:
+                self.to_flip.add(now - stamp)
+            self._unpresented.clear()
+
+    def summary(self) -> str:
+        lines = []
+        for name, histogram in (("input -> sim", self.to_sim), ("input -> flip", self.to_flip)):
+            lines.append(
+                f"{name:>13}  n {histogram.total:5d}  mean {histogram.mean_ms:6.2f} ms  p50 {histogram.percentile(50):5.1f} ms"
+                f"  p95 {histogram.percentile(95):5.1f} ms  p99 {histogram.percentile(99):5.1f} ms"
+            )
+            lines.extend(histogram.render())
+        return "\n".join(lines)
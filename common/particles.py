@@ -0,0 +1,165 @@
+"""
+NumPy particle system for hit sparks and explosions in both games.
+
+Particles live in parallel arrays (position, velocity, remaining and total life, color) packed at the
+front: `burst()` appends a whole burst with array writes, `update(dt)` moves every particle in a
+handful of vectorized operations and compacts the survivors in place, so no per-particle Python
+object ever exists. `draw()` writes each particle as a small square of pixels straight into the
+target surface through `pygame.surfarray`, dimming from its color to 15% of it over its life.
+
+Particles are cosmetic: they draw from their own RNG, never the simulation's, so emitting them
+cannot change a seeded run or a replay. Simulations report where effects belong through an
+`on_effect(kind, x, y)` hook (None unless a renderer wants particles).
+"""
+
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+import pygame
+
+# A simulation's particle hook: effect kind and where it happened.
+EffectHook = Callable[[str, float, float], None]
+
+FADE_LEVELS = 16
+
+
+class ParticleSystem:
+    def __init__(
+        self,
+        capacity: int = 65536,
+        gravity: float = 900.0,
+        drag: float = 2.5,
+        size: int = 2,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.capacity = capacity
+        self.gravity = gravity
+        self.drag = drag
+        self.size = size
+        self.count = 0
+        self.dropped = 0
+        self.rng = np.random.default_rng(seed)
+        self.x = np.zeros(capacity, np.float32)
+        self.y = np.zeros(capacity, np.float32)
+        self.vx = np.zeros(capacity, np.float32)
+        self.vy = np.zeros(capacity, np.float32)
+        self.life = np.zeros(capacity, np.float32)
+        self.max_life = np.ones(capacity, np.float32)
+        self.color = np.zeros(capacity, np.uint8)
+        # RGB color -> palette row; each row dims from the color to 15% of it in FADE_LEVELS steps.
+        self._colors: Dict[Tuple[int, int, int], int] = {}
+        self._palette = np.zeros((0, FADE_LEVELS, 3), np.uint8)
+        self._mapped: Optional[np.ndarray] = None
+        self._mapped_for: Optional[Tuple[int, ...]] = None
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _fields(self) -> Tuple[np.ndarray, ...]:
+        return self.x, self.y, self.vx, self.vy, self.life, self.max_life, self.color
+
+    def _color_index(self, color: Tuple[int, int, int]) -> int:
+        index = self._colors.get(color)
+        if index is None:
+            if len(self._colors) == 256:
+                raise ValueError("a particle system holds at most 256 colors")
+            index = self._colors[color] = len(self._colors)
+            fade = np.linspace(1.0, 0.15, FADE_LEVELS)[:, None] * np.array(color, np.float32)
+            self._palette = np.concatenate([self._palette, fade.astype(np.uint8)[None]])
+            self._mapped = None
+        return index
+
+    def burst(
+        self,
+        x: float,
+        y: float,
+        count: int,
+        color: Tuple[int, int, int],
+        speed: Tuple[float, float] = (80.0, 420.0),
+        life: Tuple[float, float] = (0.25, 0.7),
+        direction: float = 0.0,
+        spread: float = 2 * np.pi,
+    ) -> None:
+        """Emit `count` particles from (x, y), fanned `spread` radians around `direction` (0 = right, y down)."""
+        count = min(count, self.capacity - self.count)
+        if count <= 0:
+            self.dropped += 1
+            return
+        s = slice(self.count, self.count + count)
+        rng = self.rng
+        angle = direction + (rng.random(count, np.float32) - 0.5) * spread
+        velocity = rng.uniform(speed[0], speed[1], count).astype(np.float32)
+        self.x[s] = x
+        self.y[s] = y
+        self.vx[s] = np.cos(angle) * velocity
+        self.vy[s] = np.sin(angle) * velocity
+        self.life[s] = self.max_life[s] = rng.uniform(life[0], life[1], count)
+        self.color[s] = self._color_index(color)
+        self.count += count
+
+    def update(self, dt: float) -> None:
+        n = self.count
+        if not n or dt <= 0:
+            return
+        x, y, vx, vy, life = self.x[:n], self.y[:n], self.vx[:n], self.vy[:n], self.life[:n]
+        vy += self.gravity * dt
+        damping = np.float32(max(0.0, 1.0 - self.drag * dt))
+        vx *= damping
+        vy *= damping
+        x += vx * dt
+        y += vy * dt
+        life -= dt
+
+        alive = life > 0
+        kept = int(np.count_nonzero(alive))
+        if kept < n:
+            # Survivors move to the front of the same arrays; the tail is free for the next burst.
+            for field in self._fields():
+                field[:kept] = field[:n][alive]
+            self.count = kept
+
+    def clear(self) -> None:
+        self.count = 0
+
+    def draw(self, surface: pygame.Surface) -> Optional[pygame.Rect]:
+        """Plot every live particle into `surface`; returns the area touched, or None if nothing was drawn."""
+        n = self.count
+        if not n:
+            return None
+        width, height = surface.get_size()
+        size = self.size
+        xs = self.x[:n].astype(np.int32)
+        ys = self.y[:n].astype(np.int32)
+        inside = (xs >= 0) & (ys >= 0) & (xs < width - size + 1) & (ys < height - size + 1)
+        if not inside.all():
+            xs, ys = xs[inside], ys[inside]
+        if not len(xs):
+            return None
+
+        fade = (1.0 - self.life[:n] / self.max_life[:n]) * (FADE_LEVELS - 1)
+        levels = np.clip(fade, 0, FADE_LEVELS - 1).astype(np.intp)
+        # 24-bit pixels have no integer view, so those surfaces are written channel by channel as RGB.
+        packed = surface.get_bytesize() != 3
+        palette = self._surface_colors(surface) if packed else self._palette
+        colors = palette[self.color[:n], levels]
+        if len(colors) != len(xs):
+            colors = colors[inside]
+
+        pixels = pygame.surfarray.pixels2d(surface) if packed else pygame.surfarray.pixels3d(surface)
+        try:
+            for dx in range(size):
+                for dy in range(size):
+                    pixels[xs + dx, ys + dy] = colors
+        finally:
+            del pixels
+        left, top = int(xs.min()), int(ys.min())
+        return pygame.Rect(left, top, int(xs.max()) - left + size, int(ys.max()) - top + size)
+
+    def _surface_colors(self, surface: pygame.Surface) -> np.ndarray:
+        """The palette as pixel values in `surface`'s format, rebuilt when the format or palette changes."""
+        fmt = (surface.get_bitsize(), *surface.get_masks(), *surface.get_shifts())
+        if self._mapped is None or self._mapped_for != fmt:
+            flat = [surface.map_rgb(tuple(int(c) for c in rgb)) for rgb in self._palette.reshape(-1, 3)]
+            self._mapped = np.array(flat, np.uint32).reshape(self._palette.shape[:2])
+            self._mapped_for = fmt
+        return self._mapped
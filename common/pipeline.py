@@ -0,0 +1,208 @@
+"""
+Pipelined game loop: the simulation ticks on its own thread while the main thread draws.
+
+`SimulationThread` runs a simulation's fixed-rate ticks on a background thread and, after each batch of
+ticks, publishes the simulation's `snapshot()` (plain, immutable data) into a `SnapshotHandoff`. The
+main thread keeps its own copy of the simulation as a view: each frame `sync(view)` restores the newest
+published state into it and the renderer draws the view, so the two threads never touch the same
+objects. Pygame releases the GIL in most blits, fills and the flip, so a tick can run while the frame
+is being built and presented.
+
+The handoff holds at most `depth` states (2 = double buffering, 3 = triple buffering). When the render
+thread falls behind, the oldest state is replaced and counted as dropped; effects reported through
+`on_effect` travel with the states and are never dropped. Views are drawn at the tick they show,
+without interpolation, because a restored state has no previous-tick positions.
+
+Pygame needs the window and event queue on the main thread, so rendering stays there; only the
+simulation moves. Everything the main thread wants to change in the simulation (a reset, say) goes
+through `submit()` and runs on the simulation thread between ticks.
+"""
+
+import sys
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, List, NamedTuple, Optional, Tuple
+
+from common.timestep import FixedTimestep
+
+# Python threads hand over the GIL every 5 ms by default; a shorter interval lets the render thread
+# take it back promptly when a blit or flip returns.
+SWITCH_INTERVAL = 0.0005
+
+Effect = Tuple[str, float, float]
+
+
+class Published(NamedTuple):
+    tick: int
+    state: tuple
+    effects: List[Effect]
+
+
+class SnapshotHandoff:
+    """Bounded, lock-protected handoff of published states from the simulation to the render thread."""
+
+    def __init__(self, depth: int = 2) -> None:
+        if depth < 1:
+            raise ValueError("handoff depth must be at least 1")
+        self.depth = depth
+        self.published = 0
+        self.dropped = 0
+        self.empty = 0
+        # How many states were waiting each time the render thread took one.
+        self.depth_counts = [0] * (depth + 1)
+        self._slots: Deque[Published] = deque()
+        self._lock = threading.Lock()
+
+    def publish(self, entry: Published) -> None:
+        with self._lock:
+            if len(self._slots) == self.depth:
+                oldest = self._slots.popleft()
+                self.dropped += 1
+                entry.effects[:0] = oldest.effects
+            self._slots.append(entry)
+            self.published += 1
+
+    def take(self) -> Optional[Published]:
+        """The newest state with the effects of every state skipped on the way, or None if nothing new."""
+        with self._lock:
+            waiting = len(self._slots)
+            self.depth_counts[waiting] += 1
+            if not waiting:
+                self.empty += 1
+                return None
+            entries = list(self._slots)
+            self._slots.clear()
+            self.dropped += waiting - 1
+        newest = entries[-1]
+        if waiting > 1:
+            effects = [effect for entry in entries for effect in entry.effects]
+            newest = newest._replace(effects=effects)
+        return newest
+
+
+class SimulationThread:
+    """Ticks `sim` at `tick_rate` on a background thread; `tick()` advances it by one tick."""
+
+    def __init__(
+        self,
+        sim: object,
+        tick_rate: int,
+        tick: Callable[[], None],
+        depth: int = 2,
+        max_steps: int = 5,
+    ) -> None:
+        self.sim = sim
+        self.tick = tick
+        self.timestep = FixedTimestep(tick_rate, max_steps)
+        self.handoff = SnapshotHandoff(depth)
+        self.ticks = 0
+        self.frames = 0
+        self.frame_dt = 0.0
+        self.error: Optional[BaseException] = None
+        self._sim_busy = 0.0
+        self._render_busy = 0.0
+        self._frame_start = 0.0
+        self._started = 0.0
+        self._commands: Deque[Callable[[], None]] = deque()
+        self._effects: List[Effect] = []
+        self._switch_interval = sys.getswitchinterval()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="simulation", daemon=True)
+
+    def on_effect(self, kind: str, x: float, y: float) -> None:
+        """Target for the simulation's `on_effect` hook; effects are handed to `sync()` with the next state."""
+        self._effects.append((kind, x, y))
+
+    def submit(self, command: Callable[[], None]) -> None:
+        """Run `command` on the simulation thread before its next tick."""
+        self._commands.append(command)
+
+    def start(self) -> None:
+        self._publish()
+        self._started = time.perf_counter()
+        sys.setswitchinterval(SWITCH_INTERVAL)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        sys.setswitchinterval(self._switch_interval)
+
+    def _publish(self) -> None:
+        effects, self._effects = self._effects, []
+        self.handoff.publish(Published(self.ticks, self.sim.snapshot(), effects))
+
+    def _run(self) -> None:
+        timestep = self.timestep
+        commands = self._commands
+        try:
+            while not self._stop.is_set():
+                steps = timestep.advance()
+                start = time.perf_counter()
+                changed = bool(commands)
+                while commands:
+                    commands.popleft()()
+                for _ in range(steps):
+                    self.tick()
+                    self.ticks += 1
+                if steps or changed:
+                    self._publish()
+                self._sim_busy += time.perf_counter() - start
+                self._stop.wait(max(timestep.dt - timestep.accumulator, 0.0))
+        except BaseException as exc:  # re-raised on the main thread by sync()
+            self.error = exc
+
+    # Render-thread side.
+
+    def begin_frame(self) -> None:
+        """Call at the start of each rendered frame, after any frame-rate wait."""
+        now = time.perf_counter()
+        self.frame_dt = now - self._frame_start if self._frame_start else 0.0
+        self._frame_start = now
+
+    def sync(self, view: object, on_effect: Optional[Callable[[str, float, float], None]] = None) -> bool:
+        """Restore the newest published state into `view` and replay its effects; False if nothing new."""
+        if self.error:
+            raise RuntimeError("simulation thread failed") from self.error
+        entry = self.handoff.take()
+        if entry is None:
+            return False
+        view.restore(entry.state)
+        if on_effect:
+            for effect in entry.effects:
+                on_effect(*effect)
+        return True
+
+    def end_frame(self) -> None:
+        """Call once the frame is presented."""
+        self._render_busy += time.perf_counter() - self._frame_start
+        self.frames += 1
+
+    def stats(self) -> dict:
+        elapsed = max(time.perf_counter() - self._started, 1e-9) if self._started else 1e-9
+        handoff = self.handoff
+        return {
+            "ticks": self.ticks,
+            "frames": self.frames,
+            "published": handoff.published,
+            "dropped": handoff.dropped,
+            "empty_frames": handoff.empty,
+            "queue_depth": {str(depth): count for depth, count in enumerate(handoff.depth_counts)},
+            "sim_utilization": self._sim_busy / elapsed,
+            "render_utilization": self._render_busy / elapsed,
+            "dropped_ticks": self.timestep.dropped_ticks,
+        }
+
+    def summary(self) -> str:
+        stats = self.stats()
+        depths = "  ".join(f"{depth}: {count}" for depth, count in stats["queue_depth"].items())
+        return "\n".join(
+            [
+                f"pipeline: {stats['ticks']} ticks, {stats['frames']} frames, {stats['published']} states published,"
+                f" {stats['dropped']} dropped before drawing, {stats['empty_frames']} frames with no new state",
+                f"  queue depth when taken  {depths}",
+                f"  utilization  simulation {stats['sim_utilization']:6.1%}  render {stats['render_utilization']:6.1%}",
+            ]
+        )
@@ -0,0 +1,178 @@
+"""
+Per-phase frame profiler: rolling p50/p99 per phase, an on-screen frame graph and Chrome trace export.
+
+The game loop calls `begin_frame()`, `mark(phase)` after each phase and `end_frame()`; simulations
+and renderers call their `on_phase` hook (None unless profiling is on) at their internal phase
+boundaries. `mark(phase)` charges the time since the previous mark to `phase`. While the profiler is
+disabled every call returns immediately and the hooks are detached.
+"""
+
+import json
+from collections import deque
+from pathlib import Path
+from time import perf_counter_ns
+from typing import Deque, Dict, List, Optional, Tuple
+
+import pygame
+
+
+PHASE_COLORS = [
+    (90, 170, 255),
+    (255, 180, 70),
+    (120, 220, 120),
+    (240, 90, 90),
+    (200, 130, 255),
+    (90, 220, 220),
+    (240, 230, 110),
+    (255, 130, 200),
+]
+GRAPH_W, GRAPH_H = 240, 90
+GRAPH_MAX_MS = 33.3
+PANEL_PAD = 6
+TEXT_REFRESH_FRAMES = 30
+
+
+class FrameProfiler:
+    def __init__(self, history: int = 600, trace: bool = False) -> None:
+        self.enabled = False
+        self.history = history
+        self.trace = trace
+        self.frame_ms: Deque[float] = deque(maxlen=history)
+        self.phase_ms: Dict[str, Deque[float]] = {}
+        self.events: List[dict] = []
+        self._origin = perf_counter_ns()
+        self._frame_start = 0
+        self._last = 0
+        self._frame: Dict[str, float] = {}
+        self._hooked: List[object] = []
+        self._font: Optional[pygame.font.Font] = None
+        self._graph: Optional[pygame.Surface] = None
+        self._panel: Optional[pygame.Surface] = None
+        self._frames_since_text = TEXT_REFRESH_FRAMES
+
+    def attach(self, *targets: object) -> None:
+        """Give each simulation/renderer an `on_phase` hook while the profiler is enabled."""
+        self._hooked.extend(targets)
+        for target in targets:
+            target.on_phase = self.mark if self.enabled else None
+
+    def set_enabled(self, enabled: bool) -> None:
+        self.enabled = enabled
+        for target in self._hooked:
+            target.on_phase = self.mark if enabled else None
+        self._last = 0
+
+    def toggle(self) -> None:
+        self.set_enabled(not self.enabled)
+
+    def begin_frame(self) -> None:
+        if not self.enabled:
+            return
+        self._frame_start = self._last = perf_counter_ns()
+        self._frame = {}
+
+    def mark(self, phase: str) -> None:
+        if not self._last:
+            return
+        now = perf_counter_ns()
+        elapsed = now - self._last
+        self._frame[phase] = self._frame.get(phase, 0.0) + elapsed / 1e6
+        if self.trace:
+            self.events.append(
+                {"name": phase, "ph": "X", "ts": (self._last - self._origin) / 1000, "dur": elapsed / 1000, "pid": 1, "tid": 1}
+            )
+        self._last = now
+
+    def end_frame(self) -> None:
+        if not self._last:
+            return
+        now = perf_counter_ns()
+        total = now - self._frame_start
+        self.frame_ms.append(total / 1e6)
+        for phase, ms in self._frame.items():
+            samples = self.phase_ms.get(phase)
+            if samples is None:
+                samples = self.phase_ms[phase] = deque([0.0] * (len(self.frame_ms) - 1), maxlen=self.history)
+            samples.append(ms)
+        for phase, samples in self.phase_ms.items():
+            if phase not in self._frame:
+                samples.append(0.0)
+        if self.trace:
+            self.events.append(
+                {"name": "frame", "ph": "X", "ts": (self._frame_start - self._origin) / 1000, "dur": total / 1000, "pid": 1, "tid": 1}
+            )
+        self._scroll_graph()
+        self._last = 0
+
+    def stats(self) -> Dict[str, Tuple[float, float]]:
+        """Rolling (p50, p99) in milliseconds for the whole frame and each phase."""
+        result = {"frame": _percentiles(self.frame_ms)}
+        for phase, samples in self.phase_ms.items():
+            result[phase] = _percentiles(samples)
+        return result
+
+    def summary(self) -> str:
+        return "\n".join(f"{name:>10}  p50 {p50:6.2f} ms  p99 {p99:6.2f} ms" for name, (p50, p99) in self.stats().items())
+
+    def save_trace(self, path: Path) -> None:
+        """Write recorded phases as Chrome trace-event JSON (open in chrome://tracing or Perfetto)."""
+        meta = {"name": "thread_name", "ph": "M", "pid": 1, "tid": 1, "args": {"name": "game loop"}}
+        Path(path).write_text(json.dumps({"traceEvents": [meta] + self.events, "displayTimeUnit": "ms"}))
+
+    def _scroll_graph(self) -> None:
+        graph = self._graph
+        if graph is None:
+            return
+        graph.scroll(-1, 0)
+        x = GRAPH_W - 1
+        graph.fill((16, 16, 22), (x, 0, 1, GRAPH_H))
+        y = GRAPH_H
+        for index, samples in enumerate(self.phase_ms.values()):
+            height = round(samples[-1] / GRAPH_MAX_MS * GRAPH_H)
+            if height:
+                pygame.draw.line(graph, PHASE_COLORS[index % len(PHASE_COLORS)], (x, y - 1), (x, y - height))
+                y -= height
+        budget_y = GRAPH_H - round(1000 / 60 / GRAPH_MAX_MS * GRAPH_H)
+        graph.set_at((x, budget_y), (230, 230, 230))
+        frame_y = GRAPH_H - min(GRAPH_H, round(self.frame_ms[-1] / GRAPH_MAX_MS * GRAPH_H))
+        graph.set_at((x, frame_y), (255, 255, 255))
+
+    def draw_overlay(self, surface: pygame.Surface) -> pygame.Rect:
+        """Draw the frame graph and p50/p99 table in the top-right corner; returns the area covered."""
+        if self._font is None:
+            self._font = pygame.font.Font(None, 18)
+            self._graph = pygame.Surface((GRAPH_W, GRAPH_H)).convert()
+            self._graph.fill((16, 16, 22))
+        self._frames_since_text += 1
+        if self._panel is None or self._frames_since_text >= TEXT_REFRESH_FRAMES:
+            self._panel = self._render_table()
+            self._frames_since_text = 0
+        panel = self._panel
+        width = GRAPH_W + 2 * PANEL_PAD
+        height = GRAPH_H + panel.get_height() + 3 * PANEL_PAD
+        area = pygame.Rect(surface.get_width() - width - 10, 40, width, height)
+        surface.fill((8, 8, 12), area)
+        surface.blit(self._graph, (area.x + PANEL_PAD, area.y + PANEL_PAD))
+        surface.blit(panel, (area.x + PANEL_PAD, area.y + GRAPH_H + 2 * PANEL_PAD))
+        return area
+
+    def _render_table(self) -> pygame.Surface:
+        font = self._font
+        rows = [("frame", (255, 255, 255))]
+        rows += [(phase, PHASE_COLORS[i % len(PHASE_COLORS)]) for i, phase in enumerate(self.phase_ms)]
+        stats = self.stats()
+        line_h = font.get_linesize()
+        table = pygame.Surface((GRAPH_W, line_h * len(rows))).convert()
+        table.fill((8, 8, 12))
+        for i, (name, color) in enumerate(rows):
+            p50, p99 = stats.get(name, (0.0, 0.0))
+            table.blit(font.render(f"{name:<8} p50 {p50:5.2f}  p99 {p99:5.2f} ms", True, color), (0, i * line_h))
+        return table
+
+
+def _percentiles(samples: Deque[float]) -> Tuple[float, float]:
+    if not samples:
+        return 0.0, 0.0
+    ordered = sorted(samples)
+    last = len(ordered) - 1
+    return ordered[last // 2], ordered[min(last, round(last * 0.99))]
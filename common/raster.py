@@ -0,0 +1,306 @@
+"""
+Low-resolution observations for agents and tests: game state rasterized straight into a NumPy uint8 array.
+
+`ObservationRasterizer` skips pygame entirely. Each entity is an axis-aligned box in world pixels,
+mapped onto a small grid (84x84 by default) and painted as a 255-valued mask into its layer's
+channel, with no rounded corners, sprites, shadows or HUD text. A box always covers at least one
+cell, so bullets stay visible at any resolution. Painting is vectorized over every box of every
+game in the batch: boxes are expanded into the cells they cover and written with one fancy-indexed
+store.
+
+The output is one preallocated array of shape (batch, stack, channels, height, width). With
+`stack > 1` the previous frames shift down the stack axis on each render, and `reset(i)` clears
+game i's history after an episode ends. `frames.reshape(batch, stack * channels, height, width)` is
+a free view in the layout most convolutional policies expect.
+
+Layers per game (see LAYERS): invaders draws the ship, invaders, player bullets and enemy bullets;
+brawler and horde draw Rumi, demons, Rumi's hitboxes and the demons' hitboxes. For invaders,
+`render()` also accepts a `vector.BatchedInvaders`, whose whole batch is rasterized without a
+Python loop per game.
+
+    python -m common.raster invaders --batch 256 --size 84x84 --stack 4 --compare
+"""
+
+import argparse
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from common.games import load_module, new_simulation
+
+LAYERS: Dict[str, Tuple[str, ...]] = {
+    "invaders": ("player", "invaders", "player_bullets", "enemy_bullets"),
+    "brawler": ("player", "demons", "player_hitboxes", "demon_hitboxes"),
+    "horde": ("player", "demons", "player_hitboxes", "demon_hitboxes"),
+}
+
+# game -> module defining its world WIDTH and HEIGHT.
+WORLD_MODULES = {"invaders": "invaders", "brawler": "brawler", "horde": "brawler"}
+
+# (game index, channel, x, y, width, height), one array each, in world pixels.
+Boxes = Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+
+
+class BoxList:
+    """Accumulates boxes one at a time or as arrays, then hands them over as `Boxes`."""
+
+    def __init__(self) -> None:
+        self._single: List[Tuple[int, int, int, int, int, int]] = []
+        self._arrays: List[Boxes] = []
+
+    def add(self, index: int, channel: int, x: int, y: int, width: int, height: int) -> None:
+        self._single.append((index, channel, x, y, width, height))
+
+    def add_rect(self, index: int, channel: int, rect) -> None:
+        self._single.append((index, channel, rect[0], rect[1], rect[2], rect[3]))
+
+    def extend(self, index, channel, x, y, width, height) -> None:
+        """Add many boxes; scalars are broadcast against the array arguments."""
+        columns = np.broadcast_arrays(index, channel, x, y, width, height)
+        self._arrays.append(tuple(np.asarray(c, np.int64).ravel() for c in columns))
+
+    def arrays(self) -> Boxes:
+        parts = list(self._arrays)
+        if self._single:
+            parts.append(tuple(np.array(self._single, np.int64).T))
+        if not parts:
+            return tuple(np.zeros(0, np.int64) for _ in range(6))
+        return tuple(np.concatenate(column) for column in zip(*parts))
+
+
+def paint_boxes(out: np.ndarray, boxes: Boxes, scale_x: float, scale_y: float, value: int = 255) -> None:
+    """Set every cell of `out` (games, channels, height, width; C-contiguous) that a box overlaps to `value`."""
+    if not out.flags.c_contiguous:
+        raise ValueError("paint_boxes needs a C-contiguous array")
+    index, channel, x, y, width, height = boxes
+    if not len(index):
+        return
+    rows, cols = out.shape[-2:]
+    x0 = np.floor(x * scale_x).astype(np.int64)
+    y0 = np.floor(y * scale_y).astype(np.int64)
+    x1 = np.maximum(np.ceil((x + width) * scale_x).astype(np.int64), x0 + 1)
+    y1 = np.maximum(np.ceil((y + height) * scale_y).astype(np.int64), y0 + 1)
+    np.clip(x0, 0, cols, out=x0)
+    np.clip(x1, 0, cols, out=x1)
+    np.clip(y0, 0, rows, out=y0)
+    np.clip(y1, 0, rows, out=y1)
+    span_x = x1 - x0
+    span_y = np.where(span_x > 0, y1 - y0, 0)
+    if int((span_x * span_y).sum()) > out.size // 2:
+        _paint_summed(out, index, channel, x0, y0, x1, y1, value)
+        return
+
+    # Expanded in two passes without any division: one entry per (box, covered row) holding the flat
+    # index of the row's first cell, then one entry per covered cell.
+    row_box = np.repeat(np.arange(len(span_y)), span_y)
+    start = ((index * out.shape[1] + channel) * rows + y0) * cols + x0
+    row_start = start[row_box] + (np.arange(len(row_box)) - np.repeat(np.cumsum(span_y) - span_y, span_y)) * cols
+    row_span = span_x[row_box]
+    cells = np.repeat(row_start - (np.cumsum(row_span) - row_span), row_span) + np.arange(int(row_span.sum()))
+    out.reshape(-1)[cells] = value
+
+
+def _paint_summed(out: np.ndarray, index, channel, x0, y0, x1, y1, value: int) -> None:
+    """Cover boxes with a 2D difference array and two prefix sums: cost follows the grid, not the box area."""
+    games, channels, rows, cols = out.shape
+    stride = cols + 1
+    plane = (index * channels + channel) * (rows + 1)
+    corners = np.concatenate([(plane + y0) * stride + x0, (plane + y0) * stride + x1, (plane + y1) * stride + x0, (plane + y1) * stride + x1])
+    n = len(x0)
+    weights = np.repeat(np.array([1.0, -1.0, -1.0, 1.0]), n)
+    counts = np.bincount(corners, weights, games * channels * (rows + 1) * stride).astype(np.int32)
+    counts = counts.reshape(games * channels, rows + 1, stride)
+    np.cumsum(counts, axis=2, out=counts)
+    np.cumsum(counts, axis=1, out=counts)
+    out[counts[:, :rows, :cols].reshape(out.shape) > 0] = value
+
+
+def invaders_boxes(games, module) -> Boxes:
+    """Boxes for a sequence of `invaders.Game`s or one `vector.BatchedInvaders`."""
+    m = module
+    if hasattr(games, "num_games"):
+        return _batched_invaders_boxes(games, m)
+    # Per-game values are gathered into lists and turned into boxes for the whole batch at once.
+    player_x: List[int] = []
+    origin_x: List[int] = []
+    origin_y: List[int] = []
+    alive = bytearray()
+    bullets: List[Tuple[np.ndarray, np.ndarray, np.ndarray]] = []
+    for game in games:
+        player_x.append(game.player.rect.x)
+        swarm = game.swarm
+        origin_x.append(swarm.origin_x)
+        origin_y.append(swarm.origin_y)
+        alive += bytes(enemy.alive for enemy in swarm.enemies)
+        bullets.append(game.bullets.live())
+    n = len(player_x)
+    rows, cols = games[0].rows, games[0].cols
+    boxes = BoxList()
+    boxes.extend(np.arange(n), 0, player_x, m.PLAYER_Y, m.PLAYER_W, m.PLAYER_H)
+    g, row, col = np.nonzero(np.frombuffer(bytes(alive), np.uint8).reshape(n, rows, cols))
+    ox, oy = np.array(origin_x)[g], np.array(origin_y)[g]
+    boxes.extend(g, 1, ox + col * m.FORMATION_GAP_X, oy + row * m.FORMATION_GAP_Y, m.ENEMY_W, m.ENEMY_H)
+    g = np.repeat(np.arange(n), [len(x) for x, _, _ in bullets])
+    if len(g):
+        x, y, from_player = (np.concatenate(column) for column in zip(*bullets))
+        boxes.extend(g, np.where(from_player, 2, 3), x, y, m.BULLET_W, m.BULLET_H)
+    return boxes.arrays()
+
+
+def _batched_invaders_boxes(batch, m) -> Boxes:
+    boxes = BoxList()
+    n = batch.num_games
+    games = np.arange(n)
+    boxes.extend(games, 0, batch.player_x, m.PLAYER_Y, m.PLAYER_W, m.PLAYER_H)
+    origin_x, origin_y = batch.enemy_origin()
+    g, row, col = np.nonzero(batch.alive)
+    boxes.extend(g, 1, origin_x[g] + col * m.FORMATION_GAP_X, origin_y[g] + row * m.FORMATION_GAP_Y, m.ENEMY_W, m.ENEMY_H)
+    g, slot = np.nonzero(batch.pb_active)
+    boxes.extend(g, 2, batch.pb_x[g, slot], batch.pb_y[g, slot], m.BULLET_W, m.BULLET_H)
+    g, slot = np.nonzero(batch.eb_active)
+    boxes.extend(g, 3, batch.eb_x[g, slot], batch.eb_y[g, slot], m.BULLET_W, m.BULLET_H)
+    return boxes.arrays()
+
+
+def brawler_boxes(sessions, module) -> Boxes:
+    boxes = BoxList()
+    for i, session in enumerate(sessions):
+        boxes.add_rect(i, 0, session.player.rect)
+        for demon in session.demons:
+            boxes.add_rect(i, 1, demon.rect)
+        for hitbox in session.hitboxes.player.values():
+            boxes.add_rect(i, 2, hitbox.rect)
+        for hitbox in session.hitboxes.enemy.values():
+            boxes.add_rect(i, 3, hitbox.rect)
+    return boxes.arrays()
+
+
+def horde_boxes(sessions, module) -> Boxes:
+    m = module
+    boxes = BoxList()
+    for i, session in enumerate(sessions):
+        boxes.add_rect(i, 0, session.player.rect)
+        horde = session.horde
+        boxes.extend(i, 1, horde.view("x").astype(np.int64), horde.view("y").astype(np.int64), m.DEMON_W, m.DEMON_H)
+        for hitbox in session.hitboxes:
+            boxes.add_rect(i, 2, hitbox.rect)
+        attacking = horde.view("attack_timer") > 0
+        boxes.extend(i, 3, horde.view("attack_x")[attacking], horde.view("attack_y")[attacking], m.ATTACK_REACH, m.ATTACK_H)
+    return boxes.arrays()
+
+
+EXTRACTORS: Dict[str, Callable[[object, object], Boxes]] = {
+    "invaders": invaders_boxes,
+    "brawler": brawler_boxes,
+    "horde": horde_boxes,
+}
+
+
+class ObservationRasterizer:
+    """Rasterizes `batch` games of `game` into `frames`, a (batch, stack, channels, height, width) uint8 array."""
+
+    def __init__(self, game: str, width: int = 84, height: int = 84, batch: int = 1, stack: int = 1) -> None:
+        if game not in LAYERS:
+            raise ValueError(f"no observation layers for {game!r}; expected one of {sorted(LAYERS)}")
+        self.game = game
+        self.layers = LAYERS[game]
+        self.module = load_module(game)
+        world = load_module(WORLD_MODULES[game])
+        self.scale_x = width / world.WIDTH
+        self.scale_y = height / world.HEIGHT
+        self.frames = np.zeros((batch, stack, len(self.layers), height, width), np.uint8)
+        self._scratch = np.zeros((batch, len(self.layers), height, width), np.uint8) if stack > 1 else None
+        self._extract = EXTRACTORS[game]
+
+    def reset(self, index: Optional[int] = None) -> None:
+        """Clear the stacked history of game `index`, or of every game."""
+        if index is None:
+            self.frames.fill(0)
+        else:
+            self.frames[index] = 0
+
+    def render(self, games) -> np.ndarray:
+        """Rasterize the current state of each game (a sequence of simulations, or a BatchedInvaders)."""
+        frames = self.frames
+        count = games.num_games if hasattr(games, "num_games") else len(games)
+        if count != len(frames):
+            raise ValueError(f"rasterizer holds {len(frames)} games, got {count}")
+        boxes = self._extract(games, self.module)
+        if frames.shape[1] == 1:
+            latest = frames[:, 0]
+            latest.fill(0)
+            paint_boxes(latest, boxes, self.scale_x, self.scale_y)
+            return frames
+        # The newest frame of a stack is strided across games, so it is painted contiguously and copied in.
+        frames[:, :-1] = frames[:, 1:]
+        self._scratch.fill(0)
+        paint_boxes(self._scratch, boxes, self.scale_x, self.scale_y)
+        frames[:, -1] = self._scratch
+        return frames
+
+
+def _parse_size(text: str) -> Tuple[int, int]:
+    width, _, height = text.partition("x")
+    return int(width), int(height or width)
+
+
+def _screen_seconds(game: str, sims: Sequence, repeats: int) -> float:
+    """Seconds per game to draw the real frame and read it back with `surfarray`, for comparison."""
+    import os
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+
+    pygame.display.init()
+    pygame.font.init()
+    world = load_module(WORLD_MODULES[game])
+    screen = pygame.display.set_mode((world.WIDTH, world.HEIGHT))
+    if game == "invaders":
+        renderer = load_module(game, "render").LegacyRenderer(screen, pygame.font.Font(None, 20))
+    else:
+        renderer = load_module(game, "stage").StageRenderer(screen)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for sim in sims:
+            renderer.draw(sim)
+            pygame.surfarray.array3d(screen)
+    elapsed = time.perf_counter() - start
+    pygame.quit()
+    return elapsed / (repeats * len(sims))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Time the observation rasterizer on a batch of running games.")
+    parser.add_argument("game", choices=sorted(LAYERS))
+    parser.add_argument("--batch", type=int, default=64, help="games rasterized per call")
+    parser.add_argument("--size", type=_parse_size, default=(84, 84), help="WIDTHxHEIGHT of each observation")
+    parser.add_argument("--stack", type=int, default=4, help="frames kept per game")
+    parser.add_argument("--ticks", type=int, default=300, help="random-input ticks to play before timing")
+    parser.add_argument("--repeats", type=int, default=50, help="timed renders")
+    parser.add_argument("--compare", action="store_true", help="also time the real renderer plus a surfarray readback")
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    sims = [new_simulation(args.game, seed) for seed in range(args.batch)]
+    for _ in range(args.ticks):
+        for sim in sims:
+            sim.step(int(rng.integers(0, 32)))
+    width, height = args.size
+    raster = ObservationRasterizer(args.game, width, height, args.batch, args.stack)
+    raster.render(sims)
+    start = time.perf_counter()
+    for _ in range(args.repeats):
+        raster.render(sims)
+    per_game = (time.perf_counter() - start) / (args.repeats * args.batch)
+    coverage = raster.frames[:, -1].reshape(args.batch, len(raster.layers), -1).mean(axis=(0, 2)) / 255
+    print(f"{args.game} {width}x{height} stack {args.stack}: {per_game * 1e6:8.1f} us per game")
+    print("  layer coverage  " + "  ".join(f"{name} {share:.1%}" for name, share in zip(raster.layers, coverage)))
+    if args.compare:
+        screen = _screen_seconds(args.game, sims[: min(len(sims), 16)], max(args.repeats // 10, 3))
+        print(f"  full render + surfarray readback: {screen * 1e6:8.1f} us per game ({screen / per_game:.0f}x slower)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
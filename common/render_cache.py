@@ -0,0 +1,78 @@
+"""
+Bounded LRU cache for transient render resources: filled overlays, shadow ellipses and rendered text.
+Cached surfaces are shared between callers, so treat them as read-only.
+"""
+
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional, Tuple
+
+import pygame
+
+
+Color = Tuple[int, ...]
+
+
+class RenderCache:
+    def __init__(self, max_entries: int = 256) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, pygame.Surface]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, build: Callable[[], pygame.Surface]) -> pygame.Surface:
+        surface = self._entries.get(key)
+        if surface is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = build()
+        self._entries[key] = surface
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return surface
+
+    def fill(self, size: Tuple[int, int], color: Color, alpha: Optional[int] = None) -> pygame.Surface:
+        """A solid surface; RGBA colors get per-pixel alpha, `alpha` sets surface-wide alpha."""
+
+        def build() -> pygame.Surface:
+            surface = pygame.Surface(size, pygame.SRCALPHA) if len(color) == 4 else pygame.Surface(size)
+            surface.fill(color)
+            if alpha is not None:
+                surface.set_alpha(alpha)
+            return surface
+
+        return self.get(("fill", size, color, alpha), build)
+
+    def ellipse(self, size: Tuple[int, int], color: Color) -> pygame.Surface:
+        def build() -> pygame.Surface:
+            surface = pygame.Surface(size, pygame.SRCALPHA)
+            pygame.draw.ellipse(surface, color, surface.get_rect())
+            return surface
+
+        return self.get(("ellipse", size, color), build)
+
+    def text(self, font: pygame.font.Font, text: str, color: Color, antialias: bool = True) -> pygame.Surface:
+        return self.get(("text", font, text, color, antialias), lambda: font.render(text, antialias, color))
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+shared_cache = RenderCache()
@@ -0,0 +1,261 @@
+"""
+Compact binary replays for both games.
+
+A replay is the per-tick input bitmask (one byte per tick, zlib-compressed) plus periodic state
+keyframes with a seek index, so playback can run headless at full speed or jump to any tick by
+restoring the nearest keyframe and re-simulating only the ticks after it.
+
+Layout (little-endian):
+    header   magic, version, game name, seed, keyframe interval, tick count, keyframe count, final digest
+    index    keyframe count x (tick, offset, length) into the keyframe section
+    inputs   u32 length + zlib(input bytes)
+    keyframes  zlib(pickle(state)) blobs
+"""
+
+import argparse
+import hashlib
+import io
+import pickle
+import struct
+import sys
+import time
+import zlib
+from pathlib import Path
+from typing import List, Optional, Protocol, Tuple
+
+from common.games import new_simulation
+
+MAGIC = b"PGRP"
+# Bumped whenever a simulation's rules or snapshot layout change, so older recordings are refused
+# rather than replayed into a different run.
+VERSION = 5
+DEFAULT_KEYFRAME_INTERVAL = 1800
+
+_HEADER = struct.Struct("<4sH16sqIII8s")
+# The header stores the seed as a signed 64-bit integer.
+SEED_MIN, SEED_MAX = -(2**63), 2**63 - 1
+_INDEX_ENTRY = struct.Struct("<III")
+_LENGTH = struct.Struct("<I")
+
+
+class Simulation(Protocol):
+    game_over: bool
+
+    def step(self, buttons: int) -> object: ...
+
+    def snapshot(self) -> tuple: ...
+
+    def restore(self, state: tuple) -> None: ...
+
+
+class ReplayError(ValueError):
+    pass
+
+
+class _PlainUnpickler(pickle.Unpickler):
+    """Keyframes hold only tuples, numbers, bytes and None; refuse anything that needs a class lookup."""
+
+    def find_class(self, module: str, name: str):
+        raise ReplayError(f"replay keyframe references {module}.{name}")
+
+
+def parse_seed(text: str) -> int:
+    """argparse type for seeds that a replay can record."""
+    try:
+        seed = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected an integer seed but got {text!r}") from None
+    if not SEED_MIN <= seed <= SEED_MAX:
+        raise argparse.ArgumentTypeError(f"seed must be between {SEED_MIN} and {SEED_MAX}")
+    return seed
+
+
+def encode_state(state: tuple) -> bytes:
+    return zlib.compress(pickle.dumps(state, protocol=4))
+
+
+def decode_state(blob: bytes) -> tuple:
+    return _PlainUnpickler(io.BytesIO(zlib.decompress(blob))).load()
+
+
+def state_digest(state: tuple) -> bytes:
+    return hashlib.blake2b(pickle.dumps(state, protocol=4), digest_size=8).digest()
+
+
+class ReplayRecorder:
+    """Collects inputs from a running simulation; call `record(buttons)` after each `sim.step(buttons)`."""
+
+    def __init__(
+        self,
+        game: str,
+        seed: int,
+        sim: Simulation,
+        keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL,
+    ) -> None:
+        if not SEED_MIN <= seed <= SEED_MAX:
+            raise ValueError(f"replay seed {seed} does not fit in a signed 64-bit integer")
+        self.game = game
+        self.seed = seed
+        self.sim = sim
+        self.keyframe_interval = keyframe_interval
+        self.inputs = bytearray()
+        self.keyframes: List[Tuple[int, bytes]] = [(0, encode_state(sim.snapshot()))]
+
+    @property
+    def ticks(self) -> int:
+        return len(self.inputs)
+
+    def record(self, buttons: int) -> None:
+        self.inputs.append(buttons)
+        if self.ticks % self.keyframe_interval == 0:
+            self.keyframes.append((self.ticks, encode_state(self.sim.snapshot())))
+
+    def save(self, path: Path) -> None:
+        offsets = []
+        offset = 0
+        for tick, blob in self.keyframes:
+            offsets.append((tick, offset, len(blob)))
+            offset += len(blob)
+        inputs = zlib.compress(bytes(self.inputs), 9)
+        with open(path, "wb") as fh:
+            fh.write(
+                _HEADER.pack(
+                    MAGIC,
+                    VERSION,
+                    self.game.encode("ascii"),
+                    self.seed,
+                    self.keyframe_interval,
+                    self.ticks,
+                    len(self.keyframes),
+                    state_digest(self.sim.snapshot()),
+                )
+            )
+            for entry in offsets:
+                fh.write(_INDEX_ENTRY.pack(*entry))
+            fh.write(_LENGTH.pack(len(inputs)))
+            fh.write(inputs)
+            for _, blob in self.keyframes:
+                fh.write(blob)
+
+
+class Replay:
+    def __init__(
+        self,
+        game: str,
+        seed: int,
+        keyframe_interval: int,
+        inputs: bytes,
+        index: List[Tuple[int, int, int]],
+        keyframe_data: bytes,
+        final_digest: bytes,
+    ) -> None:
+        self.game = game
+        self.seed = seed
+        self.keyframe_interval = keyframe_interval
+        self.inputs = inputs
+        self.index = index
+        self.keyframe_data = keyframe_data
+        self.final_digest = final_digest
+
+    @property
+    def ticks(self) -> int:
+        return len(self.inputs)
+
+    @classmethod
+    def load(cls, path: Path) -> "Replay":
+        data = Path(path).read_bytes()
+        if len(data) < _HEADER.size:
+            raise ReplayError(f"{path} is too short to be a replay")
+        magic, version, game, seed, interval, ticks, count, digest = _HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ReplayError(f"{path} is not a version {VERSION} replay")
+        pos = _HEADER.size
+        index = [_INDEX_ENTRY.unpack_from(data, pos + i * _INDEX_ENTRY.size) for i in range(count)]
+        pos += count * _INDEX_ENTRY.size
+        (input_len,) = _LENGTH.unpack_from(data, pos)
+        pos += _LENGTH.size
+        inputs = zlib.decompress(data[pos : pos + input_len])
+        pos += input_len
+        if len(inputs) != ticks:
+            raise ReplayError(f"{path} has {len(inputs)} inputs, header says {ticks}")
+        return cls(game.rstrip(b"\0").decode("ascii"), seed, interval, inputs, index, data[pos:], digest)
+
+    def keyframe_before(self, tick: int) -> Tuple[int, tuple]:
+        """The latest keyframe at or before `tick`, as (keyframe tick, state)."""
+        best = self.index[0]
+        for entry in self.index:
+            if entry[0] > tick:
+                break
+            best = entry
+        kf_tick, offset, length = best
+        return kf_tick, decode_state(self.keyframe_data[offset : offset + length])
+
+
+class ReplayPlayer:
+    """Drives a simulation from a replay: `seek` to any tick, `advance` one tick, or `run` to the end."""
+
+    def __init__(self, replay: Replay, sim: Simulation) -> None:
+        self.replay = replay
+        self.sim = sim
+        self.tick = 0
+        self.seek(0)
+
+    @property
+    def finished(self) -> bool:
+        return self.tick >= self.replay.ticks
+
+    def seek(self, tick: int) -> None:
+        tick = max(0, min(tick, self.replay.ticks))
+        kf_tick, state = self.replay.keyframe_before(tick)
+        self.sim.restore(state)
+        self.tick = kf_tick
+        self.run(until=tick)
+
+    def advance(self) -> Optional[int]:
+        """Step one recorded tick; returns its input, or None once the replay is exhausted."""
+        if self.finished:
+            return None
+        buttons = self.replay.inputs[self.tick]
+        self.sim.step(buttons)
+        self.tick += 1
+        return buttons
+
+    def run(self, until: Optional[int] = None) -> None:
+        end = self.replay.ticks if until is None else min(until, self.replay.ticks)
+        step, inputs = self.sim.step, self.replay.inputs
+        for tick in range(self.tick, end):
+            step(inputs[tick])
+        self.tick = max(self.tick, end)
+
+    def verify(self) -> bool:
+        """Replay to the end and check the final state matches the one recorded."""
+        self.run()
+        return state_digest(self.sim.snapshot()) == self.replay.final_digest
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Play back replays headless and check them against their recorded result.")
+    parser.add_argument("replays", nargs="+", type=Path)
+    parser.add_argument("--seek", type=int, help="jump to this tick and print its state digest instead of verifying")
+    args = parser.parse_args(argv)
+
+    failures = 0
+    for path in args.replays:
+        replay = Replay.load(path)
+        player = ReplayPlayer(replay, new_simulation(replay.game, replay.seed))
+        start = time.perf_counter()
+        if args.seek is not None:
+            player.seek(args.seek)
+            elapsed = time.perf_counter() - start
+            print(f"{path}: tick {player.tick}/{replay.ticks} digest {state_digest(player.sim.snapshot()).hex()} ({elapsed * 1000:.1f} ms)")
+            continue
+        ok = player.verify()
+        elapsed = time.perf_counter() - start
+        rate = replay.ticks / elapsed if elapsed else float("inf")
+        print(f"{path}: {replay.game} {replay.ticks} ticks {'OK' if ok else 'MISMATCH'} ({rate:,.0f} ticks/s)")
+        failures += not ok
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,287 @@
+"""
+GGPO-style rollback for two-player games over UDP.
+
+Each peer simulates every tick immediately, using its own input and a prediction of the remote one
+(the last input it received). When the real remote input for an already simulated tick arrives and
+differs from the prediction, the peer restores the state saved before that tick and re-simulates up
+to the present with the corrected inputs. Inputs are resent until acknowledged, so lost packets only
+delay confirmation. Peers exchange state digests for confirmed ticks to catch desyncs.
+
+`LossyLink` is a non-blocking UDP endpoint with an optional latency/jitter/loss shim on outgoing
+packets, so two local processes on loopback behave like a bad internet link.
+"""
+
+import heapq
+import random
+import socket
+import struct
+import time
+from typing import Dict, List, Optional, Protocol, Tuple
+
+from common.replay import state_digest
+
+MAGIC = b"RB"
+# magic, sender tick, ack, frame advantage, checksum tick, checksum, first input tick, input count
+_PACKET = struct.Struct("<2sIihi8siB")
+MAX_INPUTS_PER_PACKET = 255
+CHECKSUM_INTERVAL = 60
+
+
+class TwoPlayerSimulation(Protocol):
+    game_over: bool
+
+    def step(self, buttons: Tuple[int, int]) -> object: ...
+
+    def snapshot(self) -> tuple: ...
+
+    def restore(self, state: tuple) -> None: ...
+
+
+def parse_address(text: str) -> Tuple[str, int]:
+    host, _, port = text.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+
+class LossyLink:
+    """Non-blocking UDP socket to one peer; outgoing packets can be delayed, jittered and dropped."""
+
+    def __init__(
+        self,
+        local: Tuple[str, int],
+        peer: Tuple[str, int],
+        delay_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        loss: float = 0.0,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.peer = peer
+        self.delay_ms = delay_ms
+        self.jitter_ms = jitter_ms
+        self.loss = loss
+        self.rng = random.Random(seed)
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(local)
+        self.sock.setblocking(False)
+        self._outgoing: List[Tuple[float, int, bytes]] = []
+        self._sequence = 0
+        self.sent = 0
+        self.dropped = 0
+        self.received = 0
+
+    def send(self, data: bytes) -> None:
+        if self.loss and self.rng.random() < self.loss:
+            self.dropped += 1
+            return
+        delay = self.delay_ms + (self.rng.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0)
+        if delay <= 0:
+            self._transmit(data)
+            return
+        self._sequence += 1
+        heapq.heappush(self._outgoing, (time.perf_counter() + delay / 1000, self._sequence, data))
+
+    def poll(self) -> List[bytes]:
+        """Release delayed packets that are due and return every datagram waiting from the peer."""
+        now = time.perf_counter()
+        while self._outgoing and self._outgoing[0][0] <= now:
+            self._transmit(heapq.heappop(self._outgoing)[2])
+        packets = []
+        while True:
+            try:
+                data, _ = self.sock.recvfrom(2048)
+            except (BlockingIOError, ConnectionResetError, ConnectionRefusedError):
+                break
+            packets.append(data)
+        self.received += len(packets)
+        return packets
+
+    def _transmit(self, data: bytes) -> None:
+        try:
+            self.sock.sendto(data, self.peer)
+            self.sent += 1
+        except OSError:
+            # The peer is not listening yet; the inputs go out again with the next packet.
+            pass
+
+    def close(self) -> None:
+        self.sock.close()
+
+
+class RollbackSession:
+    """Drives a TwoPlayerSimulation in sync with a remote peer; call `advance(buttons)` once per frame."""
+
+    def __init__(
+        self,
+        sim: TwoPlayerSimulation,
+        local_player: int,
+        link: LossyLink,
+        input_delay: int = 1,
+        max_prediction: int = 10,
+    ) -> None:
+        self.sim = sim
+        self.local_player = local_player
+        self.link = link
+        self.input_delay = input_delay
+        self.max_prediction = max_prediction
+        self.tick = 0
+        self.local_inputs: Dict[int, int] = {t: 0 for t in range(input_delay)}
+        self.remote_inputs: Dict[int, int] = {}
+        self.predicted: Dict[int, int] = {}
+        self.states: Dict[int, tuple] = {}
+        self.remote_tick = -1
+        self.remote_ack = -1
+        self.remote_sender_tick = -1
+        self.remote_advantage = 0
+        self.last_heard = 0.0
+        self._first_wrong: Optional[int] = None
+        self._checksums: Dict[int, bytes] = {}
+        self._next_checksum = CHECKSUM_INTERVAL
+        self._remote_checksum: Tuple[int, bytes] = (-1, bytes(8))
+        self._stalled_last_frame = False
+        self.desync_tick: Optional[int] = None
+        self.rollbacks = 0
+        self.resimulated = 0
+        self.stalls = 0
+
+    @property
+    def connected(self) -> bool:
+        return self.remote_sender_tick >= 0
+
+    @property
+    def local_advantage(self) -> int:
+        return self.tick - self.remote_sender_tick
+
+    def advance(self, buttons: int) -> bool:
+        """Simulate one tick with this frame's local input; returns False if the frame stalled."""
+        self._receive()
+        if self._first_wrong is not None:
+            self._rollback(self._first_wrong)
+            self._first_wrong = None
+
+        if self._should_stall():
+            self.stalls += 1
+            self._stalled_last_frame = True
+            self._send()
+            return False
+        self._stalled_last_frame = False
+
+        self.local_inputs[self.tick + self.input_delay] = buttons
+        self._simulate(self.tick)
+        self.tick += 1
+        self._record_checksums()
+        self._send()
+        self._trim()
+        return True
+
+    def _should_stall(self) -> bool:
+        # Never run further ahead of the last confirmed remote input than a rollback can repair.
+        if self.tick - self.remote_tick > self.max_prediction:
+            return True
+        # Time sync: if this peer runs ahead of the other, wait a frame so the two meet in the middle.
+        gap = self.local_advantage - self.remote_advantage
+        return self.connected and gap >= 3 and not self._stalled_last_frame
+
+    def _remote_input(self, tick: int) -> int:
+        buttons = self.remote_inputs.get(tick)
+        if buttons is None:
+            buttons = self.remote_inputs.get(self.remote_tick, 0)
+            self.predicted[tick] = buttons
+        else:
+            self.predicted.pop(tick, None)
+        return buttons
+
+    def _simulate(self, tick: int) -> None:
+        self.states[tick] = self.sim.snapshot()
+        local = self.local_inputs[tick]
+        remote = self._remote_input(tick)
+        self.sim.step((local, remote) if self.local_player == 0 else (remote, local))
+
+    def _rollback(self, tick: int) -> None:
+        self.sim.restore(self.states[tick])
+        for t in range(tick, self.tick):
+            self._simulate(t)
+        self.rollbacks += 1
+        self.resimulated += self.tick - tick
+
+    def _receive(self) -> None:
+        for packet in self.link.poll():
+            if len(packet) < _PACKET.size or packet[:2] != MAGIC:
+                continue
+            _, sender_tick, ack, advantage, checksum_tick, checksum, start, count = _PACKET.unpack_from(packet)
+            self.last_heard = time.perf_counter()
+            if sender_tick >= self.remote_sender_tick:
+                self.remote_sender_tick = sender_tick
+                self.remote_advantage = advantage
+            self.remote_ack = max(self.remote_ack, ack)
+            if checksum_tick > self._remote_checksum[0]:
+                self._remote_checksum = (checksum_tick, checksum)
+            inputs = packet[_PACKET.size:_PACKET.size + count]
+            for offset, buttons in enumerate(inputs):
+                tick = start + offset
+                if tick != self.remote_tick + 1:
+                    continue
+                self.remote_inputs[tick] = buttons
+                self.remote_tick = tick
+                guess = self.predicted.get(tick)
+                if guess is not None and guess != buttons and tick < self.tick:
+                    if self._first_wrong is None or tick < self._first_wrong:
+                        self._first_wrong = tick
+        self._check_remote_checksum()
+
+    def _record_checksums(self) -> None:
+        # The state before tick c depends only on inputs < c, so it is final once those are confirmed.
+        while self._next_checksum <= min(self.remote_tick + 1, self.tick - 1):
+            state = self.states.get(self._next_checksum)
+            if state is not None:
+                self._checksums[self._next_checksum] = state_digest(state)
+            self._next_checksum += CHECKSUM_INTERVAL
+        self._check_remote_checksum()
+
+    def _check_remote_checksum(self) -> None:
+        tick, digest = self._remote_checksum
+        ours = self._checksums.get(tick)
+        if ours is not None and ours != digest and self.desync_tick is None:
+            self.desync_tick = tick
+
+    def _send(self) -> None:
+        first = self.remote_ack + 1
+        last = self.tick + self.input_delay - 1
+        inputs = bytes(self.local_inputs[t] for t in range(first, min(last, first + MAX_INPUTS_PER_PACKET - 1) + 1))
+        checksum_tick = max(self._checksums, default=-1)
+        header = _PACKET.pack(
+            MAGIC,
+            self.tick,
+            self.remote_tick,
+            max(-32768, min(32767, self.local_advantage if self.connected else 0)),
+            checksum_tick,
+            self._checksums.get(checksum_tick, bytes(8)),
+            first,
+            len(inputs),
+        )
+        self.link.send(header + inputs)
+
+    def _trim(self) -> None:
+        # Nothing at or before the last confirmed remote tick can be rolled back to again.
+        oldest_needed = self.remote_tick + 1
+        for table in (self.states, self.predicted):
+            for tick in [t for t in table if t < oldest_needed]:
+                del table[tick]
+        for tick in [t for t in self.remote_inputs if t < self.remote_tick]:
+            del self.remote_inputs[tick]
+        keep_local = min(self.remote_ack, self.remote_tick) + 1
+        for tick in [t for t in self.local_inputs if t < keep_local]:
+            del self.local_inputs[tick]
+        for tick in [t for t in self._checksums if t < self._remote_checksum[0] - CHECKSUM_INTERVAL]:
+            del self._checksums[tick]
+
+    def stats(self) -> dict:
+        return {
+            "tick": self.tick,
+            "confirmed": self.remote_tick,
+            "rollbacks": self.rollbacks,
+            "resimulated": self.resimulated,
+            "stalls": self.stalls,
+            "sent": self.link.sent,
+            "dropped": self.link.dropped,
+            "received": self.link.received,
+            "desync_tick": self.desync_tick,
+        }
@@ -0,0 +1,159 @@
+"""
+Cold-start helpers for both games: targeted pygame init, a disk cache of resolved system font paths and
+a startup-time report (imports, init, asset loading, first frame).
+
+Each game's `main.py` imports this module before pygame, so the reported import time covers pygame and
+the game modules. `python -m common.startup` cold-starts the games in fresh processes and checks the
+median timings against optional budgets:
+
+    python -m common.startup invaders brawler --runs 5 --budget imports=300 --budget total=500
+"""
+
+import argparse
+import importlib
+import json
+import os
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+_IMPORTED_AT = time.perf_counter()
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+FONT_CACHE = Path(os.environ.get("GAMES_FONT_CACHE", REPO_ROOT / ".font_cache.json"))
+PHASES = ("imports", "init", "load", "first frame")
+
+
+class StartupTimer:
+    """Time between successive `mark(phase)` calls, starting when this module was imported."""
+
+    def __init__(self, start: float = _IMPORTED_AT) -> None:
+        self.start = start
+        self.phases: Dict[str, float] = {}
+        self._last = start
+
+    def mark(self, phase: str) -> None:
+        now = time.perf_counter()
+        self.phases[phase] = self.phases.get(phase, 0.0) + (now - self._last) * 1000
+        self._last = now
+
+    @property
+    def total_ms(self) -> float:
+        return (self._last - self.start) * 1000
+
+    def report(self) -> str:
+        parts = [f"{phase} {ms:.1f} ms" for phase, ms in self.phases.items()]
+        return "startup: " + " | ".join(parts + [f"total {self.total_ms:.1f} ms"])
+
+
+startup = StartupTimer()
+
+
+def import_pygame() -> None:
+    """Import pygame without letting it pull in setuptools' `pkg_resources`, which alone takes ~100 ms.
+
+    `pygame.pkgdata` only uses it to locate bundled data such as the default font, and falls back to
+    plain file paths when the import fails, so the import is made to fail for the duration.
+    """
+    blocked = "pkg_resources" not in sys.modules
+    if blocked:
+        sys.modules["pkg_resources"] = None  # type: ignore[assignment]
+    try:
+        importlib.import_module("pygame")
+    finally:
+        if blocked and sys.modules.get("pkg_resources", False) is None:
+            del sys.modules["pkg_resources"]
+
+
+def init_pygame() -> None:
+    """Bring up only the display and font modules; `pygame.init()` also starts audio, joysticks and more."""
+    import pygame
+
+    pygame.display.init()
+    pygame.font.init()
+
+
+def font_path(name: str) -> Optional[str]:
+    """Resolve a system font name to a file, remembered on disk; None means pygame's default font.
+
+    `pygame.font.match_font` scans the whole system font list, which is most of `SysFont`'s cost.
+    """
+    try:
+        cache = json.loads(FONT_CACHE.read_text())
+    except (OSError, ValueError):
+        cache = {}
+    if name in cache and (cache[name] is None or Path(cache[name]).exists()):
+        return cache[name]
+
+    import pygame
+
+    cache[name] = pygame.font.match_font(name)
+    try:
+        FONT_CACHE.write_text(json.dumps(cache, indent=1))
+    except OSError as exc:
+        print(f"Warning: could not cache font paths in {FONT_CACHE}: {exc}")
+    return cache[name]
+
+
+def system_font(name: str, size: int):
+    """`pygame.font.SysFont(name, size)` without rescanning the system fonts on every launch."""
+    import pygame
+
+    return pygame.font.Font(font_path(name), size)
+
+
+# name -> command line, run from the repo root
+LAUNCHERS: Dict[str, List[str]] = {
+    "invaders": [sys.executable, "space_invaders/main.py"],
+    "brawler": [sys.executable, "kpop_demon_invaders/src/main.py"],
+    "horde": [sys.executable, "kpop_demon_invaders/src/main.py", "--horde"],
+}
+_PHASE_RE = re.compile(r"([a-z ]+?) ([0-9.]+) ms")
+
+
+def cold_start(game: str) -> Dict[str, float]:
+    """Launch `game` in a fresh interpreter until its first frame and return its startup phases in ms."""
+    import subprocess
+
+    command = LAUNCHERS[game] + ["--startup-report", "--quit-after-first-frame"]
+    result = subprocess.run(command, cwd=REPO_ROOT, capture_output=True, text=True, check=True)
+    line = next(line for line in result.stdout.splitlines() if line.startswith("startup: "))
+    return {phase.strip(): float(ms) for phase, ms in _PHASE_RE.findall(line[len("startup: "):])}
+
+
+def parse_budget(text: str) -> Tuple[str, float]:
+    phase, _, ms = text.partition("=")
+    if phase not in PHASES + ("total",) or not ms:
+        raise argparse.ArgumentTypeError(f"expected PHASE=MS with PHASE one of {', '.join(PHASES + ('total',))}")
+    return phase, float(ms)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import statistics
+
+    parser = argparse.ArgumentParser(description="Cold-start the games and report median time to first frame.")
+    parser.add_argument("games", nargs="*", default=["invaders", "brawler"], help=f"any of {', '.join(LAUNCHERS)}")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget", type=parse_budget, action="append", default=[], help="PHASE=MS; exit 1 if a median exceeds it")
+    args = parser.parse_args(argv)
+    unknown = sorted(set(args.games) - set(LAUNCHERS))
+    if unknown:
+        parser.error(f"unknown game(s): {', '.join(unknown)}")
+
+    over = []
+    for game in args.games:
+        runs = [cold_start(game) for _ in range(args.runs)]
+        medians = {phase: statistics.median(run.get(phase, 0.0) for run in runs) for phase in runs[0]}
+        print(f"{game:<10}" + "  ".join(f"{phase} {ms:7.1f} ms" for phase, ms in medians.items()))
+        for phase, limit in args.budget:
+            if medians.get(phase, 0.0) > limit:
+                over.append(f"{game} {phase}: {medians[phase]:.1f} ms > {limit:.0f} ms budget")
+    for line in over:
+        print(line)
+    return 1 if over else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
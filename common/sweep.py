@@ -0,0 +1,183 @@
+"""
+Balance sweeps: run an autopilot against every combination of tuning values across a process pool.
+
+    python -m common.sweep invaders -p ENEMY_SPEED=1.0,1.2,1.5 -p ENEMY_FIRE_RATE=0.004,0.008 --runs 50
+    python -m common.sweep brawler -p DEMON_SPEED=360,420 -p max_simultaneous=2,3,4 --jsonl runs.jsonl
+
+Upper-case names override a module constant inside the worker, in every module of the game that defines
+it (the horde reads the brawler's constants too); lower-case names set an attribute on each new
+simulation (e.g. the brawler's `max_simultaneous`). Runs are headless and uncapped; run i of every grid
+point uses seed `--seed + i`, so grid points face the same RNG streams.
+"""
+
+import argparse
+import itertools
+import json
+import os
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from common.games import GAMES, load_module, new_simulation
+
+Override = Tuple[str, object]
+DEFAULT_POLICY = {"invaders": "tracker", "brawler": "fighter", "horde": "fighter"}
+# game -> (game whose simulation module defines the tick rate, constant name)
+TICK_RATES = {"invaders": ("invaders", "FPS"), "brawler": ("brawler", "TICK_RATE"), "horde": ("brawler", "TICK_RATE")}
+# game -> modules whose constants the simulation reads; horde imports some of the brawler's by name,
+# so an override is applied to every copy.
+CONSTANT_MODULES = {"invaders": ("invaders",), "brawler": ("brawler",), "horde": ("horde", "brawler")}
+
+
+def tick_rate(game: str) -> int:
+    module, name = TICK_RATES[game]
+    return getattr(load_module(module), name)
+
+
+def parse_value(text: str) -> object:
+    for kind in (int, float):
+        try:
+            return kind(text)
+        except ValueError:
+            pass
+    return text
+
+
+def parse_param(spec: str) -> Tuple[str, List[object]]:
+    name, sep, values = spec.partition("=")
+    if not sep or not values:
+        raise argparse.ArgumentTypeError(f"expected NAME=v1,v2,... but got {spec!r}")
+    return name.strip(), [parse_value(v.strip()) for v in values.split(",")]
+
+
+def run_one(game: str, overrides: Sequence[Override], policy: str, seed: int, max_ticks: int) -> dict:
+    """Play one autopilot run with the given overrides applied; runs inside a pool worker."""
+    from common.autopilot import POLICIES
+
+    modules = [load_module(game, name) for name in CONSTANT_MODULES[game]]
+    constants = {name: value for name, value in overrides if name.isupper()}
+    for name in constants:
+        if not any(hasattr(module, name) for module in modules):
+            raise ValueError(f"{game} has no constant {name}")
+    saved = [(module, name, getattr(module, name)) for name in constants for module in modules if hasattr(module, name)]
+    for module, name, _ in saved:
+        setattr(module, name, constants[name])
+    try:
+        sim = new_simulation(game, seed)
+        for name, value in overrides:
+            if not name.isupper():
+                if not hasattr(sim, name):
+                    raise ValueError(f"{type(sim).__name__} has no attribute {name}")
+                setattr(sim, name, value)
+        act = POLICIES[game][policy]
+        rng = random.Random(seed)
+        ticks = 0
+        while not sim.game_over and ticks < max_ticks:
+            sim.step(act(sim, rng))
+            ticks += 1
+    finally:
+        for module, name, value in saved:
+            setattr(module, name, value)
+
+    if game == "invaders":
+        score, lost = sim.score, 3 - sim.player.lives
+    else:
+        score, lost = sim.defeated, 120 - sim.player.health
+    return {
+        "params": dict(overrides),
+        "seed": seed,
+        "won": bool(sim.player_won),
+        "timed_out": not sim.game_over,
+        "seconds": ticks / tick_rate(game),
+        "lost": lost,
+        "score": score,
+    }
+
+
+def aggregate(rows: List[dict]) -> Dict[str, float]:
+    wins = [row for row in rows if row["won"]]
+    return {
+        "runs": len(rows),
+        "win_rate": len(wins) / len(rows),
+        "clear_s": sum(row["seconds"] for row in wins) / len(wins) if wins else float("nan"),
+        "lost": sum(row["lost"] for row in rows) / len(rows),
+        "score": sum(row["score"] for row in rows) / len(rows),
+        "timeouts": sum(row["timed_out"] for row in rows),
+    }
+
+
+def format_table(names: List[str], grid: List[Tuple[object, ...]], results: Dict[tuple, List[dict]]) -> str:
+    header = [*names, "runs", "win%", "clear s", "lost", "score", "timeouts"]
+    lines = []
+    for point in grid:
+        rows = results.get(point)
+        if not rows:
+            continue
+        stats = aggregate(rows)
+        lines.append([
+            *(str(v) for v in point),
+            str(stats["runs"]),
+            f"{stats['win_rate'] * 100:.0f}",
+            f"{stats['clear_s']:.1f}",
+            f"{stats['lost']:.2f}",
+            f"{stats['score']:.1f}",
+            str(stats["timeouts"]),
+        ])
+    widths = [max(len(h), *(len(line[i]) for line in lines)) if lines else len(h) for i, h in enumerate(header)]
+    out = ["  ".join(h.rjust(w) for h, w in zip(header, widths))]
+    out += ["  ".join(c.rjust(w) for c, w in zip(line, widths)) for line in lines]
+    return "\n".join(out)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Sweep tuning values with a headless autopilot across all cores.")
+    parser.add_argument("game", choices=sorted(GAMES))
+    parser.add_argument("-p", "--param", action="append", type=parse_param, default=[], help="NAME=v1,v2,... (repeatable)")
+    parser.add_argument("--policy", help="autopilot policy (invaders: tracker|random, brawler and horde: fighter|random)")
+    parser.add_argument("--runs", type=int, default=20, help="runs per grid point")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first run at every grid point")
+    parser.add_argument("--max-seconds", type=float, default=600, help="game-time limit per run")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes (default: all cores)")
+    parser.add_argument("--jsonl", type=Path, help="append every finished run to this JSON-lines file")
+    args = parser.parse_args(argv)
+
+    from common.autopilot import POLICIES
+
+    policy = args.policy or DEFAULT_POLICY[args.game]
+    if policy not in POLICIES[args.game]:
+        parser.error(f"unknown {args.game} policy {policy!r}; expected one of {sorted(POLICIES[args.game])}")
+    names = [name for name, _ in args.param]
+    grid = list(itertools.product(*(values for _, values in args.param)))
+    max_ticks = int(args.max_seconds * tick_rate(args.game))
+
+    results: Dict[tuple, List[dict]] = {}
+    total = len(grid) * args.runs
+    done = 0
+    stream = args.jsonl.open("a") if args.jsonl else None
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            futures = {
+                pool.submit(run_one, args.game, tuple(zip(names, point)), policy, args.seed + i, max_ticks): point
+                for point in grid
+                for i in range(args.runs)
+            }
+            for future in as_completed(futures):
+                row = future.result()
+                results.setdefault(futures[future], []).append(row)
+                done += 1
+                if stream:
+                    stream.write(json.dumps(row) + "\n")
+                    stream.flush()
+                print(f"\r{done}/{total} runs", end="", file=sys.stderr, flush=True)
+    finally:
+        if stream:
+            stream.close()
+    print(file=sys.stderr)
+    print(format_table(names, grid, results))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,319 @@
+"""
+Gameplay telemetry: a non-blocking event stream written to compressed, rotating files, and an offline reader.
+
+The game loop calls `Telemetry.emit(kind, value)` (and `frame()` once per frame), which only stamps the
+event and appends it to a deque: about a microsecond, and deque appends are atomic, so no lock is taken. A background thread
+wakes every `flush_interval` seconds, drains the deque and appends one compressed columnar block per
+batch to the current file, starting a new file once it passes `rotate_bytes` and deleting the oldest
+files beyond `keep_files`. Simulations report kills, hits taken, spawns and the like through an
+`on_event` hook (None unless telemetry is on), the same way they report phases to the profiler.
+
+File layout (little-endian):
+    header   magic, version, u32 length + JSON metadata (game, session, host, start time, part)
+    blocks   u32 event count, f64 time of the first event, u32 length + zlib(columns)
+    columns  kind names ("\\0"-joined), then per event: u8 kind index, u32 microseconds since the
+             previous event, f32 value
+
+Blocks are self-contained, so a file cut short by a power loss is readable up to its last whole block.
+Aggregate a fleet's files with:
+
+    python -m common.telemetry telemetry/ cabinet-07/*.tlm [--json]
+"""
+
+import argparse
+import json
+import socket
+import struct
+import sys
+import threading
+import time
+import uuid
+import zlib
+from array import array
+from collections import deque
+from pathlib import Path
+from typing import Deque, Dict, Iterator, List, Optional, Tuple
+
+MAGIC = b"PGTM"
+VERSION = 1
+SUFFIX = ".tlm"
+
+_HEADER = struct.Struct("<4sHI")
+_BLOCK = struct.Struct("<IdI")
+_LENGTH = struct.Struct("<I")
+
+# Event values are counts and are totalled by the reader, except for these levels, which report their peak.
+# "frame" events (frame time in ms) are summarized as percentiles.
+GAUGES = frozenset({"swarm_speed", "score"})
+
+
+class TelemetryError(ValueError):
+    pass
+
+
+class Telemetry:
+    """Queue-backed event sink for one play session; `close()` flushes and stops the writer thread."""
+
+    def __init__(
+        self,
+        directory: Path,
+        game: str,
+        flush_interval: float = 1.0,
+        rotate_bytes: int = 1 << 20,
+        keep_files: int = 200,
+        max_pending: int = 1 << 16,
+    ) -> None:
+        self.directory = Path(directory)
+        self.game = game
+        self.session = uuid.uuid4().hex[:12]
+        self.flush_interval = flush_interval
+        self.rotate_bytes = rotate_bytes
+        self.keep_files = keep_files
+        self.started = time.time()
+        self.emitted = 0
+        self.written = 0
+        self._origin = time.perf_counter()
+        self._last_frame = 0.0
+        # Bounded so a stalled disk costs the oldest events, never memory.
+        self._pending: Deque[Tuple[float, str, float]] = deque(maxlen=max_pending)
+        self._part = 0
+        self._file = None
+        self._stop = threading.Event()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name="telemetry-writer", daemon=True)
+        self._thread.start()
+
+    def emit(self, kind: str, value: float = 0.0) -> None:
+        self._pending.append((time.perf_counter() - self._origin, kind, value))
+        self.emitted += 1
+
+    def frame(self) -> None:
+        """Call once per rendered frame; emits a "frame" event with the time since the previous call in ms."""
+        now = time.perf_counter()
+        if self._last_frame:
+            self._pending.append((now - self._origin, "frame", (now - self._last_frame) * 1000))
+            self.emitted += 1
+        self._last_frame = now
+
+    def close(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        try:
+            while not self._stop.wait(self.flush_interval):
+                self._flush()
+            self._flush()
+        finally:
+            if self._file:
+                self._file.close()
+
+    def _flush(self) -> None:
+        pending = self._pending
+        batch = [pending.popleft() for _ in range(len(pending))]
+        if not batch:
+            return
+        try:
+            if self._file is None or self._file.tell() >= self.rotate_bytes:
+                self._rotate()
+            self._file.write(encode_block(batch))
+            self._file.flush()
+            self.written += len(batch)
+        except OSError as exc:
+            print(f"Warning: telemetry write to {self.directory} failed ({exc}); {len(batch)} events lost")
+
+    def _rotate(self) -> None:
+        if self._file:
+            self._file.close()
+            self._file = None
+        self._part += 1
+        path = self.directory / f"{self.game}-{self.session}-{self._part:04d}{SUFFIX}"
+        self._file = path.open("wb")
+        meta = {
+            "game": self.game,
+            "session": self.session,
+            "host": socket.gethostname(),
+            "started": self.started,
+            "part": self._part,
+        }
+        self._file.write(encode_header(meta))
+        files = sorted(self.directory.glob(f"*{SUFFIX}"), key=lambda p: p.stat().st_mtime)
+        for old in files[: max(len(files) - self.keep_files, 0)]:
+            old.unlink(missing_ok=True)
+
+
+def attach(telemetry: Optional[Telemetry], *sims: object) -> None:
+    """Point each simulation's `on_event` hook at `telemetry` (or detach it with None)."""
+    for sim in sims:
+        sim.on_event = telemetry.emit if telemetry else None
+
+
+def encode_header(meta: dict) -> bytes:
+    blob = json.dumps(meta).encode()
+    return _HEADER.pack(MAGIC, VERSION, len(blob)) + blob
+
+
+def encode_block(events: List[Tuple[float, str, float]]) -> bytes:
+    kinds: Dict[str, int] = {}
+    ids = array("B")
+    deltas = array("I")
+    values = array("f")
+    previous = events[0][0]
+    for at, kind, value in events:
+        ids.append(kinds.setdefault(kind, len(kinds)))
+        deltas.append(min(round((at - previous) * 1e6), 0xFFFFFFFF))
+        values.append(value)
+        previous = at
+    if sys.byteorder == "big":
+        deltas.byteswap()
+        values.byteswap()
+    names = "\0".join(kinds).encode()
+    columns = _LENGTH.pack(len(names)) + names + ids.tobytes() + deltas.tobytes() + values.tobytes()
+    payload = zlib.compress(columns, 6)
+    return _BLOCK.pack(len(events), events[0][0], len(payload)) + payload
+
+
+def read_file(path: Path) -> Tuple[dict, List[Tuple[float, str, float]]]:
+    """Metadata and (seconds since session start, kind, value) events; a truncated last block is ignored."""
+    data = Path(path).read_bytes()
+    if len(data) < _HEADER.size:
+        raise TelemetryError(f"{path}: not a telemetry file")
+    magic, version, meta_len = _HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise TelemetryError(f"{path}: not a version {VERSION} telemetry file")
+    pos = _HEADER.size
+    meta = json.loads(data[pos : pos + meta_len])
+    pos += meta_len
+
+    events: List[Tuple[float, str, float]] = []
+    while pos + _BLOCK.size <= len(data):
+        count, first, length = _BLOCK.unpack_from(data, pos)
+        pos += _BLOCK.size
+        if pos + length > len(data):
+            break
+        events.extend(_decode_columns(zlib.decompress(data[pos : pos + length]), count, first))
+        pos += length
+    return meta, events
+
+
+def _decode_columns(columns: bytes, count: int, first: float) -> Iterator[Tuple[float, str, float]]:
+    (names_len,) = _LENGTH.unpack_from(columns)
+    pos = _LENGTH.size
+    names = columns[pos : pos + names_len].decode().split("\0")
+    pos += names_len
+    ids = array("B", columns[pos : pos + count])
+    pos += count
+    deltas = array("I", columns[pos : pos + 4 * count])
+    pos += 4 * count
+    values = array("f", columns[pos : pos + 4 * count])
+    if sys.byteorder == "big":
+        deltas.byteswap()
+        values.byteswap()
+    at = first
+    for kind, delta, value in zip(ids, deltas, values):
+        at += delta / 1e6
+        yield at, names[kind], value
+
+
+class SessionStats:
+    """Per-session totals of counter events, peaks of `GAUGES` and frame-time percentiles."""
+
+    def __init__(self, meta: dict) -> None:
+        self.game = meta["game"]
+        self.session = meta["session"]
+        self.host = meta.get("host", "?")
+        self.started = meta.get("started", 0.0)
+        self.duration = 0.0
+        self.totals: Dict[str, float] = {}
+        self.peaks: Dict[str, float] = {}
+        self.frame_ms: List[float] = []
+
+    def add(self, events: List[Tuple[float, str, float]]) -> None:
+        totals, peaks = self.totals, self.peaks
+        for at, kind, value in events:
+            if kind == "frame":
+                self.frame_ms.append(value)
+            elif kind in GAUGES:
+                peaks[kind] = max(peaks.get(kind, value), value)
+            else:
+                totals[kind] = totals.get(kind, 0.0) + value
+        if events:
+            self.duration = max(self.duration, events[-1][0])
+
+    def frame_percentile(self, q: float) -> float:
+        if not self.frame_ms:
+            return 0.0
+        ordered = sorted(self.frame_ms)
+        return ordered[min(int(q / 100 * len(ordered)), len(ordered) - 1)]
+
+    def to_dict(self) -> dict:
+        return {
+            "game": self.game,
+            "session": self.session,
+            "host": self.host,
+            "started": self.started,
+            "duration_s": round(self.duration, 3),
+            "totals": self.totals,
+            "peaks": self.peaks,
+            "frames": len(self.frame_ms),
+            "frame_p50_ms": self.frame_percentile(50),
+            "frame_p99_ms": self.frame_percentile(99),
+        }
+
+
+def aggregate(paths: List[Path]) -> List[SessionStats]:
+    """Group the events in `paths` (files or directories of .tlm files) by session."""
+    files: List[Path] = []
+    for path in paths:
+        files.extend(sorted(Path(path).glob(f"*{SUFFIX}")) if Path(path).is_dir() else [Path(path)])
+    sessions: Dict[str, SessionStats] = {}
+    for path in files:
+        meta, events = read_file(path)
+        stats = sessions.setdefault(meta["session"], SessionStats(meta))
+        stats.add(events)
+    return sorted(sessions.values(), key=lambda s: s.started)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Summarize gameplay telemetry files per session and per game.")
+    parser.add_argument("paths", nargs="+", type=Path, help=f"{SUFFIX} files or directories holding them")
+    parser.add_argument("--json", action="store_true", help="print one JSON object per session instead of a table")
+    args = parser.parse_args(argv)
+
+    try:
+        sessions = aggregate(args.paths)
+    except (OSError, TelemetryError) as exc:
+        print(exc)
+        return 1
+    if args.json:
+        for stats in sessions:
+            print(json.dumps(stats.to_dict()))
+        return 0
+
+    fleet: Dict[str, SessionStats] = {}
+    for stats in sessions:
+        started = time.strftime("%Y-%m-%d %H:%M", time.localtime(stats.started))
+        print(
+            f"{stats.game:<9}{stats.session}  {stats.host:<16}{started}  {stats.duration:7.1f} s"
+            f"  frame p50 {stats.frame_percentile(50):5.1f} ms  p99 {stats.frame_percentile(99):5.1f} ms  {_describe(stats)}"
+        )
+        game = fleet.setdefault(stats.game, SessionStats({"game": stats.game, "session": "all"}))
+        game.duration += stats.duration
+        for kind, total in stats.totals.items():
+            game.totals[kind] = game.totals.get(kind, 0.0) + total
+        for kind, peak in stats.peaks.items():
+            game.peaks[kind] = max(game.peaks.get(kind, peak), peak)
+    for name, game in sorted(fleet.items()):
+        count = sum(stats.game == name for stats in sessions)
+        print(f"{name}: {count} sessions, {game.duration / 60:.1f} min played  {_describe(game)}")
+    return 0
+
+
+def _describe(stats: SessionStats) -> str:
+    parts = [f"{kind} {total:g}" for kind, total in sorted(stats.totals.items())]
+    parts += [f"max {kind} {peak:g}" for kind, peak in sorted(stats.peaks.items())]
+    return "  ".join(parts)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+"""
+Fixed-timestep game loop support: the simulation ticks at a constant rate however fast frames render.
+
+Each frame, `advance()` adds the real time since the last frame to an accumulator and returns how many
+whole ticks to simulate; `alpha` is the leftover fraction of a tick, used to draw positions between the
+previous and current tick. After a stall (a slow machine, a dragged window) at most `max_steps` ticks
+are caught up and the rest of the backlog is dropped, so the game slows down instead of spiralling.
+"""
+
+import time
+from typing import Optional, Tuple
+
+import pygame
+
+
+class FixedTimestep:
+    def __init__(self, tick_rate: int, max_steps: int = 5) -> None:
+        self.tick_rate = tick_rate
+        self.dt = 1.0 / tick_rate
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self.dropped_ticks = 0
+        # Real seconds between the last two advance() calls, for effects that run on frame time.
+        self.frame_dt = 0.0
+        self._last: Optional[float] = None
+
+    def reset(self) -> None:
+        """Forget the backlog, e.g. after loading a save or seeking a replay."""
+        self.accumulator = 0.0
+        self._last = None
+
+    def advance(self) -> int:
+        """Ticks to simulate this frame."""
+        now = time.perf_counter()
+        self.frame_dt = now - self._last if self._last is not None else 0.0
+        self.accumulator += self.frame_dt
+        self._last = now
+        steps = int(self.accumulator / self.dt)
+        if steps > self.max_steps:
+            self.dropped_ticks += steps - self.max_steps
+            steps = self.max_steps
+            self.accumulator = 0.0
+        else:
+            self.accumulator -= steps * self.dt
+        return steps
+
+    @property
+    def alpha(self) -> float:
+        """How far into the next tick this frame is, in [0, 1)."""
+        return min(self.accumulator / self.dt, 1.0)
+
+
+def lerp(previous: float, current: float, alpha: float) -> float:
+    return previous + (current - previous) * alpha
+
+
+def open_window(size: Tuple[int, int], vsync: bool = False) -> pygame.Surface:
+    """`pygame.display.set_mode`, asking for vsync when requested and falling back if the driver refuses."""
+    if vsync:
+        try:
+            return pygame.display.set_mode(size, pygame.SCALED, vsync=1)
+        except pygame.error as exc:
+            print(f"Warning: vsync unavailable ({exc}); running uncapped")
+    return pygame.display.set_mode(size)
+
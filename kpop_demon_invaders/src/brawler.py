@@ -0,0 +1,521 @@
+"""
+Kpop Demon Hunters simulation: fighters, demons, hitboxes and a headless GameSession.
+Nothing here needs a display; GameSession.step(buttons) advances one fixed tick.
+
+Bodies move in float `position`s so slow speeds keep their sub-pixel motion; `rect` is the integer
+box used for hits and drawing, and `prev_position` is where the body was before the latest tick.
+"""
+
+import math
+import random
+from dataclasses import dataclass
+from typing import Callable
+
+import pygame
+
+from broadphase import HitboxSet, SweepAndPrune
+
+WIDTH, HEIGHT = 960, 540
+GROUND_Y = HEIGHT - 96
+GRAVITY = 2800
+PLAYER_SPEED = 880
+DEMON_SPEED = 420
+JUMP_FORCE = -1250
+LIGHT_COOLDOWN = 0.35
+HEAVY_COOLDOWN = 0.55
+DEMON_ATTACK_COOLDOWN = 1.1
+# How long a body flashes after taking a hit (drawn by the stage; no effect on play).
+HIT_FLASH_TIME = 0.15
+TICK_RATE = 60
+TICK_DT = 1.0 / TICK_RATE
+
+# Per-tick input bits: movement is held, jump and attacks are presses during the tick.
+INPUT_LEFT = 1
+INPUT_RIGHT = 2
+INPUT_JUMP = 4
+INPUT_LIGHT = 8
+INPUT_HEAVY = 16
+# Jumps and attacks are buffered: one pressed this many ticks before it is possible (mid-air, on
+# cooldown) still comes out on the first tick it can. 1 means only on the tick it was pressed.
+INPUT_BUFFER_TICKS = 6
+BUFFERED_INPUTS = (INPUT_JUMP, INPUT_LIGHT, INPUT_HEAVY)
+
+
+@dataclass
+class Hitbox:
+    rect: pygame.Rect
+    damage: int
+    timer: float
+    owner: object
+    # Session clock time at which GameSession drops the hitbox; `timer` then stays at the full duration.
+    expires_at: float = 0.0
+
+    def update(self, dt: float) -> None:
+        self.timer -= dt
+
+    @property
+    def expired(self) -> bool:
+        return self.timer <= 0
+
+
+class Fighter:
+    def __init__(self, x: int, y: int):
+        self.rect = pygame.Rect(x, y, 70, 110)
+        self.position = pygame.Vector2(x, y)
+        self.prev_position = pygame.Vector2(x, y)
+        self.velocity = pygame.Vector2(0, 0)
+        # Buffered press bit -> ticks left in its window.
+        self.buffered: dict[int, int] = {}
+        self.reset(x, y)
+
+    def reset(self, x: int, y: int) -> None:
+        self.rect.topleft = (x, y)
+        self.position.update(x, y)
+        self.prev_position.update(x, y)
+        self.velocity.update(0, 0)
+        self.health = 120
+        self.direction = 1
+        self.on_ground = False
+        self.attack_cooldown = 0.0
+        self.attacking = 0.0
+        self.hurt = 0.0
+        self.buffered.clear()
+
+    def handle_input(self, buttons: int) -> Hitbox | None:
+        """Apply one tick of INPUT_* bits: presses (jump, attacks, buffered ones too) first, then held movement."""
+        buffered = self.buffered
+        for bit in BUFFERED_INPUTS:
+            if buttons & bit:
+                buffered[bit] = INPUT_BUFFER_TICKS
+
+        if INPUT_JUMP in buffered and self.on_ground:
+            self.velocity.y = JUMP_FORCE
+            self.on_ground = False
+            del buffered[INPUT_JUMP]
+
+        hitbox = None
+        if INPUT_LIGHT in buffered:
+            hitbox = self._start_attack(heavy=False)
+            if hitbox:
+                del buffered[INPUT_LIGHT]
+        if INPUT_HEAVY in buffered and hitbox is None:
+            hitbox = self._start_attack(heavy=True)
+            if hitbox:
+                del buffered[INPUT_HEAVY]
+        for bit, ticks in list(buffered.items()):
+            if ticks > 1:
+                buffered[bit] = ticks - 1
+            else:
+                del buffered[bit]
+
+        move = (1 if buttons & INPUT_RIGHT else 0) - (1 if buttons & INPUT_LEFT else 0)
+        self.direction = 1 if move > 0 else -1 if move < 0 else self.direction
+        self.velocity.x = PLAYER_SPEED * move
+        return hitbox
+
+    def _start_attack(self, heavy: bool) -> Hitbox | None:
+        if self.attack_cooldown > 0:
+            return None
+
+        reach = 80 if heavy else 60
+        damage = 24 if heavy else 16
+        duration = 0.26 if heavy else 0.18
+        self.attack_cooldown = HEAVY_COOLDOWN if heavy else LIGHT_COOLDOWN
+        self.attacking = duration
+
+        offset_x = 24
+        hit_rect = pygame.Rect(
+            self.rect.centerx + (offset_x * self.direction),
+            self.rect.y + 22,
+            reach,
+            48,
+        )
+        if self.direction < 0:
+            hit_rect.x -= reach
+
+        return Hitbox(hit_rect, damage, duration, self)
+
+    def take_damage(self, dmg: int, attacker_x: float) -> None:
+        self.health = max(0, self.health - dmg)
+        knock_dir = math.copysign(1, self.rect.centerx - attacker_x)
+        self.velocity.x += 300 * knock_dir
+        self.velocity.y = -420
+        self.hurt = HIT_FLASH_TIME
+
+    def update(self, dt: float) -> None:
+        self.attacking = max(0, self.attacking - dt)
+        self.attack_cooldown = max(0, self.attack_cooldown - dt)
+        self.hurt = max(0, self.hurt - dt)
+
+        position = self.position
+        self.prev_position.update(position)
+        self.velocity.y += GRAVITY * dt
+        position += self.velocity * dt
+
+        if position.y + self.rect.height >= GROUND_Y:
+            position.y = GROUND_Y - self.rect.height
+            self.velocity.y = 0
+            self.on_ground = True
+        else:
+            self.on_ground = False
+
+        position.x = min(max(position.x, 0), WIDTH - self.rect.width)
+        self.rect.topleft = (int(position.x), int(position.y))
+
+
+class Demon:
+    def __init__(self, x: int, y: int, rng: random.Random):
+        self.rect = pygame.Rect(x, y, 68, 100)
+        self.position = pygame.Vector2(x, y)
+        self.prev_position = pygame.Vector2(x, y)
+        self.velocity = pygame.Vector2(0, 0)
+        self.health = 70
+        self.direction = -1
+        self.attack_cooldown = rng.uniform(0.7, 1.1)
+        self.attacking = 0.0
+        self.hurt = 0.0
+
+    def update(self, dt: float, player_x: float) -> Hitbox | None:
+        self.attack_cooldown = max(0, self.attack_cooldown - dt)
+        self.attacking = max(0, self.attacking - dt)
+
+        self.direction = 1 if player_x > self.rect.centerx else -1
+        distance = abs(player_x - self.rect.centerx)
+        chase = DEMON_SPEED if distance > 140 else DEMON_SPEED * 0.3
+        self.velocity.x = chase * self.direction
+
+        if distance < 160 and self.attack_cooldown <= 0:
+            return self._start_attack()
+        return None
+
+    def _start_attack(self) -> Hitbox:
+        reach = 70
+        damage = 10
+        duration = 0.24
+        self.attack_cooldown = DEMON_ATTACK_COOLDOWN
+        self.attacking = duration
+
+        hit_rect = pygame.Rect(
+            self.rect.centerx + (18 * self.direction),
+            self.rect.y + 28,
+            reach,
+            44,
+        )
+        if self.direction < 0:
+            hit_rect.x -= reach
+
+        return Hitbox(hit_rect, damage, duration, self)
+
+    def take_damage(self, dmg: int, attacker_x: float) -> None:
+        self.health = max(0, self.health - dmg)
+        knock_dir = math.copysign(1, self.rect.centerx - attacker_x)
+        self.velocity.x += 240 * knock_dir
+        self.velocity.y = -300
+        self.hurt = HIT_FLASH_TIME
+
+    def physics(self, dt: float) -> None:
+        self.hurt = max(0, self.hurt - dt)
+        position = self.position
+        self.prev_position.update(position)
+        self.velocity.y += GRAVITY * dt
+        position += self.velocity * dt
+
+        if position.y + self.rect.height >= GROUND_Y:
+            position.y = GROUND_Y - self.rect.height
+            self.velocity.y = 0
+
+        position.x = min(max(position.x, 0), WIDTH - self.rect.width)
+        self.rect.topleft = (int(position.x), int(position.y))
+
+
+class GameSession:
+    """One brawler run, stepped one tick at a time; reset() and restore() reuse its objects in place."""
+
+    def __init__(self, seed: int | None = None):
+        self.rng = random.Random(seed)
+        self.target = 10
+        self.max_simultaneous = 3
+        self.player = Fighter(140, GROUND_Y - 110)
+        self.demons: list[Demon] = []
+        self.hitboxes = HitboxSet()
+        self.broadphase = SweepAndPrune()
+        # Profiling hook, called with a phase name at each phase boundary of `step`.
+        self.on_phase: Callable[[str], None] | None = None
+        # Telemetry hook, called with an event kind and value (spawns, kills, hits taken, results).
+        self.on_event: Callable[[str, float], None] | None = None
+        # Particle hook, called with an effect kind and position ("connect", "player_hit", "kill").
+        self.on_effect: Callable[[str, float, float], None] | None = None
+        # Demon objects recycled by restore(), so rolling back does not allocate new ones.
+        self._demon_pool: list[Demon] = []
+        self.reset()
+
+    def reset(self) -> None:
+        """Start a new run in place; the RNG carries on, so retries differ unless the session is reseeded."""
+        self.player.reset(140, GROUND_Y - 110)
+        self.demons.clear()
+        self.hitboxes.clear()
+        self.broadphase.rebuild(self.demons)
+        self.clock = 0.0
+        self.defeated = 0
+        self.spawn_timer = 0.5
+        self.game_over = False
+        self.player_won = False
+        self.tick = 0
+
+    @property
+    def remaining(self) -> int:
+        return max(self.target - self.defeated, 0)
+
+    def add_hitbox(self, hitbox: Hitbox) -> None:
+        """Track a hitbox that lives for `hitbox.timer` seconds from now."""
+        hitbox.expires_at = self.clock + hitbox.timer
+        self.hitboxes.add(hitbox, hitbox.owner is self.player)
+
+    def step(self, buttons: int, dt: float = TICK_DT) -> None:
+        player = self.player
+        self.tick += 1
+        was_over = self.game_over
+
+        if not self.game_over:
+            new_hitbox = player.handle_input(buttons)
+            if new_hitbox:
+                self.add_hitbox(new_hitbox)
+
+            # AI and spawning
+            self.spawn_timer -= dt
+            if (
+                self.spawn_timer <= 0
+                and len(self.demons) < self.max_simultaneous
+                and self.defeated + len(self.demons) < self.target
+            ):
+                spawn_x = self.rng.choice([WIDTH - 140, 140])
+                demon = Demon(spawn_x, GROUND_Y - 100, self.rng)
+                self.demons.append(demon)
+                self.broadphase.add(demon)
+                self.spawn_timer = self.rng.uniform(1.2, 2.1)
+                if self.on_event:
+                    self.on_event("spawn", 1)
+
+            for demon in self.demons:
+                new_hb = demon.update(dt, player.rect.centerx)
+                if new_hb:
+                    self.add_hitbox(new_hb)
+        if self.on_phase:
+            self.on_phase("ai")
+
+        player.update(dt)
+        for demon in self.demons:
+            demon.physics(dt)
+        if self.on_phase:
+            self.on_phase("physics")
+
+        # Resolve hits: a hitbox lands on the tick it is made and on every tick until its expiry time.
+        self.clock += dt
+        health = player.health
+        self.hitboxes.expire(self.clock)
+        if self.hitboxes.player:
+            self.broadphase.update(self.demons)
+            for hb in self.hitboxes.player.values():
+                for demon in self.broadphase.query(hb.rect):
+                    if demon.health > 0:
+                        demon.take_damage(hb.damage, player.rect.centerx)
+                        if self.on_effect:
+                            self.on_effect("connect", *hb.rect.clip(demon.rect).center)
+        if player.health > 0:
+            for hb in self.hitboxes.enemy.values():
+                if hb.rect.colliderect(player.rect):
+                    player.take_damage(hb.damage, hb.owner.rect.centerx)
+                    if self.on_effect:
+                        self.on_effect("player_hit", *hb.rect.clip(player.rect).center)
+                    if player.health <= 0:
+                        break
+
+        before_cull = len(self.demons)
+        if self.on_effect:
+            for demon in self.demons:
+                if demon.health <= 0:
+                    self.on_effect("kill", *demon.rect.center)
+        self.demons[:] = [d for d in self.demons if d.health > 0]
+        if len(self.demons) != before_cull:
+            self.defeated += before_cull - len(self.demons)
+            self.broadphase.rebuild(self.demons)
+
+        if player.health <= 0 and not self.game_over:
+            self.game_over = True
+            self.player_won = False
+        elif self.defeated >= self.target and not self.demons and not self.game_over:
+            self.game_over = True
+            self.player_won = True
+        if self.on_event:
+            self._report(before_cull - len(self.demons), health - player.health, self.game_over and not was_over)
+        if self.on_phase:
+            self.on_phase("hits")
+
+    def _report(self, kills: int, damage: int, ended: bool) -> None:
+        if kills:
+            self.on_event("kill", kills)
+        if damage:
+            self.on_event("hit_taken", damage)
+        if ended:
+            self.on_event("won" if self.player_won else "lost", 1)
+
+    def snapshot(self) -> tuple:
+        """Plain-data copy of the run (fighters, demons, hitboxes, counters and RNG state)."""
+        # Hitboxes can outlive a culled demon, so owners are indexed into demons + any such orphans.
+        owners: list[Demon] = list(self.demons)
+        index = {id(d): i for i, d in enumerate(owners)}
+        for hb in self.hitboxes:
+            if hb.owner is not self.player and id(hb.owner) not in index:
+                index[id(hb.owner)] = len(owners)
+                owners.append(hb.owner)
+        hitboxes = tuple(
+            (tuple(hb.rect), hb.damage, hb.timer, hb.expires_at, -1 if hb.owner is self.player else index[id(hb.owner)])
+            for hb in self.hitboxes
+        )
+        return (
+            self.tick,
+            self.clock,
+            self.defeated,
+            self.spawn_timer,
+            self.game_over,
+            self.player_won,
+            _fighter_state(self.player),
+            tuple(_demon_state(d) for d in owners),
+            len(self.demons),
+            hitboxes,
+            self.rng.getstate(),
+        )
+
+    def restore(self, state: tuple) -> None:
+        (
+            self.tick,
+            self.clock,
+            self.defeated,
+            self.spawn_timer,
+            self.game_over,
+            self.player_won,
+            player_state,
+            demon_states,
+            live_demons,
+            hitboxes,
+            rng_state,
+        ) = state
+        _load_fighter(self.player, player_state)
+        pool = self._demon_pool
+        while len(pool) < len(demon_states):
+            demon = Demon.__new__(Demon)
+            demon.rect = pygame.Rect(0, 0, 0, 0)
+            demon.position = pygame.Vector2()
+            demon.prev_position = pygame.Vector2()
+            demon.velocity = pygame.Vector2()
+            pool.append(demon)
+        owners = pool[: len(demon_states)]
+        for demon, demon_state in zip(owners, demon_states):
+            _load_demon(demon, demon_state)
+        self.demons[:] = owners[:live_demons]
+        self.broadphase.rebuild(self.demons)
+        self.hitboxes.clear()
+        for rect, damage, timer, expires_at, owner in hitboxes:
+            hitbox = Hitbox(pygame.Rect(rect), damage, timer, self.player if owner < 0 else owners[owner], expires_at)
+            self.hitboxes.add(hitbox, owner < 0)
+        self.rng.setstate(rng_state)
+
+
+class VersusSession:
+    """Two players, one Fighter each, on a fixed tick; the deterministic core of rollback netplay.
+
+    `step((p1_buttons, p2_buttons))` must see the same input pairs on both peers to stay in sync, so
+    nothing in here reads the clock or a shared RNG.
+    """
+
+    def __init__(self) -> None:
+        self.fighters = (Fighter(0, 0), Fighter(0, 0))
+        self.hitboxes: list[Hitbox] = []
+        self.reset()
+
+    def reset(self) -> None:
+        self.fighters[0].reset(140, GROUND_Y - 110)
+        self.fighters[1].reset(WIDTH - 210, GROUND_Y - 110)
+        self.fighters[1].direction = -1
+        self.hitboxes.clear()
+        self.tick = 0
+        self.game_over = False
+        self.winner: int | None = None
+
+    def step(self, buttons: tuple[int, int]) -> None:
+        self.tick += 1
+        fighters = self.fighters
+        if not self.game_over:
+            for fighter, pressed in zip(fighters, buttons):
+                hitbox = fighter.handle_input(pressed)
+                if hitbox:
+                    self.hitboxes.append(hitbox)
+
+        for fighter in fighters:
+            fighter.update(TICK_DT)
+
+        for hb in list(self.hitboxes):
+            hb.update(TICK_DT)
+            if hb.expired:
+                self.hitboxes.remove(hb)
+                continue
+            for target in fighters:
+                if target is not hb.owner and target.health > 0 and hb.rect.colliderect(target.rect):
+                    target.take_damage(hb.damage, hb.owner.rect.centerx)
+
+        if not self.game_over:
+            down = [fighter.health <= 0 for fighter in fighters]
+            if any(down):
+                self.game_over = True
+                # A double KO on the same tick is a draw.
+                self.winner = None if all(down) else down.index(False)
+
+    def snapshot(self) -> tuple:
+        return (
+            self.tick,
+            self.game_over,
+            self.winner,
+            tuple(_fighter_state(f) for f in self.fighters),
+            tuple((tuple(hb.rect), hb.damage, hb.timer, self.fighters.index(hb.owner)) for hb in self.hitboxes),
+        )
+
+    def restore(self, state: tuple) -> None:
+        self.tick, self.game_over, self.winner, fighter_states, hitboxes = state
+        for fighter, fighter_state in zip(self.fighters, fighter_states):
+            _load_fighter(fighter, fighter_state)
+        self.hitboxes[:] = [
+            Hitbox(pygame.Rect(rect), damage, timer, self.fighters[owner]) for rect, damage, timer, owner in hitboxes
+        ]
+
+
+def _body_state(body: Fighter | Demon) -> tuple:
+    return (tuple(body.rect), body.position.x, body.position.y, body.velocity.x, body.velocity.y)
+
+
+def _load_body(body: Fighter | Demon, rect: tuple, x: float, y: float, vx: float, vy: float) -> None:
+    body.rect.update(rect)
+    body.position.update(x, y)
+    # A restored state has no previous tick to draw from.
+    body.prev_position.update(x, y)
+    body.velocity.update(vx, vy)
+
+
+def _fighter_state(f: Fighter) -> tuple:
+    buffered = tuple(sorted(f.buffered.items()))
+    return _body_state(f) + (f.health, f.direction, f.on_ground, f.attack_cooldown, f.attacking, f.hurt, buffered)
+
+
+def _load_fighter(f: Fighter, state: tuple) -> None:
+    _load_body(f, *state[:5])
+    f.health, f.direction, f.on_ground, f.attack_cooldown, f.attacking, f.hurt, buffered = state[5:]
+    f.buffered.clear()
+    f.buffered.update(buffered)
+
+
+def _demon_state(d: Demon) -> tuple:
+    return _body_state(d) + (d.health, d.direction, d.attack_cooldown, d.attacking, d.hurt)
+
+
+def _load_demon(d: Demon, state: tuple) -> None:
+    _load_body(d, *state[:5])
+    d.health, d.direction, d.attack_cooldown, d.attacking, d.hurt = state[5:]
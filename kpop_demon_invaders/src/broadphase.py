@@ -0,0 +1,92 @@
+"""
+Hit-resolution bookkeeping for the brawler.
+
+The stage is a strip along x, so `SweepAndPrune` keeps the targets sorted by left edge and a hitbox only
+tests the slice whose x intervals can overlap its own. `HitboxSet` splits live hitboxes into Rumi's and
+the demons' and expires them from a heap ordered by expiry time instead of ticking every timer.
+"""
+
+import heapq
+import itertools
+import operator
+from bisect import bisect_left, bisect_right
+from typing import Iterator, Protocol
+
+import pygame
+
+
+class Boxed(Protocol):
+    rect: pygame.Rect
+
+
+_left = operator.attrgetter("rect.left")
+
+
+class SweepAndPrune:
+    """Targets sorted by left edge; re-sorting each tick is linear because they barely move between ticks."""
+
+    def __init__(self) -> None:
+        self.targets: list[Boxed] = []
+        self._max_width = 0
+
+    def rebuild(self, targets: list[Boxed]) -> None:
+        """Replace the tracked set, e.g. after a cull or a restore."""
+        self.targets[:] = targets
+        self._max_width = max((t.rect.width for t in targets), default=0)
+        self.targets.sort(key=_left)
+
+    def add(self, target: Boxed) -> None:
+        self.targets.append(target)
+        self._max_width = max(self._max_width, target.rect.width)
+
+    def update(self, targets: list[Boxed]) -> None:
+        """Restore the x order after movement; `targets` is only read if members were added behind our back."""
+        if len(targets) != len(self.targets):
+            self.rebuild(targets)
+            return
+        # Timsort finds the runs left over from last tick, so this is the incremental insertion-sort pass in C.
+        self.targets.sort(key=_left)
+
+    def query(self, rect: pygame.Rect) -> list[Boxed]:
+        """Targets whose rect overlaps `rect`; only those with a left edge in reach are tested."""
+        targets = self.targets
+        lo = bisect_right(targets, rect.left - self._max_width, key=_left)
+        hi = bisect_left(targets, rect.right, key=_left, lo=lo)
+        return [t for t in targets[lo:hi] if rect.colliderect(t.rect)]
+
+
+class HitboxSet:
+    """Live hitboxes by side. Each carries an absolute `expires_at`; `expire(now)` pops the due ones off a heap."""
+
+    def __init__(self) -> None:
+        self.player: dict[int, object] = {}
+        self.enemy: dict[int, object] = {}
+        self._expiry: list[tuple[float, int, dict]] = []
+        self._keys = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self.player) + len(self.enemy)
+
+    def __iter__(self) -> Iterator:
+        return itertools.chain(self.player.values(), self.enemy.values())
+
+    def add(self, hitbox, from_player: bool) -> None:
+        side = self.player if from_player else self.enemy
+        key = next(self._keys)
+        side[key] = hitbox
+        heapq.heappush(self._expiry, (hitbox.expires_at, key, side))
+
+    def expire(self, now: float) -> int:
+        """Drop every hitbox with `expires_at <= now`; returns how many went."""
+        expiry = self._expiry
+        removed = 0
+        while expiry and expiry[0][0] <= now:
+            _, key, side = heapq.heappop(expiry)
+            del side[key]
+            removed += 1
+        return removed
+
+    def clear(self) -> None:
+        self.player.clear()
+        self.enemy.clear()
+        self._expiry.clear()
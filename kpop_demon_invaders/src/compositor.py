@@ -0,0 +1,102 @@
+"""
+Stage compositor for the brawler: static layers baked once, then only dirty regions restored and presented.
+"""
+
+from dataclasses import dataclass
+from typing import Callable
+
+import pygame
+
+
+@dataclass
+class StaticLayer:
+    name: str
+    paint: Callable[[pygame.Surface], None]
+    foreground: bool = False
+    surface: pygame.Surface | None = None
+
+    def bake(self, size: tuple[int, int]) -> pygame.Surface:
+        if self.surface is None:
+            surface = pygame.Surface(size, pygame.SRCALPHA)
+            self.paint(surface)
+            self.surface = surface.convert_alpha()
+        return self.surface
+
+
+class Compositor:
+    """Layered frame builder for the brawler stage.
+
+    Static layers are painted once into cached surfaces and flattened into a background (below the
+    sprites) and a foreground (above them). Each frame only the regions dynamic drawing touched, this
+    frame or last, plus the foreground's bounding box are restored from those caches and sent to the
+    display.
+    """
+
+    def __init__(self, screen: pygame.Surface, dirty_rects: bool = True):
+        self.screen = screen
+        self.dirty_rects = dirty_rects
+        self.layers: list[StaticLayer] = []
+        self.background = pygame.Surface(screen.get_size()).convert()
+        self.foreground = pygame.Surface(screen.get_size(), pygame.SRCALPHA).convert_alpha()
+        self._foreground_rect: pygame.Rect | None = None
+        self._flattened = False
+        self._full = True
+        self._previous: list[pygame.Rect] = []
+        self._dirty: list[pygame.Rect] = []
+
+    def add_layer(self, name: str, paint: Callable[[pygame.Surface], None], foreground: bool = False) -> StaticLayer:
+        layer = StaticLayer(name, paint, foreground)
+        self.layers.append(layer)
+        self._flattened = False
+        return layer
+
+    def invalidate(self, name: str | None = None) -> None:
+        """Repaint one static layer (or all of them) on the next frame."""
+        for layer in self.layers:
+            if name is None or layer.name == name:
+                layer.surface = None
+        self._flattened = False
+
+    def _flatten(self) -> None:
+        self.background.fill((0, 0, 0))
+        self.foreground.fill((0, 0, 0, 0))
+        for layer in self.layers:
+            target = self.foreground if layer.foreground else self.background
+            target.blit(layer.bake(target.get_size()), (0, 0))
+        bounds = self.foreground.get_bounding_rect()
+        self._foreground_rect = bounds if bounds.width and bounds.height else None
+        self._flattened = True
+        self._full = True
+
+    def begin_frame(self) -> pygame.Surface:
+        """Restore the background under everything drawn last frame and return the surface to draw on."""
+        if not self._flattened:
+            self._flatten()
+        if self._full or not self.dirty_rects:
+            self.screen.blit(self.background, (0, 0))
+        else:
+            restore = self._previous
+            if self._foreground_rect:
+                # The foreground is blended on every frame, so its pixels must start from the plain background.
+                restore = restore + [self._foreground_rect]
+            self.screen.blits([(self.background, rect, rect) for rect in restore], doreturn=False)
+        self._dirty = []
+        return self.screen
+
+    def add_dirty(self, rects: pygame.Rect | list[pygame.Rect]) -> None:
+        if isinstance(rects, pygame.Rect):
+            self._dirty.append(rects)
+        else:
+            self._dirty.extend(rects)
+
+    def present(self) -> None:
+        full = self._full or not self.dirty_rects
+        foreground = self._foreground_rect
+        if foreground:
+            self.screen.blit(self.foreground, foreground, foreground)
+        if full:
+            pygame.display.flip()
+        else:
+            pygame.display.update(self._previous + self._dirty + ([foreground] if foreground else []))
+        self._previous = self._dirty
+        self._full = False
@@ -0,0 +1,325 @@
+"""
+Horde mode: the demon wave stored as NumPy arrays so a thousand-plus demons update in batched operations.
+Chase AI, attacks, gravity, ground clamping, knockback and crowd separation follow the rules of
+`brawler.Demon`, applied to every demon at once.
+"""
+
+import random
+from typing import Callable
+
+import numpy as np
+import pygame
+
+from brawler import (
+    DEMON_ATTACK_COOLDOWN,
+    DEMON_SPEED,
+    GRAVITY,
+    GROUND_Y,
+    TICK_DT,
+    WIDTH,
+    Fighter,
+    Hitbox,
+    _fighter_state,
+    _load_fighter,
+)
+
+DEMON_W, DEMON_H = 68, 100
+ATTACK_REACH, ATTACK_H, ATTACK_DAMAGE, ATTACK_TIME = 70, 44, 10, 0.24
+CROWD_RADIUS = 48
+CROWD_PUSH = 0.5  # px per tick for each extra neighbour on one side
+CROWD_MAX_PUSH = 12
+
+
+class Horde:
+    """Struct-of-arrays demon storage; the first `count` slots are live and compacted after deaths.
+
+    Positions are floats, as in `brawler.Demon.position`; `prev_x`/`prev_y` hold them before the latest tick.
+    """
+
+    FIELDS = {
+        "x": np.float64,
+        "y": np.float64,
+        "prev_x": np.float64,
+        "prev_y": np.float64,
+        "vx": np.float64,
+        "vy": np.float64,
+        "health": np.int32,
+        "direction": np.int32,
+        "cooldown": np.float64,
+        "attacking": np.float64,
+        "attack_x": np.int32,
+        "attack_y": np.int32,
+        "attack_timer": np.float64,
+    }
+
+    def __init__(self, capacity: int = 256):
+        self.count = 0
+        self.capacity = capacity
+        for name, dtype in self.FIELDS.items():
+            setattr(self, name, np.zeros(capacity, dtype))
+
+    def __len__(self) -> int:
+        return self.count
+
+    def view(self, name: str) -> np.ndarray:
+        return getattr(self, name)[: self.count]
+
+    def _grow(self, needed: int) -> None:
+        capacity = max(needed, self.capacity * 2)
+        for name in self.FIELDS:
+            old = getattr(self, name)
+            new = np.zeros(capacity, old.dtype)
+            new[: self.count] = old[: self.count]
+            setattr(self, name, new)
+        self.capacity = capacity
+
+    def spawn(self, xs: np.ndarray, ys: np.ndarray, cooldowns: np.ndarray) -> None:
+        n = len(xs)
+        if self.count + n > self.capacity:
+            self._grow(self.count + n)
+        s = slice(self.count, self.count + n)
+        self.x[s] = self.prev_x[s] = xs
+        self.y[s] = self.prev_y[s] = ys
+        self.vx[s] = 0.0
+        self.vy[s] = 0.0
+        self.health[s] = 70
+        self.direction[s] = -1
+        self.cooldown[s] = cooldowns
+        self.attacking[s] = 0.0
+        self.attack_timer[s] = 0.0
+        self.count += n
+
+    def keep(self, mask: np.ndarray) -> int:
+        """Drop the live demons where `mask` is False; returns how many were removed."""
+        kept = int(mask.sum())
+        removed = self.count - kept
+        if removed:
+            for name in self.FIELDS:
+                array = getattr(self, name)
+                array[:kept] = array[: self.count][mask]
+            self.count = kept
+        return removed
+
+    def clear(self) -> None:
+        self.count = 0
+
+    def think(self, dt: float, player_x: int) -> None:
+        """Chase AI and attack starts, as in `Demon.update`."""
+        cooldown, attacking = self.view("cooldown"), self.view("attacking")
+        np.maximum(cooldown - dt, 0, out=cooldown)
+        np.maximum(attacking - dt, 0, out=attacking)
+
+        center = self.view("x").astype(np.int32) + DEMON_W // 2
+        direction = self.view("direction")
+        direction[:] = np.where(player_x > center, 1, -1)
+        distance = np.abs(player_x - center)
+        self.view("vx")[:] = np.where(distance > 140, DEMON_SPEED, DEMON_SPEED * 0.3) * direction
+
+        start = (distance < 160) & (cooldown <= 0)
+        if start.any():
+            cooldown[start] = DEMON_ATTACK_COOLDOWN
+            attacking[start] = ATTACK_TIME
+            facing = direction[start]
+            hit_x = center[start] + 18 * facing
+            self.view("attack_x")[start] = np.where(facing < 0, hit_x - ATTACK_REACH, hit_x)
+            self.view("attack_y")[start] = self.view("y")[start] + 28
+            self.view("attack_timer")[start] = ATTACK_TIME
+
+    def move(self, dt: float) -> None:
+        """Gravity, integration, ground and wall clamping (as in `Demon.physics`), then crowd separation."""
+        x, y, vy = self.view("x"), self.view("y"), self.view("vy")
+        self.view("prev_x")[:] = x
+        self.view("prev_y")[:] = y
+        vy += GRAVITY * dt
+        x += self.view("vx") * dt
+        y += vy * dt
+
+        grounded = y + DEMON_H >= GROUND_Y
+        y[grounded] = GROUND_Y - DEMON_H
+        vy[grounded] = 0.0
+
+        if self.count > 1:
+            # Crowd separation: each demon steps away from whichever side has more neighbours within
+            # CROWD_RADIUS. Ties in x split by sort order, so a stacked group fans out instead of moving as one.
+            order = np.argsort(x, kind="stable")
+            xs = x[order]
+            rank = np.arange(self.count)
+            left = rank - np.searchsorted(xs, xs - CROWD_RADIUS, side="left")
+            right = np.searchsorted(xs, xs + CROWD_RADIUS, side="right") - 1 - rank
+            push = np.clip((left - right) * CROWD_PUSH, -CROWD_MAX_PUSH, CROWD_MAX_PUSH)
+            x[order] += push
+        np.clip(x, 0, WIDTH - DEMON_W, out=x)
+
+    def hit_by(self, rect: pygame.Rect, damage: int, attacker_x: int) -> int:
+        """Apply a player hitbox to every overlapping demon, as `Demon.take_damage` does for one; returns how many."""
+        x, y, health = self.view("x"), self.view("y"), self.view("health")
+        hit = (
+            (health > 0)
+            & (x < rect.right) & (x + DEMON_W > rect.left)
+            & (y < rect.bottom) & (y + DEMON_H > rect.top)
+        )
+        if not hit.any():
+            return 0
+        health[hit] = np.maximum(health[hit] - damage, 0)
+        knock = np.where(x[hit] + DEMON_W // 2 >= attacker_x, 240.0, -240.0)
+        self.view("vx")[hit] += knock
+        self.view("vy")[hit] = -300.0
+        return int(np.count_nonzero(hit))
+
+    def first_attack_on(self, rect: pygame.Rect, dt: float) -> int | None:
+        """Tick attack timers and return the index of a live attack overlapping `rect`, if any."""
+        timer = self.view("attack_timer")
+        timer -= dt
+        ax, ay = self.view("attack_x"), self.view("attack_y")
+        touching = np.flatnonzero(
+            (timer > 0)
+            & (ax < rect.right) & (ax + ATTACK_REACH > rect.left)
+            & (ay < rect.bottom) & (ay + ATTACK_H > rect.top)
+        )
+        return int(touching[0]) if touching.size else None
+
+    def state(self) -> tuple:
+        return (self.count,) + tuple(self.view(name).tobytes() for name in self.FIELDS)
+
+    def load(self, state: tuple) -> None:
+        count, *columns = state
+        if count > self.capacity:
+            self._grow(count)
+        self.count = count
+        for (name, dtype), data in zip(self.FIELDS.items(), columns):
+            getattr(self, name)[:count] = np.frombuffer(data, dtype)
+
+
+class HordeSession:
+    """Horde-mode run with the same surface as `brawler.GameSession`: step, reset, snapshot, restore."""
+
+    def __init__(self, seed: int | None = None, target: int = 3000, max_simultaneous: int = 1200):
+        self.rng = random.Random(seed)
+        self.target = target
+        self.max_simultaneous = max_simultaneous
+        self.spawn_batch = 40
+        self.player = Fighter(140, GROUND_Y - 110)
+        self.horde = Horde()
+        self.hitboxes: list[Hitbox] = []
+        self.on_phase: Callable[[str], None] | None = None
+        self.on_event: Callable[[str, float], None] | None = None
+        self.on_effect: Callable[[str, float, float], None] | None = None
+        self.reset()
+
+    def reset(self) -> None:
+        self.player.reset(WIDTH // 2 - 35, GROUND_Y - 110)
+        self.horde.clear()
+        self.hitboxes.clear()
+        self.defeated = 0
+        self.spawn_timer = 0.5
+        self.game_over = False
+        self.player_won = False
+        self.tick = 0
+
+    @property
+    def remaining(self) -> int:
+        return max(self.target - self.defeated, 0)
+
+    def _spawn_wave(self) -> None:
+        room = min(self.max_simultaneous - len(self.horde), self.target - self.defeated - len(self.horde), self.spawn_batch)
+        if room <= 0:
+            return
+        rng = self.rng
+        xs = [rng.choice((rng.randrange(0, 120), rng.randrange(WIDTH - DEMON_W - 120, WIDTH - DEMON_W))) for _ in range(room)]
+        ys = [GROUND_Y - DEMON_H - rng.randrange(0, 240) for _ in range(room)]
+        cooldowns = [rng.uniform(0.7, 1.1) for _ in range(room)]
+        self.horde.spawn(np.array(xs), np.array(ys), np.array(cooldowns))
+
+    def step(self, buttons: int, dt: float = TICK_DT) -> None:
+        player, horde = self.player, self.horde
+        self.tick += 1
+        was_over, alive = self.game_over, len(horde)
+
+        if not self.game_over:
+            new_hitbox = player.handle_input(buttons)
+            if new_hitbox:
+                self.hitboxes.append(new_hitbox)
+            self.spawn_timer -= dt
+            if self.spawn_timer <= 0:
+                self._spawn_wave()
+                self.spawn_timer = self.rng.uniform(0.2, 0.4)
+            horde.think(dt, player.rect.centerx)
+        spawned = len(horde) - alive
+        if self.on_phase:
+            self.on_phase("ai")
+
+        player.update(dt)
+        horde.move(dt)
+        if self.on_phase:
+            self.on_phase("physics")
+
+        for hb in list(self.hitboxes):
+            hb.update(dt)
+            if hb.expired:
+                self.hitboxes.remove(hb)
+                continue
+            if horde.hit_by(hb.rect, hb.damage, hb.owner.rect.centerx) and self.on_effect:
+                self.on_effect("connect", *hb.rect.center)
+        # A crowd can have dozens of swings overlapping Rumi; only one lands per tick.
+        health = player.health
+        attacker = horde.first_attack_on(player.rect, dt)
+        if attacker is not None and player.health > 0:
+            player.take_damage(ATTACK_DAMAGE, int(horde.x[attacker]) + DEMON_W // 2)
+            if self.on_effect:
+                self.on_effect("player_hit", *player.rect.center)
+
+        if self.on_effect:
+            dead = horde.view("health") <= 0
+            for x, y in zip(horde.view("x")[dead].tolist(), horde.view("y")[dead].tolist()):
+                self.on_effect("kill", x + DEMON_W / 2, y + DEMON_H / 2)
+        kills = horde.keep(horde.view("health") > 0)
+        self.defeated += kills
+
+        if player.health <= 0 and not self.game_over:
+            self.game_over = True
+            self.player_won = False
+        elif self.defeated >= self.target and not len(horde) and not self.game_over:
+            self.game_over = True
+            self.player_won = True
+        if self.on_event:
+            if spawned:
+                self.on_event("spawn", spawned)
+            if kills:
+                self.on_event("kill", kills)
+            if health > player.health:
+                self.on_event("hit_taken", health - player.health)
+            if self.game_over and not was_over:
+                self.on_event("won" if self.player_won else "lost", 1)
+        if self.on_phase:
+            self.on_phase("hits")
+
+    def snapshot(self) -> tuple:
+        return (
+            self.tick,
+            self.defeated,
+            self.spawn_timer,
+            self.game_over,
+            self.player_won,
+            _fighter_state(self.player),
+            self.horde.state(),
+            tuple((tuple(hb.rect), hb.damage, hb.timer) for hb in self.hitboxes),
+            self.rng.getstate(),
+        )
+
+    def restore(self, state: tuple) -> None:
+        (
+            self.tick,
+            self.defeated,
+            self.spawn_timer,
+            self.game_over,
+            self.player_won,
+            player_state,
+            horde_state,
+            hitboxes,
+            rng_state,
+        ) = state
+        _load_fighter(self.player, player_state)
+        self.horde.load(horde_state)
+        # Only Rumi's swings live in `hitboxes`; demon attacks are part of the horde arrays.
+        self.hitboxes[:] = [Hitbox(pygame.Rect(rect), damage, timer, self.player) for rect, damage, timer in hitboxes]
+        self.rng.setstate(rng_state)
@@ -0,0 +1,93 @@
+"""
+On-disk cache of decoded, scaled and flipped sprites stored as raw RGBA.
+
+Entries are keyed by a hash of the source file's bytes, the target height and the transform, so editing
+an asset invalidates its entries on the next load. A hit is one file read plus `pygame.image.frombuffer`;
+no image decoding or resampling happens.
+"""
+
+import hashlib
+import os
+import struct
+from pathlib import Path
+
+import pygame
+
+
+CACHE_DIR = Path(os.environ.get("KPOP_SPRITE_CACHE", Path(__file__).resolve().parent.parent / ".sprite_cache"))
+MAGIC = b"KSPR"
+VERSION = 1
+# magic, version, width, height; RGBA rows follow.
+HEADER = struct.Struct("<4sBII")
+
+
+class SpriteCache:
+    def __init__(self, directory: Path = CACHE_DIR):
+        self.directory = Path(directory)
+        self.hits = 0
+        self.misses = 0
+        # (path, mtime, size) -> content hash, so a file is hashed once per process.
+        self._digests: dict[tuple[str, int, int], str] = {}
+
+    def source_digest(self, path: Path) -> str:
+        stat = path.stat()
+        key = (str(path), stat.st_mtime_ns, stat.st_size)
+        digest = self._digests.get(key)
+        if digest is None:
+            digest = self._digests[key] = hashlib.blake2b(path.read_bytes(), digest_size=12).hexdigest()
+        return digest
+
+    def entry_path(self, path: Path, height: int, flip: bool, digest: str | None = None) -> Path:
+        transform = "flipx" if flip else "none"
+        return self.directory / f"{path.stem}-{digest or self.source_digest(path)}-h{height}-{transform}.rgba"
+
+    def load(self, path: Path, height: int, flip: bool = False) -> pygame.Surface:
+        """Return the sprite at `path` scaled to `height` (mirrored if `flip`), building the entry on a miss."""
+        entry = self.entry_path(path, height, flip)
+        surface = self._read(entry)
+        if surface is not None:
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = build_sprite(path, height, flip)
+        self._write(entry, surface, self.entry_path(path, height, flip, digest="*"))
+        return surface
+
+    def _read(self, entry: Path) -> pygame.Surface | None:
+        try:
+            data = entry.read_bytes()
+            magic, version, width, height = HEADER.unpack_from(data)
+        except (OSError, struct.error):
+            return None
+        if magic != MAGIC or version != VERSION or len(data) != HEADER.size + width * height * 4:
+            return None
+        return pygame.image.frombuffer(memoryview(data)[HEADER.size:], (width, height), "RGBA").convert_alpha()
+
+    def _write(self, entry: Path, surface: pygame.Surface, siblings: Path) -> None:
+        width, height = surface.get_size()
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            # Entries for older versions of the same asset and transform are dead weight once the source changed.
+            # Digests are fixed-length, so equal name lengths rule out other assets matching the glob.
+            for stale in self.directory.glob(siblings.name):
+                if stale != entry and len(stale.name) == len(entry.name):
+                    stale.unlink(missing_ok=True)
+            tmp = entry.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_bytes(HEADER.pack(MAGIC, VERSION, width, height) + pygame.image.tobytes(surface, "RGBA"))
+            os.replace(tmp, entry)
+        except OSError as exc:
+            print(f"Warning: could not cache {entry.name}: {exc}")
+
+
+def build_sprite(path: Path, height: int, flip: bool = False) -> pygame.Surface:
+    """Decode and scale a sprite the slow way; this is what the cache stores."""
+    sprite = pygame.image.load(path).convert_alpha()
+    width, source_height = sprite.get_size()
+    if source_height > 0:
+        sprite = pygame.transform.smoothscale(sprite, (max(1, int(width * height / source_height)), height))
+    if flip:
+        sprite = pygame.transform.flip(sprite, True, False)
+    return sprite
+
+
+sprite_cache = SpriteCache()
@@ -0,0 +1,112 @@
+"""
+In-memory cache of transformed sprite variants: mirrored, rescaled and tinted copies of the loaded sprites.
+
+Variants are built on first use and kept in LRU order under a byte budget (4 bytes per pixel), so a
+hit flash or a squash costs one dict lookup per frame instead of `smoothscale`/`flip`/`fill` work.
+Scales are rounded to `SCALE_STEP` and tint strengths to `TINT_LEVELS` steps, which bounds how many
+distinct variants a fading or easing effect can create. Base sprites are pinned and never evicted.
+Variants are shared between callers, so treat them as read-only.
+"""
+
+from collections import OrderedDict
+
+import pygame
+
+
+SCALE_STEP = 1 / 32
+TINT_LEVELS = 8
+DEFAULT_BUDGET_BYTES = 32 * 1024 * 1024
+
+
+class SpriteVariants:
+    def __init__(self, budget_bytes: int = DEFAULT_BUDGET_BYTES):
+        self.budget_bytes = budget_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # name -> (right-facing, left-facing)
+        self._bases: dict[str, tuple[pygame.Surface, pygame.Surface]] = {}
+        self._variants: OrderedDict[tuple, pygame.Surface] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._variants)
+
+    def add_base(self, name: str, right: pygame.Surface, left: pygame.Surface | None = None) -> None:
+        """Register a sprite; `left` is its mirrored copy if one was already loaded (built on demand otherwise)."""
+        self.discard(name)
+        self._bases[name] = (right, left or pygame.transform.flip(right, True, False))
+
+    def discard(self, name: str) -> None:
+        """Forget a sprite and every variant built from it."""
+        self._bases.pop(name, None)
+        for key in [key for key in self._variants if key[0] == name]:
+            self.bytes -= _surface_bytes(self._variants.pop(key))
+
+    def get(
+        self,
+        name: str,
+        flip: bool = False,
+        scale: tuple[float, float] = (1.0, 1.0),
+        tint: tuple[int, int, int] | None = None,
+        strength: float = 1.0,
+    ) -> pygame.Surface:
+        """The `name` sprite mirrored if `flip`, scaled by (sx, sy) and brightened towards `tint` by `strength`."""
+        sx = round(scale[0] / SCALE_STEP)
+        sy = round(scale[1] / SCALE_STEP)
+        level = round(min(max(strength, 0.0), 1.0) * TINT_LEVELS) if tint else 0
+        base = self._bases[name][1 if flip else 0]
+        if level == 0 and sx == sy == round(1 / SCALE_STEP):
+            return base
+
+        key = (name, flip, sx, sy, tint if level else None, level)
+        variant = self._variants.get(key)
+        if variant is not None:
+            self._variants.move_to_end(key)
+            self.hits += 1
+            return variant
+        self.misses += 1
+        variant = _build(base, sx * SCALE_STEP, sy * SCALE_STEP, tint, level / TINT_LEVELS)
+        self._variants[key] = variant
+        self.bytes += _surface_bytes(variant)
+        while self.bytes > self.budget_bytes and len(self._variants) > 1:
+            _, evicted = self._variants.popitem(last=False)
+            self.bytes -= _surface_bytes(evicted)
+            self.evictions += 1
+        return variant
+
+    def clear(self) -> None:
+        self._variants.clear()
+        self.bytes = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._variants),
+            "bytes": self.bytes,
+            "budget_bytes": self.budget_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+def _surface_bytes(surface: pygame.Surface) -> int:
+    width, height = surface.get_size()
+    return width * height * 4
+
+
+def _build(
+    base: pygame.Surface, sx: float, sy: float, tint: tuple[int, int, int] | None, strength: float
+) -> pygame.Surface:
+    width, height = base.get_size()
+    size = (max(1, round(width * sx)), max(1, round(height * sy)))
+    variant = pygame.transform.smoothscale(base, size) if size != (width, height) else base.copy()
+    if tint and strength:
+        # Adding to RGB only keeps the alpha channel, so the flash follows the sprite's outline.
+        variant.fill(tuple(int(c * strength) for c in tint), special_flags=pygame.BLEND_RGB_ADD)
+    return variant
+
+
+sprite_variants = SpriteVariants()
@@ -0,0 +1,430 @@
+"""
+Vectorized brawler environment for agent training: N Rumi-vs-demons matches stepped across worker processes.
+
+Each worker process owns a contiguous slice of the matches and runs real `GameSession`s headless. All
+per-step data lives in one `multiprocessing.shared_memory` block: the trainer writes button masks into
+`actions`, and workers write `observations`, `rewards`, `terminated`/`truncated` and finished-episode
+stats straight into it, so nothing is pickled per step. A step is one byte down each worker's pipe
+and one byte back. The arrays returned by `reset()` and `step()` are views of that block, valid
+until the next step; copy them to keep them.
+
+`step(actions)` is `step_async(actions)` followed by `step_wait()`; calling them separately lets the
+trainer work on the previous batch while the workers simulate. Finished matches reset automatically:
+their row of `observations` already holds the next episode's first observation, and
+`episode_return`/`episode_length` hold the finished episode's totals for rows where it ended.
+
+Rewards come from the session's own telemetry and particle hooks: hits landed, demons defeated,
+damage taken and the result of the run (see the REWARD_* constants).
+
+    python src/vector_env.py --envs 256 --workers 8 --seconds 10 [--async] [--scaling]
+"""
+
+import argparse
+import multiprocessing as mp
+import os
+import signal
+import time
+from multiprocessing.connection import Connection
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from brawler import (
+    DEMON_ATTACK_COOLDOWN,
+    DEMON_SPEED,
+    HEAVY_COOLDOWN,
+    HEIGHT,
+    JUMP_FORCE,
+    PLAYER_SPEED,
+    TICK_RATE,
+    WIDTH,
+    GameSession,
+)
+
+
+PLAYER_FEATURES = 9
+DEMON_FEATURES = 8
+SESSION_FEATURES = 2
+# Actions are INPUT_* button masks.
+NUM_ACTIONS = 32
+
+REWARD_CONNECT = 0.1
+REWARD_KILL = 1.0
+REWARD_DAMAGE_TAKEN = -0.02
+REWARD_WON = 5.0
+REWARD_LOST = -5.0
+
+_STEP = b"s"
+_RESET = b"r"
+_CLOSE = b"c"
+_DONE = b"k"
+
+
+def observation_size(max_demons: int) -> int:
+    return PLAYER_FEATURES + DEMON_FEATURES * max_demons + SESSION_FEATURES
+
+
+def _layout(num_envs: int, obs_size: int, num_workers: int) -> dict[str, tuple[int, tuple[int, ...], np.dtype]]:
+    """name -> (byte offset, shape, dtype) of each array in the shared block."""
+    fields = [
+        ("observations", (num_envs, obs_size), np.dtype(np.float32)),
+        ("rewards", (num_envs,), np.dtype(np.float32)),
+        ("episode_return", (num_envs,), np.dtype(np.float32)),
+        ("episode_length", (num_envs,), np.dtype(np.int32)),
+        ("worker_busy", (num_workers,), np.dtype(np.float64)),
+        ("actions", (num_envs,), np.dtype(np.uint8)),
+        ("terminated", (num_envs,), np.dtype(np.bool_)),
+        ("truncated", (num_envs,), np.dtype(np.bool_)),
+    ]
+    layout = {}
+    offset = 0
+    for name, shape, dtype in fields:
+        offset = -(-offset // 8) * 8
+        layout[name] = (offset, shape, dtype)
+        offset += int(np.prod(shape)) * dtype.itemsize
+    return layout
+
+
+def _block_size(layout: dict) -> int:
+    return max(offset + int(np.prod(shape)) * dtype.itemsize for offset, shape, dtype in layout.values())
+
+
+def _views(buffer: memoryview, layout: dict) -> dict[str, np.ndarray]:
+    return {name: np.ndarray(shape, dtype, buffer, offset) for name, (offset, shape, dtype) in layout.items()}
+
+
+class _Match:
+    """One match inside a worker: a GameSession plus the reward and episode bookkeeping around it."""
+
+    def __init__(self, index: int, num_envs: int, seed: int | None, max_demons: int, max_ticks: int, frame_skip: int):
+        self.index = index
+        self.num_envs = num_envs
+        self.seed = seed
+        self.max_ticks = max_ticks
+        self.frame_skip = frame_skip
+        self.session = GameSession(None if seed is None else seed + index)
+        self.session.max_simultaneous = max_demons
+        self.session.on_event = self._on_event
+        self.session.on_effect = self._on_effect
+        self.episode = 0
+        self.reward = 0.0
+        self.episode_return = 0.0
+        self.episode_length = 0
+
+    def _on_event(self, kind: str, value: float) -> None:
+        if kind == "kill":
+            self.reward += REWARD_KILL * value
+        elif kind == "hit_taken":
+            self.reward += REWARD_DAMAGE_TAKEN * value
+        elif kind == "won":
+            self.reward += REWARD_WON
+        elif kind == "lost":
+            self.reward += REWARD_LOST
+
+    def _on_effect(self, kind: str, x: float, y: float) -> None:
+        if kind == "connect":
+            self.reward += REWARD_CONNECT
+
+    def reset(self) -> None:
+        session = self.session
+        if self.episode and self.seed is not None:
+            # Episode e of match i plays seed + i + e * N, so no two episodes in the batch share a stream.
+            session.rng.seed(self.seed + self.index + self.episode * self.num_envs)
+        session.reset()
+        self.episode += 1
+        self.reward = 0.0
+        self.episode_return = 0.0
+        self.episode_length = 0
+
+    def step(self, buttons: int) -> tuple[float, bool, bool]:
+        session = self.session
+        for _ in range(self.frame_skip):
+            session.step(buttons)
+            if session.game_over:
+                break
+        reward, self.reward = self.reward, 0.0
+        self.episode_return += reward
+        self.episode_length += 1
+        terminated = session.game_over
+        return reward, terminated, not terminated and session.tick >= self.max_ticks
+
+    def observe(self, out: np.ndarray) -> None:
+        session = self.session
+        player = session.player
+        px, py = player.position
+        values = [
+            px / WIDTH,
+            py / HEIGHT,
+            player.velocity.x / PLAYER_SPEED,
+            player.velocity.y / -JUMP_FORCE,
+            player.health / 120,
+            player.direction,
+            player.on_ground,
+            player.attack_cooldown / HEAVY_COOLDOWN,
+            player.attacking > 0,
+        ]
+        # Nearest demons first; empty slots are zero (feature 0 is "present").
+        slots = (len(out) - PLAYER_FEATURES - SESSION_FEATURES) // DEMON_FEATURES
+        demons = sorted(session.demons, key=lambda d: abs(d.position.x - px))[:slots]
+        for demon in demons:
+            values += (
+                1.0,
+                (demon.position.x - px) / WIDTH,
+                (demon.position.y - py) / HEIGHT,
+                demon.velocity.x / DEMON_SPEED,
+                demon.health / 70,
+                demon.direction,
+                demon.attack_cooldown / DEMON_ATTACK_COOLDOWN,
+                demon.attacking > 0,
+            )
+        values += [0.0] * (DEMON_FEATURES * (slots - len(demons)))
+        values += (session.remaining / session.target, session.spawn_timer)
+        out[:] = values
+
+
+def _worker(
+    conn: Connection,
+    shm_name: str,
+    layout: dict,
+    worker: int,
+    lo: int,
+    hi: int,
+    num_envs: int,
+    seed: int | None,
+    max_demons: int,
+    max_ticks: int,
+    frame_skip: int,
+) -> None:
+    # The trainer process decides when to stop; Ctrl+C there should not kill workers mid-step.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    shm = SharedMemory(name=shm_name)
+    try:
+        arrays = _views(shm.buf, layout)
+        observations = arrays["observations"]
+        actions, rewards = arrays["actions"], arrays["rewards"]
+        terminated, truncated = arrays["terminated"], arrays["truncated"]
+        episode_return, episode_length = arrays["episode_return"], arrays["episode_length"]
+        busy = arrays["worker_busy"]
+        matches = [_Match(i, num_envs, seed, max_demons, max_ticks, frame_skip) for i in range(lo, hi)]
+        while True:
+            command = conn.recv_bytes()
+            start = time.perf_counter()
+            if command == _STEP:
+                for i, match in enumerate(matches, lo):
+                    reward, ended, cut = match.step(int(actions[i]))
+                    rewards[i] = reward
+                    terminated[i] = ended
+                    truncated[i] = cut
+                    if ended or cut:
+                        episode_return[i] = match.episode_return
+                        episode_length[i] = match.episode_length
+                        match.reset()
+                    match.observe(observations[i])
+            elif command == _RESET:
+                for i, match in enumerate(matches, lo):
+                    match.reset()
+                    match.observe(observations[i])
+            else:
+                break
+            busy[worker] += time.perf_counter() - start
+            conn.send_bytes(_DONE)
+        del arrays, observations, actions, rewards, terminated, truncated, episode_return, episode_length, busy
+    finally:
+        shm.close()
+
+
+class BrawlerVectorEnv:
+    """`num_envs` brawler matches spread over `num_workers` processes, with shared-memory buffers."""
+
+    def __init__(
+        self,
+        num_envs: int,
+        num_workers: int | None = None,
+        seed: int | None = None,
+        max_demons: int = 3,
+        frame_skip: int = 1,
+        max_ticks: int = TICK_RATE * 180,
+        start_method: str | None = None,
+    ):
+        num_workers = min(num_workers or os.cpu_count() or 1, num_envs)
+        self.num_envs = num_envs
+        self.num_workers = num_workers
+        self.frame_skip = frame_skip
+        self.observation_size = observation_size(max_demons)
+        self.steps = 0
+        self.closed = False
+        self._waiting = False
+        self._started = 0.0
+        self._step_start = 0.0
+        self._step_time = 0.0
+
+        layout = _layout(num_envs, self.observation_size, num_workers)
+        self._shm = SharedMemory(create=True, size=_block_size(layout))
+        arrays = _views(self._shm.buf, layout)
+        for array in arrays.values():
+            array.fill(0)
+        self._arrays = arrays
+        self.observations = arrays["observations"]
+        self.actions = arrays["actions"]
+        self.rewards = arrays["rewards"]
+        self.terminated = arrays["terminated"]
+        self.truncated = arrays["truncated"]
+        self.episode_return = arrays["episode_return"]
+        self.episode_length = arrays["episode_length"]
+        self._busy = arrays["worker_busy"]
+
+        context = mp.get_context(start_method)
+        bounds = np.linspace(0, num_envs, num_workers + 1).astype(int)
+        self._conns: list[Connection] = []
+        self._processes = []
+        for worker in range(num_workers):
+            parent, child = context.Pipe()
+            process = context.Process(
+                target=_worker,
+                args=(child, self._shm.name, layout, worker, int(bounds[worker]), int(bounds[worker + 1]),
+                      num_envs, seed, max_demons, max_ticks, frame_skip),
+                name=f"brawler-env-{worker}",
+                daemon=True,
+            )
+            process.start()
+            child.close()
+            self._conns.append(parent)
+            self._processes.append(process)
+
+    def __enter__(self) -> "BrawlerVectorEnv":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _broadcast(self, command: bytes) -> None:
+        for conn in self._conns:
+            conn.send_bytes(command)
+
+    def _gather(self) -> None:
+        for conn in self._conns:
+            if conn.recv_bytes() != _DONE:
+                raise RuntimeError("vector env worker sent an unexpected reply")
+
+    def reset(self) -> np.ndarray:
+        """Start a fresh episode in every match; returns the shared observation array."""
+        if self._waiting:
+            self.step_wait()
+        self._broadcast(_RESET)
+        self._gather()
+        self._started = time.perf_counter()
+        self._step_time = 0.0
+        self.steps = 0
+        self._busy[:] = 0.0
+        return self.observations
+
+    def step_async(self, actions: np.ndarray) -> None:
+        """Hand every match its button mask and start stepping; collect the result with `step_wait()`."""
+        if self._waiting:
+            raise RuntimeError("step_async called twice without step_wait")
+        self.actions[:] = actions
+        self._step_start = time.perf_counter()
+        self._broadcast(_STEP)
+        self._waiting = True
+
+    def step_wait(self) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, dict]:
+        self._gather()
+        self._waiting = False
+        self._step_time += time.perf_counter() - self._step_start
+        self.steps += self.num_envs
+        done = self.terminated | self.truncated
+        info = {"episode_return": self.episode_return, "episode_length": self.episode_length, "done": done}
+        return self.observations, self.rewards, self.terminated, self.truncated, info
+
+    def step(self, actions: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, dict]:
+        self.step_async(actions)
+        return self.step_wait()
+
+    def stats(self) -> dict:
+        """Aggregate throughput since the last `reset()`."""
+        elapsed = time.perf_counter() - self._started if self._started else 0.0
+        return {
+            "envs": self.num_envs,
+            "workers": self.num_workers,
+            "steps": self.steps,
+            "ticks": self.steps * self.frame_skip,
+            "seconds": elapsed,
+            "steps_per_second": self.steps / elapsed if elapsed else 0.0,
+            "seconds_in_step": self._step_time,
+            "worker_utilization": (self._busy / elapsed).tolist() if elapsed else [],
+        }
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        if self._waiting:
+            self._gather()
+        for conn in self._conns:
+            try:
+                conn.send_bytes(_CLOSE)
+            except OSError:
+                pass
+        for process in self._processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        for conn in self._conns:
+            conn.close()
+        # Views into the block must go before it can be closed.
+        self._arrays.clear()
+        self.observations = self.actions = self.rewards = self.terminated = self.truncated = None
+        self.episode_return = self.episode_length = self._busy = None
+        self._shm.close()
+        self._shm.unlink()
+
+
+def benchmark(num_envs: int, num_workers: int, seconds: float, use_async: bool, seed: int | None) -> dict:
+    """Random-button throughput of a vector env; with `use_async`, actions are drawn while workers step."""
+    rng = np.random.default_rng(seed)
+    episodes = 0
+    with BrawlerVectorEnv(num_envs, num_workers, seed=seed) as env:
+        env.reset()
+        actions = rng.integers(0, NUM_ACTIONS, num_envs, dtype=np.uint8)
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            if use_async:
+                env.step_async(actions)
+                actions = rng.integers(0, NUM_ACTIONS, num_envs, dtype=np.uint8)
+                _, _, _, _, info = env.step_wait()
+            else:
+                _, _, _, _, info = env.step(actions)
+                actions = rng.integers(0, NUM_ACTIONS, num_envs, dtype=np.uint8)
+            episodes += int(info["done"].sum())
+        stats = env.stats()
+    stats["episodes"] = episodes
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Throughput benchmark for the multi-process brawler vector env.")
+    parser.add_argument("--envs", type=int, default=64, help="matches stepped per call")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument("--seconds", type=float, default=5.0, help="how long to run each configuration")
+    parser.add_argument("--async", dest="use_async", action="store_true", help="draw the next actions while workers step")
+    parser.add_argument("--scaling", action="store_true", help="repeat with 1, 2, 4, ... workers up to --workers")
+    parser.add_argument("--seed", type=int, default=0, help="base seed; match i starts on seed + i")
+    args = parser.parse_args()
+
+    counts = [args.workers]
+    if args.scaling:
+        counts = sorted({min(1 << k, args.workers) for k in range(args.workers.bit_length() + 1)})
+    base = None
+    for workers in counts:
+        stats = benchmark(args.envs, workers, args.seconds, args.use_async, args.seed)
+        rate = stats["steps_per_second"]
+        base = base or rate
+        busy = stats["worker_utilization"]
+        print(
+            f"{stats['envs']} envs  {workers:3d} workers  {rate:10.0f} steps/s  x{rate / base:5.2f}"
+            f"  {stats['episodes']} episodes  worker busy {min(busy):.0%}-{max(busy):.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
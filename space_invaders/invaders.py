@@ -0,0 +1,450 @@
+"""
+Space Invaders simulation core: entities, rules and a headless `Game.step(action)`.
+Nothing here touches the display, so it runs without a window (see `vector.py` for the batched engine).
+"""
+
+import math
+import random
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+import pygame
+
+
+WIDTH, HEIGHT = 960, 640
+# Simulation ticks per second. Speeds are in pixels per tick and rates per tick, whatever the render rate.
+FPS = 60
+PLAYER_SPEED = 6
+BULLET_SPEED = 10
+ENEMY_ROWS = 5
+ENEMY_COLS = 10
+ENEMY_SPEED = 1.2
+ENEMY_DROP = 28
+ENEMY_FIRE_RATE = 0.008  # probability per tick
+PLAYER_COOLDOWN_MS = 260
+
+# Formation and entity geometry shared by the object and batched engines.
+FORMATION_X, FORMATION_Y = 120, 80
+FORMATION_GAP_X, FORMATION_GAP_Y = 64, 48
+ENEMY_W, ENEMY_H = 40, 28
+PLAYER_W, PLAYER_H = 48, 28
+PLAYER_Y = HEIGHT - 80
+BULLET_W, BULLET_H = 6, 14
+
+BG_COLOR = (10, 12, 24)
+PLAYER_COLOR = (100, 220, 140)
+ENEMY_COLORS = [(240, 104, 80), (240, 176, 90), (120, 190, 255)]
+BULLET_COLOR = (180, 220, 255)
+ENEMY_BULLET_COLOR = (255, 180, 70)
+TEXT_COLOR = (230, 232, 240)
+
+# Action bitmask accepted by Game.step and BatchedInvaders.step.
+ACTION_LEFT = 1
+ACTION_RIGHT = 2
+ACTION_FIRE = 4
+
+
+class BulletPool:
+    """Preallocated struct-of-arrays bullet storage.
+
+    Live bullets are packed into slots [0, count). Culling moves surviving bullets from the tail into the
+    holes (swap-with-last), so spawning and removal never allocate; capacity doubles if a wave outgrows it.
+    """
+
+    def __init__(self, capacity: int = 256) -> None:
+        self.x = np.zeros(capacity, np.int32)
+        self.y = np.zeros(capacity, np.int32)
+        self.speed = np.zeros(capacity, np.int32)
+        self.from_player = np.zeros(capacity, bool)
+        self.count = 0
+
+    @property
+    def capacity(self) -> int:
+        return len(self.x)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _fields(self) -> Tuple[np.ndarray, ...]:
+        return self.x, self.y, self.speed, self.from_player
+
+    def clear(self) -> None:
+        self.count = 0
+
+    def _grow(self) -> None:
+        self.x, self.y, self.speed, self.from_player = (np.resize(a, 2 * len(a)) for a in self._fields())
+
+    def spawn(self, x: int, y: int, speed: int, from_player: bool) -> None:
+        if self.count == self.capacity:
+            self._grow()
+        i = self.count
+        self.x[i] = x
+        self.y[i] = y
+        self.speed[i] = speed
+        self.from_player[i] = from_player
+        self.count += 1
+
+    def live(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        n = self.count
+        return self.x[:n], self.y[:n], self.from_player[:n]
+
+    def update(self) -> None:
+        n = self.count
+        self.y[:n] += self.speed[:n]
+
+    def cull(self, dead: np.ndarray) -> None:
+        """Drop the live bullets flagged in `dead`, filling holes with survivors from the tail."""
+        keep = self.count - int(dead.sum())
+        holes = np.flatnonzero(dead[:keep])
+        fillers = keep + np.flatnonzero(~dead[keep:])
+        for field in self._fields():
+            field[holes] = field[fillers]
+        self.count = keep
+
+    def load(self, x: np.ndarray, y: np.ndarray, speed: np.ndarray, from_player: np.ndarray) -> None:
+        n = len(x)
+        while n > self.capacity:
+            self._grow()
+        for field, values in zip(self._fields(), (x, y, speed, from_player)):
+            field[:n] = values
+        self.count = n
+
+
+class Player:
+    def __init__(self) -> None:
+        self.rect = pygame.Rect(WIDTH // 2 - PLAYER_W // 2, PLAYER_Y, PLAYER_W, PLAYER_H)
+        self.speed = PLAYER_SPEED
+        self.lives = 3
+        self.last_shot = -PLAYER_COOLDOWN_MS
+        # Position before the latest tick, for drawing between ticks.
+        self.prev_x = self.rect.x
+
+    def update(self, move: int) -> None:
+        self.prev_x = self.rect.x
+        dx = move * self.speed
+        self.rect.x = max(20, min(WIDTH - 20 - self.rect.width, self.rect.x + dx))
+
+    def can_shoot(self, now_ms: int) -> bool:
+        return now_ms - self.last_shot >= PLAYER_COOLDOWN_MS
+
+    def shoot(self, now_ms: int, bullets: BulletPool) -> None:
+        self.last_shot = now_ms
+        bullets.spawn(self.rect.centerx - BULLET_W // 2, self.rect.top - 12, -BULLET_SPEED, from_player=True)
+
+
+class Enemy:
+    def __init__(self, swarm: "Swarm", row: int, col: int, color: tuple) -> None:
+        self.swarm = swarm
+        self.row = row
+        self.col = col
+        self.color = color
+        self.alive = True
+
+    @property
+    def rect(self) -> pygame.Rect:
+        return pygame.Rect(self.swarm.cell_x(self.col), self.swarm.cell_y(self.row), ENEMY_W, ENEMY_H)
+
+    def draw(self, screen: pygame.Surface, dx: int = 0, dy: int = 0) -> None:
+        if not self.alive:
+            return
+        rect = self.rect.move(dx, dy)
+        pygame.draw.rect(screen, self.color, rect, border_radius=4)
+        eye_color = (20, 20, 24)
+        pygame.draw.rect(screen, eye_color, (rect.x + 8, rect.y + 8, 8, 6))
+        pygame.draw.rect(screen, eye_color, (rect.x + 24, rect.y + 8, 8, 6))
+
+
+class Swarm:
+    """Invader formation indexed by grid cell.
+
+    Enemies sit at fixed offsets from a moving origin, so hit tests map a rect straight to a cell and
+    the edges, per-column shooters and alive counts are kept up to date as enemies die instead of
+    being recomputed from the whole grid every frame.
+    """
+
+    def __init__(self, rows: int, cols: int, rng: Optional[random.Random] = None) -> None:
+        self.rows = rows
+        self.cols = cols
+        self.rng = rng or random.Random()
+        self.enemies: List[Enemy] = []
+        self.direction = 1
+        self.speed = ENEMY_SPEED
+        self._spawn_grid()
+
+    def _spawn_grid(self) -> None:
+        self.enemies.clear()
+        for row in range(self.rows):
+            color = ENEMY_COLORS[min(row, len(ENEMY_COLORS) - 1)]
+            for col in range(self.cols):
+                self.enemies.append(Enemy(self, row, col, color))
+        self.origin_x = FORMATION_X
+        self.origin_y = FORMATION_Y
+        self.prev_origin_x, self.prev_origin_y = self.origin_x, self.origin_y
+        self.direction = 1
+        self.speed = ENEMY_SPEED
+
+        self.alive_count = self.rows * self.cols
+        self.col_counts = [self.rows] * self.cols
+        self.row_counts = [self.cols] * self.rows
+        self.col_bottom = [self.rows - 1] * self.cols
+        self.live_cols = list(range(self.cols))
+        self.left_col = 0
+        self.right_col = self.cols - 1
+        self.bottom_row = self.rows - 1
+        self._alive_cache: Optional[List[Enemy]] = None
+
+    def cell_x(self, col: int) -> int:
+        return self.origin_x + col * FORMATION_GAP_X
+
+    def cell_y(self, row: int) -> int:
+        return self.origin_y + row * FORMATION_GAP_Y
+
+    @property
+    def bottom(self) -> int:
+        return self.cell_y(self.bottom_row) + ENEMY_H
+
+    def alive_enemies(self) -> List[Enemy]:
+        if self._alive_cache is None:
+            self._alive_cache = [e for e in self.enemies if e.alive]
+        return self._alive_cache
+
+    def enemy_at(self, row: int, col: int) -> Enemy:
+        return self.enemies[row * self.cols + col]
+
+    def hit_test(self, x: int, y: int, width: int, height: int) -> Optional[Enemy]:
+        """Return the live enemy overlapping a rect that is smaller than the gaps between cells."""
+        rel_x = x - self.cell_x(0)
+        col = (rel_x + width - 1) // FORMATION_GAP_X
+        if col < 0 or col >= self.cols or rel_x >= col * FORMATION_GAP_X + ENEMY_W:
+            return None
+        rel_y = y - self.origin_y
+        row = (rel_y + height - 1) // FORMATION_GAP_Y
+        if row < 0 or row >= self.rows or rel_y >= row * FORMATION_GAP_Y + ENEMY_H:
+            return None
+        enemy = self.enemy_at(row, col)
+        return enemy if enemy.alive else None
+
+    def kill(self, enemy: Enemy) -> None:
+        if not enemy.alive:
+            return
+        enemy.alive = False
+        self._alive_cache = None
+        self.alive_count -= 1
+        row, col = enemy.row, enemy.col
+        self.col_counts[col] -= 1
+        self.row_counts[row] -= 1
+
+        if self.col_counts[col] == 0:
+            self.col_bottom[col] = -1
+            self.live_cols.remove(col)
+        elif self.col_bottom[col] == row:
+            while not self.enemy_at(self.col_bottom[col], col).alive:
+                self.col_bottom[col] -= 1
+
+        if not self.alive_count:
+            return
+        while self.col_counts[self.left_col] == 0:
+            self.left_col += 1
+        while self.col_counts[self.right_col] == 0:
+            self.right_col -= 1
+        while self.row_counts[self.bottom_row] == 0:
+            self.bottom_row -= 1
+
+    def update(self) -> None:
+        self.prev_origin_x, self.prev_origin_y = self.origin_x, self.origin_y
+        if not self.alive_count:
+            return
+
+        dx = self.direction * self.speed
+        left_edge = self.cell_x(self.left_col)
+        right_edge = self.cell_x(self.right_col) + ENEMY_W
+
+        if left_edge + dx < 20 or right_edge + dx > WIDTH - 20:
+            self.direction *= -1
+            dx = self.direction * self.speed
+            self.origin_y += ENEMY_DROP
+
+        # The formation moves in whole pixels, rounding each step as pygame rounds a float Rect move.
+        self.origin_x += math.floor(dx + 0.5)
+
+    def maybe_fire(self, bullets: BulletPool) -> bool:
+        if not self.alive_count:
+            return False
+        if self.rng.random() < ENEMY_FIRE_RATE:
+            col = self.rng.choice(self.live_cols)
+            shooter = self.enemy_at(self.col_bottom[col], col).rect
+            bullets.spawn(shooter.centerx - BULLET_W // 2, shooter.bottom, BULLET_SPEED - 2, from_player=False)
+            return True
+        return False
+
+
+class Game:
+    """One Space Invaders run, advanced a tick at a time with `step(action)`.
+
+    All randomness comes from the game's own seeded RNG, so the same seed and action sequence
+    always replay the same run.
+    """
+
+    def __init__(self, seed: Optional[int] = None, rows: int = ENEMY_ROWS, cols: int = ENEMY_COLS) -> None:
+        self.rng = random.Random(seed)
+        self.rows = rows
+        self.cols = cols
+        self.bullets = BulletPool()
+        # Profiling hook, called with a phase name at each phase boundary of `step`.
+        self.on_phase: Optional[Callable[[str], None]] = None
+        # Telemetry hook, called with an event kind and value (kills, hits taken, speed ramps, results).
+        self.on_event: Optional[Callable[[str, float], None]] = None
+        # Particle hook, called with an effect kind and position ("kill", "player_hit").
+        self.on_effect: Optional[Callable[[str, float, float], None]] = None
+        self.reset()
+
+    def reset(self) -> None:
+        self.player = Player()
+        self.swarm = Swarm(self.rows, self.cols, self.rng)
+        self.bullets.clear()
+        self.score = 0
+        self.frame = 0
+        self.game_over = False
+        self.player_won = False
+
+    @property
+    def now_ms(self) -> int:
+        return self.frame * 1000 // FPS
+
+    def step(self, action: int) -> int:
+        """Advance one tick using an ACTION_* bitmask; returns the points scored this tick."""
+        if self.game_over:
+            return 0
+
+        self.frame += 1
+        now = self.now_ms
+        player, swarm, bullets = self.player, self.swarm, self.bullets
+        scored = hits = 0
+
+        move = (1 if action & ACTION_RIGHT else 0) - (1 if action & ACTION_LEFT else 0)
+        player.update(move)
+
+        if action & ACTION_FIRE and player.can_shoot(now):
+            player.shoot(now, bullets)
+
+        swarm.update()
+        swarm.maybe_fire(bullets)
+        if self.on_phase:
+            self.on_phase("ai")
+
+        bullets.update()
+        if self.on_phase:
+            self.on_phase("physics")
+        if bullets.count:
+            xs, ys, from_player = bullets.live()
+            dead = (ys + BULLET_H < 0) | (ys > HEIGHT)
+
+            for i in np.flatnonzero(from_player & ~dead).tolist():
+                enemy = swarm.hit_test(int(xs[i]), int(ys[i]), BULLET_W, BULLET_H)
+                if enemy:
+                    swarm.kill(enemy)
+                    dead[i] = True
+                    if self.on_effect:
+                        self.on_effect(
+                            "kill", swarm.cell_x(enemy.col) + ENEMY_W / 2, swarm.cell_y(enemy.row) + ENEMY_H / 2
+                        )
+                    scored += 10
+                    swarm.speed = min(3.5, swarm.speed + 0.05)
+
+            px, py = player.rect.x, player.rect.y
+            struck = (
+                ~from_player & ~dead
+                & (xs < px + PLAYER_W) & (xs + BULLET_W > px)
+                & (ys < py + PLAYER_H) & (ys + BULLET_H > py)
+            )
+            hits = int(struck.sum())
+            if hits:
+                dead |= struck
+                player.lives -= hits
+                if self.on_effect:
+                    for x, y in zip(xs[struck].tolist(), ys[struck].tolist()):
+                        self.on_effect("player_hit", x + BULLET_W / 2, y + BULLET_H)
+                if player.lives <= 0:
+                    self.game_over = True
+                    self.player_won = False
+
+            if dead.any():
+                bullets.cull(dead)
+
+        # Touching the player needs the bottom row past the player's top, so one edge test covers both.
+        if swarm.alive_count and swarm.bottom >= PLAYER_Y:
+            self.game_over = True
+            self.player_won = False
+
+        if not swarm.alive_count:
+            self.game_over = True
+            self.player_won = True
+
+        self.score += scored
+        if self.on_event:
+            if scored:
+                self.on_event("kill", scored // 10)
+                self.on_event("swarm_speed", swarm.speed)
+            if hits:
+                self.on_event("hit_taken", hits)
+            if self.game_over:
+                self.on_event("won" if self.player_won else "lost", 1)
+                self.on_event("score", self.score)
+        if self.on_phase:
+            self.on_phase("hits")
+        return scored
+
+    def snapshot(self) -> tuple:
+        """Plain-data copy of the run, including the RNG state."""
+        player, swarm = self.player, self.swarm
+        n = self.bullets.count
+        return (
+            self.frame,
+            self.score,
+            self.game_over,
+            self.player_won,
+            player.rect.x,
+            player.lives,
+            player.last_shot,
+            swarm.origin_x,
+            swarm.origin_y,
+            swarm.direction,
+            swarm.speed,
+            bytes(enemy.alive for enemy in swarm.enemies),
+            tuple(field[:n].tobytes() for field in self.bullets._fields()),
+            self.rng.getstate(),
+        )
+
+    def restore(self, state: tuple) -> None:
+        (
+            self.frame,
+            self.score,
+            self.game_over,
+            self.player_won,
+            player_x,
+            lives,
+            last_shot,
+            origin_x,
+            origin_y,
+            direction,
+            speed,
+            alive,
+            bullets,
+            rng_state,
+        ) = state
+        self.player = Player()
+        self.player.rect.x = self.player.prev_x = player_x
+        self.player.lives = lives
+        self.player.last_shot = last_shot
+
+        swarm = Swarm(self.rows, self.cols, self.rng)
+        for enemy, is_alive in zip(swarm.enemies, alive):
+            if not is_alive:
+                swarm.kill(enemy)
+        swarm.origin_x, swarm.origin_y = swarm.prev_origin_x, swarm.prev_origin_y = origin_x, origin_y
+        swarm.direction, swarm.speed = direction, speed
+        self.swarm = swarm
+
+        dtypes = [field.dtype for field in self.bullets._fields()]
+        self.bullets.load(*(np.frombuffer(raw, dtype) for raw, dtype in zip(bullets, dtypes)))
+        self.rng.setstate(rng_state)
@@ -1,269 +1,254 @@
 """
 Space Invaders (Python/Pygame)
 Quick-launch: python -m venv .venv && source .venv/bin/activate && pip install -r requirements.txt && python main.py
-Controls: Arrow keys or A/D to move, Space to shoot, R to restart, Esc to quit.
+Controls: Arrow keys or A/D to move, Space to shoot, R to restart, F3 for the frame-time overlay, Esc to quit.
 """
 
+import argparse
+import os
 import random
 import sys
-from dataclasses import dataclass
-from typing import List, Optional
+from pathlib import Path
+from typing import Optional
 
-import pygame
-
-
-WIDTH, HEIGHT = 960, 640
-FPS = 60
-PLAYER_SPEED = 6
-BULLET_SPEED = 10
-ENEMY_ROWS = 5
-ENEMY_COLS = 10
-ENEMY_SPEED = 1.2
-ENEMY_DROP = 28
-ENEMY_FIRE_RATE = 0.008  # probability per frame
-PLAYER_COOLDOWN_MS = 260
-
-BG_COLOR = (10, 12, 24)
-PLAYER_COLOR = (100, 220, 140)
-ENEMY_COLORS = [(240, 104, 80), (240, 176, 90), (120, 190, 255)]
-BULLET_COLOR = (180, 220, 255)
-ENEMY_BULLET_COLOR = (255, 180, 70)
-TEXT_COLOR = (230, 232, 240)
-
-
-@dataclass
-class Bullet:
-    rect: pygame.Rect
-    speed: int
-    color: tuple
-    from_player: bool
-
-    def update(self) -> None:
-        self.rect.y += self.speed
-
-    @property
-    def off_screen(self) -> bool:
-        return self.rect.bottom < 0 or self.rect.top > HEIGHT
-
-
-class Player:
-    def __init__(self) -> None:
-        self.rect = pygame.Rect(WIDTH // 2 - 24, HEIGHT - 80, 48, 28)
-        self.speed = PLAYER_SPEED
-        self.lives = 3
-        self.last_shot = 0
-
-    def update(self, keys: pygame.key.ScancodeWrapper) -> None:
-        dx = 0
-        if keys[pygame.K_LEFT] or keys[pygame.K_a]:
-            dx -= self.speed
-        if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
-            dx += self.speed
-        self.rect.x = max(20, min(WIDTH - 20 - self.rect.width, self.rect.x + dx))
-
-    def can_shoot(self, now_ms: int) -> bool:
-        return now_ms - self.last_shot >= PLAYER_COOLDOWN_MS
-
-    def shoot(self, now_ms: int) -> Bullet:
-        self.last_shot = now_ms
-        bullet_rect = pygame.Rect(self.rect.centerx - 3, self.rect.top - 12, 6, 14)
-        return Bullet(bullet_rect, -BULLET_SPEED, BULLET_COLOR, from_player=True)
-
-
-class Enemy:
-    def __init__(self, x: int, y: int, color: tuple) -> None:
-        self.rect = pygame.Rect(x, y, 40, 28)
-        self.color = color
-        self.alive = True
-
-    def draw(self, screen: pygame.Surface) -> None:
-        if not self.alive:
-            return
-        pygame.draw.rect(screen, self.color, self.rect, border_radius=4)
-        eye_color = (20, 20, 24)
-        pygame.draw.rect(screen, eye_color, (self.rect.x + 8, self.rect.y + 8, 8, 6))
-        pygame.draw.rect(screen, eye_color, (self.rect.x + 24, self.rect.y + 8, 8, 6))
-
-
-class Swarm:
-    def __init__(self, rows: int, cols: int) -> None:
-        self.rows = rows
-        self.cols = cols
-        self.enemies: List[Enemy] = []
-        self.direction = 1
-        self.speed = ENEMY_SPEED
-        self._spawn_grid()
-
-    def _spawn_grid(self) -> None:
-        self.enemies.clear()
-        start_x, start_y = 120, 80
-        gap_x, gap_y = 64, 48
-        for row in range(self.rows):
-            color = ENEMY_COLORS[min(row, len(ENEMY_COLORS) - 1)]
-            for col in range(self.cols):
-                x = start_x + col * gap_x
-                y = start_y + row * gap_y
-                self.enemies.append(Enemy(x, y, color))
-        self.direction = 1
-        self.speed = ENEMY_SPEED
-
-    def alive_enemies(self) -> List[Enemy]:
-        return [e for e in self.enemies if e.alive]
-
-    def update(self) -> None:
-        alive = self.alive_enemies()
-        if not alive:
-            return
-
-        dx = self.direction * self.speed
-        left_edge = min(e.rect.left for e in alive)
-        right_edge = max(e.rect.right for e in alive)
-        move_down = False
-
-        if left_edge + dx < 20 or right_edge + dx > WIDTH - 20:
-            self.direction *= -1
-            dx = self.direction * self.speed
-            move_down = True
-
-        for enemy in alive:
-            enemy.rect.x += dx
-            if move_down:
-                enemy.rect.y += ENEMY_DROP
-
-    def maybe_fire(self) -> Optional[Bullet]:
-        alive = self.alive_enemies()
-        if not alive:
-            return None
-        if random.random() < ENEMY_FIRE_RATE:
-            shooter = random.choice(alive)
-            rect = pygame.Rect(shooter.rect.centerx - 3, shooter.rect.bottom, 6, 14)
-            return Bullet(rect, BULLET_SPEED - 2, ENEMY_BULLET_COLOR, from_player=False)
-        return None
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
 
+# Imported ahead of pygame so the startup report's import time includes it.
+from common.startup import import_pygame, init_pygame, startup, system_font
 
-def draw_hud(screen: pygame.Surface, font: pygame.font.Font, score: int, lives: int) -> None:
-    score_text = font.render(f"Score: {score}", True, TEXT_COLOR)
-    lives_text = font.render(f"Lives: {lives}", True, TEXT_COLOR)
-    screen.blit(score_text, (20, 14))
-    screen.blit(lives_text, (WIDTH - lives_text.get_width() - 20, 14))
-
-
-def draw_overlay(screen: pygame.Surface, title: str, subtitle: str, font: pygame.font.Font) -> None:
-    overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-    overlay.fill((0, 0, 0, 180))
-    screen.blit(overlay, (0, 0))
-
-    title_surf = font.render(title, True, TEXT_COLOR)
-    subtitle_surf = font.render(subtitle, True, TEXT_COLOR)
-    screen.blit(title_surf, (WIDTH // 2 - title_surf.get_width() // 2, HEIGHT // 2 - 20))
-    screen.blit(subtitle_surf, (WIDTH // 2 - subtitle_surf.get_width() // 2, HEIGHT // 2 + 12))
-
-
-def reset_game() -> tuple:
-    player = Player()
-    swarm = Swarm(ENEMY_ROWS, ENEMY_COLS)
-    bullets: List[Bullet] = []
-    score = 0
-    return player, swarm, bullets, score
-
+import_pygame()
+import pygame
 
-def run() -> None:
-    pygame.init()
-    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+from common.inputs import InputQueue
+from common.pipeline import SimulationThread
+from common.profiler import FrameProfiler
+from common.replay import Replay, ReplayPlayer, ReplayRecorder, parse_seed
+from common.timestep import FixedTimestep, open_window
+from invaders import ACTION_FIRE, ACTION_LEFT, ACTION_RIGHT, FPS, HEIGHT, WIDTH, Game
+from render import LegacyRenderer, SpriteRenderer
+
+
+KEYMAP = {
+    pygame.K_LEFT: ACTION_LEFT,
+    pygame.K_a: ACTION_LEFT,
+    pygame.K_RIGHT: ACTION_RIGHT,
+    pygame.K_d: ACTION_RIGHT,
+    pygame.K_SPACE: ACTION_FIRE,
+}
+
+
+def run(
+    legacy_render: bool = False,
+    seed: Optional[int] = None,
+    record: Optional[Path] = None,
+    replay: Optional[Path] = None,
+    start_tick: int = 0,
+    profile: bool = False,
+    trace: Optional[Path] = None,
+    vsync: bool = False,
+    max_fps: int = 0,
+    telemetry_dir: Optional[Path] = None,
+    particles: bool = True,
+    pipelined: bool = False,
+    handoff_depth: int = 2,
+    input_latency: bool = False,
+    startup_report: bool = False,
+    quit_after_first_frame: bool = False,
+) -> None:
+    startup.mark("imports")
+    init_pygame()
+    screen = open_window((WIDTH, HEIGHT), vsync)
     pygame.display.set_caption("Space Invaders (Python)")
     clock = pygame.time.Clock()
-    font = pygame.font.SysFont("arial", 20)
-
-    player, swarm, bullets, score = reset_game()
-    game_over = False
-    player_won = False
-
+    startup.mark("init")
+    font = system_font("arial", 20)
+    renderer = LegacyRenderer(screen, font) if legacy_render else SpriteRenderer(screen, font)
+
+    recorder: Optional[ReplayRecorder] = None
+    playback: Optional[ReplayPlayer] = None
+    if replay:
+        loaded = Replay.load(replay)
+        if loaded.game != "invaders":
+            raise SystemExit(f"{replay} is a {loaded.game} replay")
+        game = Game(loaded.seed)
+        playback = ReplayPlayer(loaded, game)
+        playback.seek(start_tick)
+    else:
+        if record and seed is None:
+            seed = random.randrange(2**63)
+        game = Game(seed)
+        if record:
+            recorder = ReplayRecorder("invaders", seed, game)
+
+    # Pipelined, the game ticks on its own thread and frames draw `view`, a copy restored from its snapshots.
+    sim_thread: Optional[SimulationThread] = None
+    view = game
+    if pipelined:
+        view = Game()
+
+    telemetry = None
+    if telemetry_dir and not playback:
+        # Imported here so launches without telemetry skip its start-up cost.
+        from common.telemetry import Telemetry, attach
+
+        telemetry = Telemetry(telemetry_dir, "invaders")
+        attach(telemetry, game)
+        telemetry.emit("start", 1)
+
+    profiler = FrameProfiler(trace=trace is not None)
+    # Phase marks must come from one thread, so a pipelined game's own phases are not profiled.
+    if pipelined:
+        profiler.attach(renderer)
+    else:
+        profiler.attach(game, renderer)
+    profiler.set_enabled(profile or trace is not None)
+    if profile:
+        renderer.overlay = profiler.draw_overlay
+
+    inputs = InputQueue(KEYMAP)
+
+    def tick() -> None:
+        nonlocal recorder
+        if playback:
+            playback.advance()
+            return
+        action = inputs.next_tick()
+        game.step(action)
+        if recorder:
+            recorder.record(action)
+            if game.game_over:
+                # Only the first run is recorded; later retries play on unrecorded.
+                recorder.save(record)
+                recorder = None
+
+    def quit_game() -> None:
+        if sim_thread:
+            sim_thread.stop()
+            print(sim_thread.summary())
+        if recorder:
+            recorder.save(record)
+        if telemetry:
+            telemetry.close()
+        if input_latency:
+            print(inputs.summary())
+        if profiler.enabled:
+            print(profiler.summary())
+        if trace:
+            profiler.save_trace(trace)
+        pygame.quit()
+        sys.exit()
+
+    if pipelined:
+        sim_thread = SimulationThread(game, FPS, tick, depth=handoff_depth)
+        if particles:
+            game.on_effect = sim_thread.on_effect
+        sim_thread.start()
+    elif particles:
+        game.on_effect = renderer.on_effect
+    startup.mark("load")
+
+    # The game ticks FPS times a second however fast frames are drawn; frames in between are interpolated.
+    timestep = FixedTimestep(FPS)
     while True:
-        _ = clock.tick(FPS)
-        now = pygame.time.get_ticks()
-
-        for event in pygame.event.get():
+        clock.tick(max_fps)
+        if telemetry:
+            telemetry.frame()
+        if sim_thread:
+            sim_thread.begin_frame()
+        profiler.begin_frame()
+
+        events = pygame.event.get()
+        for event in events:
             if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
+                quit_game()
+            if event.type == pygame.WINDOWEXPOSED:
+                renderer.invalidate()
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
-                    pygame.quit()
-                    sys.exit()
-                if event.key == pygame.K_r and game_over:
-                    player, swarm, bullets, score = reset_game()
-                    game_over = False
-                    player_won = False
-
-        keys = pygame.key.get_pressed()
-
-        if not game_over:
-            player.update(keys)
-
-            if keys[pygame.K_SPACE] and player.can_shoot(now):
-                bullets.append(player.shoot(now))
-
-            swarm.update()
-            enemy_bullet = swarm.maybe_fire()
-            if enemy_bullet:
-                bullets.append(enemy_bullet)
-
-            for bullet in bullets[:]:
-                bullet.update()
-                if bullet.off_screen:
-                    bullets.remove(bullet)
-                    continue
-
-                if bullet.from_player:
-                    for enemy in swarm.alive_enemies():
-                        if enemy.rect.colliderect(bullet.rect):
-                            enemy.alive = False
-                            bullets.remove(bullet)
-                            score += 10
-                            swarm.speed = min(3.5, swarm.speed + 0.05)
-                            break
-                else:
-                    if bullet.rect.colliderect(player.rect):
-                        bullets.remove(bullet)
-                        player.lives -= 1
-                        if player.lives <= 0:
-                            game_over = True
-                            player_won = False
-
-            for enemy in swarm.alive_enemies():
-                if enemy.rect.colliderect(player.rect) or enemy.rect.bottom >= HEIGHT - 80:
-                    game_over = True
-                    player_won = False
-                    break
-
-            if not swarm.alive_enemies():
-                game_over = True
-                player_won = True
-
-        screen.fill(BG_COLOR)
-
-        pygame.draw.rect(screen, PLAYER_COLOR, player.rect, border_radius=5)
-        pygame.draw.rect(
-            screen,
-            (70, 160, 110),
-            (player.rect.x + 10, player.rect.y + 6, player.rect.width - 20, 6),
-        )
-
-        for enemy in swarm.alive_enemies():
-            enemy.draw(screen)
-
-        for bullet in bullets:
-            pygame.draw.rect(screen, bullet.color, bullet.rect, border_radius=3)
-
-        draw_hud(screen, font, score, player.lives)
-
-        if game_over:
-            title = "You Win!" if player_won else "Game Over"
-            subtitle = "Press R to restart or Esc to quit"
-            draw_overlay(screen, title, subtitle, font)
-
-        pygame.display.flip()
+                    quit_game()
+                if event.key == pygame.K_r and view.game_over and not playback:
+                    if sim_thread:
+                        sim_thread.submit(game.reset)
+                    else:
+                        game.reset()
+                    renderer.particles.clear()
+                    if telemetry:
+                        telemetry.emit("start", 1)
+                if event.key == pygame.K_F3:
+                    renderer.overlay = None if renderer.overlay else profiler.draw_overlay
+                    profiler.set_enabled(bool(renderer.overlay) or trace is not None)
+                    renderer.invalidate()
+
+        if not playback:
+            inputs.pump(events)
+        profiler.mark("input")
+        if sim_thread:
+            sim_thread.sync(view, renderer.on_effect)
+            renderer.particles.update(sim_thread.frame_dt)
+            renderer.draw(view)
+        else:
+            for _ in range(timestep.advance()):
+                tick()
+            renderer.particles.update(timestep.frame_dt)
+            renderer.draw(game, timestep.alpha)
+        inputs.presented()
+        profiler.mark("flip")
+        profiler.end_frame()
+        if sim_thread:
+            sim_thread.end_frame()
+        if "first frame" not in startup.phases:
+            startup.mark("first frame")
+            if startup_report:
+                print(startup.report())
+            if quit_after_first_frame:
+                quit_game()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Space Invaders (Python/Pygame)")
+    parser.add_argument("--legacy-render", action="store_true", help="full-screen redraw every frame instead of dirty rects")
+    parser.add_argument("--seed", type=parse_seed, help="seed the game's RNG for a reproducible run")
+    parser.add_argument("--record", type=Path, help="write a replay of the first run to this file")
+    parser.add_argument("--replay", type=Path, help="watch a recorded replay instead of playing")
+    parser.add_argument("--start-tick", type=int, default=0, help="with --replay, jump to this tick first")
+    parser.add_argument("--profile", action="store_true", help="time each frame phase and show the frame-time overlay")
+    parser.add_argument("--trace", type=Path, help="write per-phase timings as Chrome trace JSON on exit")
+    parser.add_argument("--vsync", action="store_true", help="pace frames to the display refresh")
+    parser.add_argument("--max-fps", type=int, default=0, help="cap the render rate (default: uncapped)")
+    parser.add_argument(
+        "--telemetry",
+        type=Path,
+        default=os.environ.get("GAMES_TELEMETRY_DIR"),
+        help="write gameplay telemetry to this directory (default: $GAMES_TELEMETRY_DIR)",
+    )
+    parser.add_argument("--pipelined", action="store_true", help="tick the game on its own thread while the main thread draws")
+    parser.add_argument("--handoff-depth", type=int, default=2, help="with --pipelined, states buffered between the threads (2 or 3)")
+    parser.add_argument("--no-particles", action="store_true", help="turn off explosion and hit-spark particles")
+    parser.add_argument("--input-latency", action="store_true", help="print input-to-tick and input-to-flip latency histograms on exit")
+    parser.add_argument("--startup-report", action="store_true", help="print import, init, load and first-frame times")
+    parser.add_argument("--quit-after-first-frame", action="store_true", help="exit once the first frame is up (cold-start timing)")
+    return parser.parse_args()
 
 
 if __name__ == "__main__":
-    run()
+    args = parse_args()
+    run(
+        legacy_render=args.legacy_render,
+        seed=args.seed,
+        record=args.record,
+        replay=args.replay,
+        start_tick=args.start_tick,
+        profile=args.profile,
+        trace=args.trace,
+        vsync=args.vsync,
+        max_fps=args.max_fps,
+        telemetry_dir=args.telemetry,
+        particles=not args.no_particles,
+        pipelined=args.pipelined,
+        handoff_depth=args.handoff_depth,
+        input_latency=args.input_latency,
+        startup_report=args.startup_report,
+        quit_after_first_frame=args.quit_after_first_frame,
+    )
@@ -0,0 +1,241 @@
+"""
+Space Invaders renderers.
+`SpriteRenderer` blits pre-baked sprites and pushes only changed regions to the display;
+`LegacyRenderer` keeps the original full-redraw path around for comparison.
+"""
+
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pygame
+
+from common.particles import ParticleSystem
+from common.render_cache import shared_cache
+from common.timestep import lerp
+from invaders import (
+    BG_COLOR,
+    BULLET_COLOR,
+    BULLET_H,
+    BULLET_W,
+    ENEMY_BULLET_COLOR,
+    ENEMY_COLORS,
+    ENEMY_H,
+    ENEMY_W,
+    FORMATION_GAP_X,
+    FORMATION_GAP_Y,
+    HEIGHT,
+    PLAYER_COLOR,
+    PLAYER_H,
+    PLAYER_W,
+    TEXT_COLOR,
+    WIDTH,
+    Game,
+)
+
+
+PLAYER_STRIPE_COLOR = (70, 160, 110)
+EYE_COLOR = (20, 20, 24)
+EXPLOSION_COLORS = ((255, 210, 110), (255, 120, 60), (250, 250, 250))
+PLAYER_HIT_COLOR = (120, 255, 170)
+
+
+def draw_player(surface: pygame.Surface, rect: pygame.Rect) -> None:
+    pygame.draw.rect(surface, PLAYER_COLOR, rect, border_radius=5)
+    pygame.draw.rect(surface, PLAYER_STRIPE_COLOR, (rect.x + 10, rect.y + 6, rect.width - 20, 6))
+
+
+def hud_blits(font: pygame.font.Font, score: int, lives: int) -> List[Tuple[pygame.Surface, Tuple[int, int]]]:
+    score_text = shared_cache.text(font, f"Score: {score}", TEXT_COLOR)
+    lives_text = shared_cache.text(font, f"Lives: {lives}", TEXT_COLOR)
+    return [(score_text, (20, 14)), (lives_text, (WIDTH - lives_text.get_width() - 20, 14))]
+
+
+def draw_hud(screen: pygame.Surface, font: pygame.font.Font, score: int, lives: int) -> List[pygame.Rect]:
+    return screen.blits(hud_blits(font, score, lives))
+
+
+def draw_overlay(screen: pygame.Surface, title: str, subtitle: str, font: pygame.font.Font) -> None:
+    screen.blit(shared_cache.fill((WIDTH, HEIGHT), (0, 0, 0, 180)), (0, 0))
+
+    title_surf = shared_cache.text(font, title, TEXT_COLOR)
+    subtitle_surf = shared_cache.text(font, subtitle, TEXT_COLOR)
+    screen.blit(title_surf, (WIDTH // 2 - title_surf.get_width() // 2, HEIGHT // 2 - 20))
+    screen.blit(subtitle_surf, (WIDTH // 2 - subtitle_surf.get_width() // 2, HEIGHT // 2 + 12))
+
+
+# Debug overlays draw on top of a finished frame and return the area they covered.
+Overlay = Callable[[pygame.Surface], pygame.Rect]
+
+
+def interpolated(game: Game, alpha: float) -> Tuple[int, int, int, List[int]]:
+    """Player x, swarm origin and bullet ys drawn `alpha` of the way from the previous tick to the latest."""
+    player, swarm, bullets = game.player, game.swarm, game.bullets
+    player_x = int(lerp(player.prev_x, player.rect.x, alpha))
+    origin_x = int(lerp(swarm.prev_origin_x, swarm.origin_x, alpha))
+    origin_y = int(lerp(swarm.prev_origin_y, swarm.origin_y, alpha))
+    n = bullets.count
+    ys = (bullets.y[:n] - bullets.speed[:n] * (1.0 - alpha)).astype(int).tolist()
+    return player_x, origin_x, origin_y, ys
+
+
+def emit_effect(particles: ParticleSystem, kind: str, x: float, y: float) -> None:
+    """`Game.on_effect` target: an explosion where an invader died, green sparks where the ship was hit."""
+    if kind == "kill":
+        for color in EXPLOSION_COLORS:
+            particles.burst(x, y, 40, color, speed=(40.0, 260.0), life=(0.2, 0.55))
+    elif kind == "player_hit":
+        particles.burst(x, y, 90, PLAYER_HIT_COLOR, speed=(60.0, 340.0), life=(0.3, 0.8), direction=-np.pi / 2, spread=np.pi)
+
+
+def draw_game_over(screen: pygame.Surface, game: Game, font: pygame.font.Font) -> None:
+    title = "You Win!" if game.player_won else "Game Over"
+    subtitle = "Press R to restart or Esc to quit"
+    draw_overlay(screen, title, subtitle, font)
+
+
+class SpriteAtlas:
+    """Every invader color variant, the ship and both bullet kinds baked once into display-format surfaces."""
+
+    def __init__(self) -> None:
+        self.enemies: Dict[tuple, pygame.Surface] = {}
+        for color in ENEMY_COLORS:
+            surf = pygame.Surface((ENEMY_W, ENEMY_H), pygame.SRCALPHA)
+            pygame.draw.rect(surf, color, surf.get_rect(), border_radius=4)
+            pygame.draw.rect(surf, EYE_COLOR, (8, 8, 8, 6))
+            pygame.draw.rect(surf, EYE_COLOR, (24, 8, 8, 6))
+            self.enemies[color] = surf.convert_alpha()
+
+        player = pygame.Surface((PLAYER_W, PLAYER_H), pygame.SRCALPHA)
+        draw_player(player, player.get_rect())
+        self.player = player.convert_alpha()
+
+        self.bullets: Dict[bool, pygame.Surface] = {}
+        for from_player, color in ((True, BULLET_COLOR), (False, ENEMY_BULLET_COLOR)):
+            surf = pygame.Surface((BULLET_W, BULLET_H), pygame.SRCALPHA)
+            pygame.draw.rect(surf, color, surf.get_rect(), border_radius=3)
+            self.bullets[from_player] = surf.convert_alpha()
+
+
+class SpriteRenderer:
+    """Dirty-rect renderer: erase last frame's sprites, blit this frame's in one batch, update only those regions."""
+
+    def __init__(self, screen: pygame.Surface, font: pygame.font.Font) -> None:
+        self.screen = screen
+        self.font = font
+        self.atlas = SpriteAtlas()
+        self.background = pygame.Surface(screen.get_size()).convert()
+        self.background.fill(BG_COLOR)
+        self._dirty: List[pygame.Rect] = []
+        self._overlay_shown = False
+        self._needs_full = True
+        self.particles = ParticleSystem(gravity=400.0)
+        self.on_phase: Optional[Callable[[str], None]] = None
+        self.overlay: Optional[Overlay] = None
+
+    def on_effect(self, kind: str, x: float, y: float) -> None:
+        emit_effect(self.particles, kind, x, y)
+
+    def invalidate(self) -> None:
+        self._needs_full = True
+        self._overlay_shown = False
+
+    def draw(self, game: Game, alpha: float = 1.0) -> None:
+        """Draw `game` as it looks `alpha` of the way from its previous tick to its latest one."""
+        screen = self.screen
+        if game.game_over:
+            # The overlay covers the whole playfield and nothing moves underneath it, so draw it once.
+            if not self._overlay_shown:
+                self._draw_scene(game, True, 1.0)
+                draw_game_over(screen, game, self.font)
+                pygame.display.flip()
+                self._overlay_shown = True
+                self._needs_full = True
+            elif self.overlay:
+                pygame.display.update(self.overlay(screen))
+            return
+        self._overlay_shown = False
+
+        full = self._needs_full
+        rects = self._draw_scene(game, full, alpha)
+        if self.on_phase:
+            self.on_phase("draw")
+        if self.overlay:
+            rects.append(self.overlay(screen))
+            if self.on_phase:
+                self.on_phase("overlay")
+        if full:
+            pygame.display.flip()
+            self._needs_full = False
+        else:
+            pygame.display.update(self._dirty + rects)
+        self._dirty = rects
+
+    def _draw_scene(self, game: Game, full: bool, alpha: float) -> List[pygame.Rect]:
+        screen, atlas, swarm = self.screen, self.atlas, game.swarm
+        player_x, origin_x, origin_y, bullet_ys = interpolated(game, alpha)
+        if full:
+            screen.blit(self.background, (0, 0))
+        else:
+            screen.blits([(self.background, rect, rect) for rect in self._dirty], doreturn=False)
+
+        sprites = [
+            (atlas.enemies[enemy.color], (origin_x + enemy.col * FORMATION_GAP_X, origin_y + enemy.row * FORMATION_GAP_Y))
+            for enemy in swarm.alive_enemies()
+        ]
+        sprites.append((atlas.player, (player_x, game.player.rect.y)))
+        xs, _, from_player = game.bullets.live()
+        bullets = atlas.bullets
+        sprites.extend((bullets[shot], (x, y)) for x, y, shot in zip(xs.tolist(), bullet_ys, from_player.tolist()))
+        sprites.extend(hud_blits(self.font, game.score, game.player.lives))
+        rects = screen.blits(sprites)
+        sparks = self.particles.draw(screen)
+        if sparks:
+            rects.append(sparks)
+        return rects
+
+
+class LegacyRenderer:
+    """Original full-frame path: clear, draw every shape with pygame.draw, flip."""
+
+    def __init__(self, screen: pygame.Surface, font: pygame.font.Font) -> None:
+        self.screen = screen
+        self.font = font
+        self.particles = ParticleSystem(gravity=400.0)
+        self.on_phase: Optional[Callable[[str], None]] = None
+        self.overlay: Optional[Overlay] = None
+
+    def on_effect(self, kind: str, x: float, y: float) -> None:
+        emit_effect(self.particles, kind, x, y)
+
+    def invalidate(self) -> None:
+        pass
+
+    def draw(self, game: Game, alpha: float = 1.0) -> None:
+        screen = self.screen
+        screen.fill(BG_COLOR)
+        player_x, origin_x, origin_y, bullet_ys = interpolated(game, alpha)
+
+        draw_player(screen, game.player.rect.move(player_x - game.player.rect.x, 0))
+
+        dx, dy = origin_x - game.swarm.cell_x(0), origin_y - game.swarm.cell_y(0)
+        for enemy in game.swarm.alive_enemies():
+            enemy.draw(screen, dx, dy)
+
+        xs, _, from_player = game.bullets.live()
+        for x, y, player_shot in zip(xs.tolist(), bullet_ys, from_player.tolist()):
+            color = BULLET_COLOR if player_shot else ENEMY_BULLET_COLOR
+            pygame.draw.rect(screen, color, (x, y, BULLET_W, BULLET_H), border_radius=3)
+        self.particles.draw(screen)
+
+        draw_hud(screen, self.font, game.score, game.player.lives)
+
+        if game.game_over:
+            draw_game_over(screen, game, self.font)
+        if self.on_phase:
+            self.on_phase("draw")
+        if self.overlay:
+            self.overlay(screen)
+            if self.on_phase:
+                self.on_phase("overlay")
+
+        pygame.display.flip()
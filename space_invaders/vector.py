@@ -0,0 +1,232 @@
+"""
+Batched Space Invaders: thousands of independent games stepped together with NumPy arrays.
+Mirrors the rules in `invaders.Game.step`; every per-game attribute is an array indexed by game.
+"""
+
+import math
+from typing import Optional, Tuple
+
+import numpy as np
+
+from invaders import (
+    ACTION_FIRE,
+    ACTION_LEFT,
+    ACTION_RIGHT,
+    BULLET_H,
+    BULLET_SPEED,
+    BULLET_W,
+    ENEMY_DROP,
+    ENEMY_COLS,
+    ENEMY_FIRE_RATE,
+    ENEMY_H,
+    ENEMY_ROWS,
+    ENEMY_SPEED,
+    ENEMY_W,
+    FORMATION_GAP_X,
+    FORMATION_GAP_Y,
+    FORMATION_X,
+    FORMATION_Y,
+    FPS,
+    HEIGHT,
+    PLAYER_COOLDOWN_MS,
+    PLAYER_H,
+    PLAYER_SPEED,
+    PLAYER_W,
+    PLAYER_Y,
+    WIDTH,
+)
+
+
+COOLDOWN_FRAMES = math.ceil(PLAYER_COOLDOWN_MS * FPS / 1000)
+# Enough slots for every player shot that can be in flight at once; enemy volleys rarely exceed a handful.
+PLAYER_BULLET_SLOTS = math.ceil((PLAYER_Y + BULLET_H) / BULLET_SPEED / COOLDOWN_FRAMES) + 1
+ENEMY_BULLET_SLOTS = 16
+
+
+class BatchedInvaders:
+    """N games of Space Invaders in struct-of-arrays form, advanced by `step(actions)`."""
+
+    def __init__(
+        self,
+        num_games: int,
+        seed: Optional[int] = None,
+        auto_reset: bool = True,
+        rows: int = ENEMY_ROWS,
+        cols: int = ENEMY_COLS,
+    ) -> None:
+        n = num_games
+        self.num_games = n
+        self.rows = rows
+        self.cols = cols
+        self.auto_reset = auto_reset
+        self.rng = np.random.default_rng(seed)
+        self._index = np.arange(n)
+
+        self.player_x = np.zeros(n, np.int32)
+        self.lives = np.zeros(n, np.int32)
+        self.score = np.zeros(n, np.int32)
+        self.cooldown = np.zeros(n, np.int32)
+        self.frame = np.zeros(n, np.int32)
+
+        self.alive = np.zeros((n, rows, cols), bool)
+        self.swarm_x = np.zeros(n, np.int32)
+        self.swarm_y = np.zeros(n, np.int32)
+        self.direction = np.zeros(n, np.int32)
+        self.speed = np.zeros(n, np.float64)
+
+        self.pb_x = np.zeros((n, PLAYER_BULLET_SLOTS), np.int32)
+        self.pb_y = np.zeros((n, PLAYER_BULLET_SLOTS), np.int32)
+        self.pb_active = np.zeros((n, PLAYER_BULLET_SLOTS), bool)
+        self.eb_x = np.zeros((n, ENEMY_BULLET_SLOTS), np.int32)
+        self.eb_y = np.zeros((n, ENEMY_BULLET_SLOTS), np.int32)
+        self.eb_active = np.zeros((n, ENEMY_BULLET_SLOTS), bool)
+
+        self.done = np.zeros(n, bool)
+        # Outcome of each game's most recently finished run; kept across auto-resets.
+        self.won = np.zeros(n, bool)
+        self.final_score = np.zeros(n, np.int32)
+        self.reset()
+
+    def reset(self, mask: Optional[np.ndarray] = None) -> None:
+        """Reset every game, or only the games selected by a boolean mask."""
+        idx = self._index if mask is None else np.flatnonzero(mask)
+        self.player_x[idx] = WIDTH // 2 - PLAYER_W // 2
+        self.lives[idx] = 3
+        self.score[idx] = 0
+        self.cooldown[idx] = 0
+        self.frame[idx] = 0
+        self.alive[idx] = True
+        self.swarm_x[idx] = 0
+        self.swarm_y[idx] = 0
+        self.direction[idx] = 1
+        self.speed[idx] = ENEMY_SPEED
+        self.pb_active[idx] = False
+        self.eb_active[idx] = False
+        self.done[idx] = False
+
+    def enemy_origin(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Top-left pixel of each game's formation cell (0, 0)."""
+        return FORMATION_X + self.swarm_x, FORMATION_Y + self.swarm_y
+
+    def step(self, actions: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Advance every running game one frame; returns (points scored, finished this frame)."""
+        actions = np.asarray(actions)
+        live = ~self.done
+        rewards = np.zeros(self.num_games, np.int32)
+        self.frame += live
+
+        # Player movement and shooting.
+        move = ((actions & ACTION_RIGHT) > 0).astype(np.int32) - ((actions & ACTION_LEFT) > 0)
+        moved = np.clip(self.player_x + move * PLAYER_SPEED, 20, WIDTH - 20 - PLAYER_W)
+        self.player_x = np.where(live, moved, self.player_x).astype(np.int32)
+        np.subtract(self.cooldown, 1, out=self.cooldown, where=live & (self.cooldown > 0))
+        fire = live & ((actions & ACTION_FIRE) > 0) & (self.cooldown == 0)
+        self._spawn(fire, self.pb_x, self.pb_y, self.pb_active, self.player_x + PLAYER_W // 2 - BULLET_W // 2, PLAYER_Y - 12)
+        self.cooldown[fire] = COOLDOWN_FRAMES
+
+        # Swarm march: bounce off the walls and drop a row.
+        col_alive = self.alive.any(axis=1)
+        any_alive = col_alive.any(axis=1)
+        marching = live & any_alive
+        first_col = col_alive.argmax(axis=1)
+        last_col = self.cols - 1 - col_alive[:, ::-1].argmax(axis=1)
+        origin_x, _ = self.enemy_origin()
+        left_edge = origin_x + first_col * FORMATION_GAP_X
+        right_edge = origin_x + last_col * FORMATION_GAP_X + ENEMY_W
+        dx = self.direction * self.speed
+        bounce = marching & ((left_edge + dx < 20) | (right_edge + dx > WIDTH - 20))
+        self.direction[bounce] *= -1
+        # Whole-pixel steps, rounded the way pygame rounds a float Rect move.
+        self.swarm_x += np.where(marching, np.floor(self.direction * self.speed + 0.5), 0).astype(np.int32)
+        self.swarm_y += bounce * ENEMY_DROP
+
+        # Enemy fire from the bottom-most invader of a random live column.
+        shooting = np.flatnonzero(marching & (self.rng.random(self.num_games) < ENEMY_FIRE_RATE))
+        if shooting.size:
+            live_cols = col_alive[shooting]
+            col = np.where(live_cols, self.rng.random(live_cols.shape), -1.0).argmax(axis=1)
+            column = self.alive[shooting, :, col]
+            row = self.rows - 1 - column[:, ::-1].argmax(axis=1)
+            origin_x, origin_y = self.enemy_origin()
+            mask = np.zeros(self.num_games, bool)
+            mask[shooting] = True
+            bx = np.zeros(self.num_games, np.int32)
+            by = np.zeros(self.num_games, np.int32)
+            bx[shooting] = origin_x[shooting] + col * FORMATION_GAP_X + ENEMY_W // 2 - BULLET_W // 2
+            by[shooting] = origin_y[shooting] + row * FORMATION_GAP_Y + ENEMY_H
+            self._spawn(mask, self.eb_x, self.eb_y, self.eb_active, bx, by)
+
+        # Bullet flight and off-screen culling.
+        self.pb_y -= BULLET_SPEED * (self.pb_active & live[:, None])
+        self.eb_y += (BULLET_SPEED - 2) * (self.eb_active & live[:, None])
+        self.pb_active &= self.pb_y + BULLET_H >= 0
+        self.eb_active &= self.eb_y <= HEIGHT
+
+        # Player bullets against the formation: each bullet maps to at most one grid cell.
+        origin_x, origin_y = self.enemy_origin()
+        for slot in range(PLAYER_BULLET_SLOTS):
+            rel_x = self.pb_x[:, slot] - origin_x
+            rel_y = self.pb_y[:, slot] - origin_y
+            col = (rel_x + BULLET_W - 1) // FORMATION_GAP_X
+            row = (rel_y + BULLET_H - 1) // FORMATION_GAP_Y
+            in_cell = (
+                (col >= 0) & (col < self.cols) & (rel_x < col * FORMATION_GAP_X + ENEMY_W)
+                & (row >= 0) & (row < self.rows) & (rel_y < row * FORMATION_GAP_Y + ENEMY_H)
+            )
+            candidates = np.flatnonzero(live & self.pb_active[:, slot] & in_cell)
+            if not candidates.size:
+                continue
+            r, c = row[candidates], col[candidates]
+            hit = candidates[self.alive[candidates, r, c]]
+            if not hit.size:
+                continue
+            self.alive[hit, row[hit], col[hit]] = False
+            self.pb_active[hit, slot] = False
+            rewards[hit] += 10
+            self.speed[hit] = np.minimum(3.5, self.speed[hit] + 0.05)
+
+        # Enemy bullets against the player.
+        px = self.player_x[:, None]
+        struck = (
+            self.eb_active & live[:, None]
+            & (self.eb_x < px + PLAYER_W) & (self.eb_x + BULLET_W > px)
+            & (self.eb_y < PLAYER_Y + PLAYER_H) & (self.eb_y + BULLET_H > PLAYER_Y)
+        )
+        self.eb_active &= ~struck
+        self.lives -= struck.sum(axis=1, dtype=np.int32)
+
+        # Invasion, defeat and victory.
+        row_alive = self.alive.any(axis=2)
+        last_row = self.rows - 1 - row_alive[:, ::-1].argmax(axis=1)
+        bottom = origin_y + last_row * FORMATION_GAP_Y + ENEMY_H
+        lost = live & ((self.lives <= 0) | (row_alive.any(axis=1) & (bottom >= PLAYER_Y)))
+        cleared = live & ~row_alive.any(axis=1)
+        finished = lost | cleared
+        self.done |= finished
+        self.score += rewards
+        self.won[finished] = cleared[finished]
+        self.final_score[finished] = self.score[finished]
+
+        if self.auto_reset and finished.any():
+            self.reset(finished)
+        return rewards, finished
+
+    def _spawn(
+        self,
+        mask: np.ndarray,
+        xs: np.ndarray,
+        ys: np.ndarray,
+        active: np.ndarray,
+        x,
+        y,
+    ) -> None:
+        games = np.flatnonzero(mask)
+        if not games.size:
+            return
+        free = ~active[games]
+        slot = free.argmax(axis=1)
+        ok = free[np.arange(games.size), slot]
+        games, slot = games[ok], slot[ok]
+        xs[games, slot] = np.broadcast_to(x, mask.shape)[games]
+        ys[games, slot] = np.broadcast_to(y, mask.shape)[games]
+        active[games, slot] = True